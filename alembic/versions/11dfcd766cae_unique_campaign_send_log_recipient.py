@@ -0,0 +1,52 @@
+"""Unique (campaign_id, subscriber_email) on campaign_send_logs
+
+Revision ID: 11dfcd766cae
+Revises: d5e6fa8cf770
+Create Date: 2026-10-17 10:12:44.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11dfcd766cae'
+down_revision: Union[str, Sequence[str], None] = 'd5e6fa8cf770'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+
+    Strategy:
+    1. Remove duplicate logs per recipient, keeping the 'sent' row (else the newest)
+    2. Add the unique constraint used as the upsert conflict target
+    """
+    op.execute(
+        """
+        DELETE FROM campaign_send_logs AS l
+        USING (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY campaign_id, subscriber_email
+                       ORDER BY (status = 'sent') DESC, updated_at DESC
+                   ) AS rn
+            FROM campaign_send_logs
+        ) AS d
+        WHERE l.id = d.id AND d.rn > 1
+        """
+    )
+    op.create_unique_constraint(
+        'uq_campaign_send_logs_campaign_email',
+        'campaign_send_logs',
+        ['campaign_id', 'subscriber_email'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_campaign_send_logs_campaign_email', 'campaign_send_logs', type_='unique')
@@ -0,0 +1,87 @@
+"""Composite and partial indexes for hot queries, drop redundant indexes
+
+Revision ID: 3d81f6a2c947
+Revises: 9c4e1a7d3b58
+Create Date: 2026-10-17 16:42:08.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d81f6a2c947'
+down_revision: Union[str, Sequence[str], None] = '9c4e1a7d3b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial WHERE clause)
+NEW_INDEXES = [
+    ('idx_subscribers_company_created_at', 'subscribers', ['company_id', sa.text('created_at DESC')], None),
+    ('idx_campaigns_company_created_at', 'campaigns', ['company_id', sa.text('created_at DESC')], None),
+    ('idx_campaigns_scheduled_due', 'campaigns', ['scheduled_for'], "status = 'scheduled'"),
+    ('idx_campaign_send_logs_campaign_status', 'campaign_send_logs', ['campaign_id', 'status'], None),
+    ('idx_refresh_tokens_company_active', 'refresh_tokens', ['company_id', 'token_hash'], 'revoked_at IS NULL'),
+]
+
+# Duplicates (index=True next to an explicit Index), single columns already
+# leading a unique constraint or a new composite, and low-cardinality status
+# columns. (name, table, columns) so downgrade can recreate them.
+REDUNDANT_INDEXES = [
+    ('idx_subscribers_company_id', 'subscribers', ['company_id']),
+    ('ix_subscribers_company_id', 'subscribers', ['company_id']),
+    ('ix_subscribers_subscriber_email', 'subscribers', ['subscriber_email']),
+    ('idx_subscribers_status', 'subscribers', ['status']),
+    ('idx_campaigns_company_id', 'campaigns', ['company_id']),
+    ('ix_campaigns_company_id', 'campaigns', ['company_id']),
+    ('idx_campaigns_status', 'campaigns', ['status']),
+    ('ix_campaigns_status', 'campaigns', ['status']),
+    ('idx_campaigns_scheduled_for', 'campaigns', ['scheduled_for']),
+    ('idx_campaign_send_logs_campaign_id', 'campaign_send_logs', ['campaign_id']),
+    ('ix_campaign_send_logs_campaign_id', 'campaign_send_logs', ['campaign_id']),
+    ('ix_campaign_send_logs_subscriber_email', 'campaign_send_logs', ['subscriber_email']),
+    ('idx_campaign_send_logs_status', 'campaign_send_logs', ['status']),
+    ('ix_campaign_send_logs_status', 'campaign_send_logs', ['status']),
+    ('ix_refresh_tokens_company_id', 'refresh_tokens', ['company_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; tables stay writable while
+    # the indexes build. New indexes go first so no query loses its index.
+    # A build that fails leaves an INVALID index behind: drop it before rerunning.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in NEW_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, _, _ in reversed(NEW_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
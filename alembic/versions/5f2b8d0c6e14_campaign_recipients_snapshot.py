@@ -0,0 +1,52 @@
+"""Add campaign_recipients audience snapshot
+
+Revision ID: 5f2b8d0c6e14
+Revises: 7a3c91e4b2d0
+Create Date: 2026-10-17 11:48:09.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2b8d0c6e14'
+down_revision: Union[str, Sequence[str], None] = '7a3c91e4b2d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'campaign_recipients',
+        sa.Column('campaign_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('subscriber_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('subscriber_email', sa.String(length=255), nullable=False),
+        sa.Column('subscriber_name', sa.String(length=100), nullable=True),
+        sa.Column('state', sa.String(length=20), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint("state IN ('pending','sent','failed')"),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('campaign_id', 'seq'),
+        sa.UniqueConstraint('campaign_id', 'subscriber_email', name='uq_campaign_recipients_campaign_email'),
+    )
+    op.create_index(
+        'idx_campaign_recipients_pending',
+        'campaign_recipients',
+        ['campaign_id'],
+        unique=False,
+        postgresql_where=sa.text("state = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_campaign_recipients_pending', table_name='campaign_recipients')
+    op.drop_table('campaign_recipients')
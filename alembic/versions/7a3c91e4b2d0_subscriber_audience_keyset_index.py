@@ -0,0 +1,46 @@
+"""Partial (company_id, id) index on subscribed subscribers
+
+Revision ID: 7a3c91e4b2d0
+Revises: 11dfcd766cae
+Create Date: 2026-10-17 11:05:21.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3c91e4b2d0'
+down_revision: Union[str, Sequence[str], None] = '11dfcd766cae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run in a transaction; subscribers keeps taking writes
+    # while the index builds. A failed build leaves an INVALID index behind:
+    # drop it before rerunning.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_subscribers_company_subscribed_id',
+            'subscribers',
+            ['company_id', 'id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'subscribed'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_subscribers_company_subscribed_id',
+            table_name='subscribers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,148 @@
+"""Partition campaign_send_logs by month of campaign creation
+
+Revision ID: 8e2f4c1a9b63
+Revises: 3d81f6a2c947
+Create Date: 2026-10-17 18:05:31.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4c1a9b63'
+down_revision: Union[str, Sequence[str], None] = '3d81f6a2c947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months created past the current one; the daily maintenance task keeps it up
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, campaign_id, subscriber_email, ses_message_id, status, error_message, '
+    'extra_data, sent_at, created_at, updated_at'
+)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    op.execute(
+        f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL,
+            campaign_id UUID NOT NULL,
+            subscriber_email VARCHAR(255) NOT NULL,
+            ses_message_id VARCHAR(255),
+            status VARCHAR(20) NOT NULL,
+            error_message TEXT,
+            extra_data JSONB NOT NULL DEFAULT '{{}}',
+            sent_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+            {', campaign_created_at TIMESTAMP WITH TIME ZONE NOT NULL' if partitioned else ''}
+        ) {'PARTITION BY RANGE (campaign_created_at)' if partitioned else ''}
+        """
+    )
+
+
+def _add_common_constraints() -> None:
+    op.create_check_constraint(
+        'campaign_send_logs_status_check',
+        'campaign_send_logs',
+        "status IN ('pending','sending','sent','failed','bounced','complained')",
+    )
+    op.create_foreign_key(
+        'campaign_send_logs_campaign_id_fkey',
+        'campaign_send_logs',
+        'campaigns',
+        ['campaign_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+    op.create_index('idx_campaign_send_logs_email', 'campaign_send_logs', ['subscriber_email'])
+    op.create_index('idx_campaign_send_logs_campaign_status', 'campaign_send_logs', ['campaign_id', 'status'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites the table: run it in a maintenance window on large installs.
+    # Index names are schema-wide, so the copy is built unindexed, the old table
+    # dropped, and constraints and indexes added under their usual names.
+    _create_table('campaign_send_logs_partitioned', partitioned=True)
+
+    conn = op.get_bind()
+    first = conn.execute(sa.text(
+        """
+        SELECT min(c.created_at) FROM campaigns c
+        WHERE EXISTS (SELECT 1 FROM campaign_send_logs l WHERE l.campaign_id = c.id)
+        """
+    )).scalar()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = first.astimezone(timezone.utc).date().replace(day=1) if first else current
+
+    # One partition per month holding send logs, up to MONTHS_AHEAD months on
+    while month <= _add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE campaign_send_logs_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF campaign_send_logs_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+    # Safety net if maintenance falls behind; stays empty otherwise
+    op.execute("CREATE TABLE campaign_send_logs_default PARTITION OF campaign_send_logs_partitioned DEFAULT")
+
+    op.execute(
+        f"""
+        INSERT INTO campaign_send_logs_partitioned ({COLUMNS}, campaign_created_at)
+        SELECT {', '.join('l.' + column for column in COLUMNS.split(', '))}, c.created_at
+        FROM campaign_send_logs l
+        JOIN campaigns c ON c.id = l.campaign_id
+        """
+    )
+    op.drop_table('campaign_send_logs')
+    op.rename_table('campaign_send_logs_partitioned', 'campaign_send_logs')
+
+    op.create_primary_key('campaign_send_logs_pkey', 'campaign_send_logs', ['id', 'campaign_created_at'])
+    op.create_unique_constraint(
+        'uq_campaign_send_logs_campaign_email',
+        'campaign_send_logs',
+        ['campaign_id', 'subscriber_email', 'campaign_created_at'],
+    )
+    _add_common_constraints()
+    # Replaces the uq_ses_message_id unique constraint, which can't exist
+    # without the partition key
+    op.create_index('idx_campaign_send_logs_ses_message_id', 'campaign_send_logs', ['ses_message_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows of archived (dropped) partitions are not restored
+    _create_table('campaign_send_logs_unpartitioned', partitioned=False)
+    op.execute(
+        f"""
+        INSERT INTO campaign_send_logs_unpartitioned ({COLUMNS})
+        SELECT {COLUMNS} FROM campaign_send_logs
+        """
+    )
+    # Drops every attached partition with it
+    op.drop_table('campaign_send_logs')
+    op.rename_table('campaign_send_logs_unpartitioned', 'campaign_send_logs')
+
+    op.create_primary_key('campaign_send_logs_pkey', 'campaign_send_logs', ['id'])
+    op.create_unique_constraint(
+        'uq_campaign_send_logs_campaign_email',
+        'campaign_send_logs',
+        ['campaign_id', 'subscriber_email'],
+    )
+    op.create_unique_constraint('uq_ses_message_id', 'campaign_send_logs', ['ses_message_id'])
+    _add_common_constraints()
+    op.create_index('idx_campaign_send_logs_created_at', 'campaign_send_logs', ['created_at'])
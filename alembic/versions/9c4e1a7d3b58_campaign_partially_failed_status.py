@@ -0,0 +1,40 @@
+"""Allow 'partially_failed' campaign status
+
+Revision ID: 9c4e1a7d3b58
+Revises: 5f2b8d0c6e14
+Create Date: 2026-10-17 12:31:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1a7d3b58'
+down_revision: Union[str, Sequence[str], None] = '5f2b8d0c6e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Unnamed in the original table definition, so Postgres named it campaigns_status_check
+    op.drop_constraint('campaigns_status_check', 'campaigns', type_='check')
+    op.create_check_constraint(
+        'campaigns_status_check',
+        'campaigns',
+        "status IN ('draft','scheduled','sending','sent','partially_failed','cancelled')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE campaigns SET status = 'sent' WHERE status = 'partially_failed'")
+    op.drop_constraint('campaigns_status_check', 'campaigns', type_='check')
+    op.create_check_constraint(
+        'campaigns_status_check',
+        'campaigns',
+        "status IN ('draft','scheduled','sending','sent','cancelled')",
+    )
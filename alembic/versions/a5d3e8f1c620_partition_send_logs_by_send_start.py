@@ -0,0 +1,47 @@
+"""Partition campaign_send_logs by the month a campaign started sending
+
+Revision ID: a5d3e8f1c620
+Revises: f1c7a3e9b25d
+Create Date: 2026-10-17 23:02:51.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d3e8f1c620'
+down_revision: Union[str, Sequence[str], None] = 'f1c7a3e9b25d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'campaigns',
+        sa.Column('send_started_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    # Existing send logs are keyed on the campaign's created_at. Campaigns that
+    # already started keep that value, so their rows stay where they are and
+    # later upserts still match; only campaigns sent from now on are keyed
+    # (and retained) by send time.
+    op.execute(
+        """
+        UPDATE campaigns c SET send_started_at = c.created_at
+        WHERE c.status NOT IN ('draft', 'scheduled')
+           OR EXISTS (SELECT 1 FROM campaign_send_logs l WHERE l.campaign_id = c.id)
+           OR EXISTS (SELECT 1 FROM campaign_recipients r WHERE r.campaign_id = c.id)
+        """
+    )
+    # Partitions follow the renamed key column
+    op.alter_column('campaign_send_logs', 'campaign_created_at', new_column_name='campaign_send_started_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows logged since the upgrade keep their send-time key
+    op.alter_column('campaign_send_logs', 'campaign_send_started_at', new_column_name='campaign_created_at')
+    op.drop_column('campaigns', 'send_started_at')
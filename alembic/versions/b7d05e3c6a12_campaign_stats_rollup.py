@@ -0,0 +1,78 @@
+"""campaign_stats rollup table
+
+Revision ID: b7d05e3c6a12
+Revises: 8e2f4c1a9b63
+Create Date: 2026-10-17 19:22:47.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d05e3c6a12'
+down_revision: Union[str, Sequence[str], None] = '8e2f4c1a9b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('campaign_stats',
+        sa.Column('campaign_id', sa.UUID(), nullable=False),
+        sa.Column('total_recipients', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('sent', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('failed', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('bounced', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('complained', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('last_event_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('campaign_id'),
+    )
+
+    # Backfill every campaign that has started sending: sent/failed from the
+    # recipient snapshot, or from send logs for campaigns sent before snapshots
+    # existed; bounces and complaints from send logs
+    op.execute(
+        """
+        INSERT INTO campaign_stats
+            (campaign_id, total_recipients, sent, failed, bounced, complained, last_event_at)
+        SELECT
+            c.id,
+            COALESCE(r.total, l.total, 0),
+            COALESCE(r.sent, l.sent, 0),
+            COALESCE(r.failed, l.failed, 0),
+            COALESCE(l.bounced, 0),
+            COALESCE(l.complained, 0),
+            l.last_event_at
+        FROM campaigns c
+        LEFT JOIN (
+            SELECT campaign_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE state = 'sent') AS sent,
+                   count(*) FILTER (WHERE state = 'failed') AS failed
+            FROM campaign_recipients
+            GROUP BY campaign_id
+        ) r ON r.campaign_id = c.id
+        LEFT JOIN (
+            SELECT campaign_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'sent') AS sent,
+                   count(*) FILTER (WHERE status = 'failed') AS failed,
+                   count(*) FILTER (WHERE status = 'bounced') AS bounced,
+                   count(*) FILTER (WHERE status = 'complained') AS complained,
+                   max(updated_at) AS last_event_at
+            FROM campaign_send_logs
+            GROUP BY campaign_id
+        ) l ON l.campaign_id = c.id
+        WHERE r.campaign_id IS NOT NULL OR l.campaign_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('campaign_stats')
@@ -0,0 +1,52 @@
+"""Retried campaign recipients wait in the snapshot for the dispatcher
+
+Revision ID: c8e2f5a1d394
+Revises: a5d3e8f1c620
+Create Date: 2026-10-18 09:14:37.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f5a1d394'
+down_revision: Union[str, Sequence[str], None] = 'a5d3e8f1c620'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'campaign_recipients',
+        sa.Column('retry_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+    # CONCURRENTLY can't run inside a transaction; campaign_recipients stays
+    # writable while the index builds. A build that fails leaves an INVALID
+    # index behind: drop it before rerunning.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_campaign_recipients_retry_due',
+            'campaign_recipients',
+            ['retry_at'],
+            unique=False,
+            postgresql_where=sa.text("state = 'pending' AND retry_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_campaign_recipients_retry_due',
+            table_name='campaign_recipients',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('campaign_recipients', 'retry_at')
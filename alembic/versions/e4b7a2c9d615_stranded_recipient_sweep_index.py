@@ -0,0 +1,46 @@
+"""Index claimed campaign recipients for the stranded recipient sweep
+
+Revision ID: e4b7a2c9d615
+Revises: c8e2f5a1d394
+Create Date: 2026-10-19 11:02:54.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2c9d615'
+down_revision: Union[str, Sequence[str], None] = 'c8e2f5a1d394'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; campaign_recipients stays
+    # writable while the index builds. A build that fails leaves an INVALID
+    # index behind: drop it before rerunning.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_campaign_recipients_claimed',
+            'campaign_recipients',
+            ['claimed_at'],
+            unique=False,
+            postgresql_where=sa.text("state = 'sending'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_campaign_recipients_claimed',
+            table_name='campaign_recipients',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
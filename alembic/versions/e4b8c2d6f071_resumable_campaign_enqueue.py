@@ -0,0 +1,59 @@
+"""Resumable campaign enqueue and atomic recipient claims
+
+Revision ID: e4b8c2d6f071
+Revises: b7d05e3c6a12
+Create Date: 2026-10-17 21:08:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c2d6f071'
+down_revision: Union[str, Sequence[str], None] = 'b7d05e3c6a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'campaigns',
+        sa.Column('enqueued_seq', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    # Campaigns already sending were enqueued in full by the old orchestrator
+    op.execute(
+        """
+        UPDATE campaigns c SET enqueued_seq = s.total_recipients
+        FROM campaign_stats s
+        WHERE s.campaign_id = c.id AND c.status <> 'scheduled'
+        """
+    )
+
+    op.add_column(
+        'campaign_recipients',
+        sa.Column('claimed_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    # Unnamed in the original table definition, so Postgres named it campaign_recipients_state_check
+    op.drop_constraint('campaign_recipients_state_check', 'campaign_recipients', type_='check')
+    op.create_check_constraint(
+        'campaign_recipients_state_check',
+        'campaign_recipients',
+        "state IN ('pending','sending','sent','failed')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE campaign_recipients SET state = 'pending' WHERE state = 'sending'")
+    op.drop_constraint('campaign_recipients_state_check', 'campaign_recipients', type_='check')
+    op.create_check_constraint(
+        'campaign_recipients_state_check',
+        'campaign_recipients',
+        "state IN ('pending','sent','failed')",
+    )
+    op.drop_column('campaign_recipients', 'claimed_at')
+    op.drop_column('campaigns', 'enqueued_seq')
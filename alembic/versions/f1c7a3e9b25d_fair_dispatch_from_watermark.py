@@ -0,0 +1,37 @@
+"""Fair-share dispatch from the campaign enqueue watermark
+
+Revision ID: f1c7a3e9b25d
+Revises: e4b8c2d6f071
+Create Date: 2026-10-17 22:14:36.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a3e9b25d'
+down_revision: Union[str, Sequence[str], None] = 'e4b8c2d6f071'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_campaigns_sending',
+        'campaigns',
+        ['company_id', 'created_at'],
+        postgresql_where=sa.text("status = 'sending'"),
+    )
+    # Batches parked in the old Redis queues are abandoned: walk campaigns still
+    # sending from the start again. Recipients already sent or claimed are
+    # skipped by the batches' atomic claim.
+    op.execute("UPDATE campaigns SET enqueued_seq = 0 WHERE status = 'sending'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_campaigns_sending', table_name='campaigns')
@@ -2,6 +2,7 @@
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from kombu import Exchange, Queue
 from app.utils import constants
 
@@ -28,6 +29,14 @@ app.conf.enable_utc = True
 # Task routing
 default_exchange = Exchange("skymail", type="direct")
 app.conf.task_queues = (
+    # Transactional emails (OTP, password reset, ...) get their own worker lane
+    # so campaign batches can never delay them
+    Queue(
+        "transactional",
+        exchange=default_exchange,
+        routing_key="email.transactional",
+        priority=10,
+    ),
     Queue(
         "campaigns",
         exchange=default_exchange,
@@ -50,8 +59,12 @@ app.conf.task_queues = (
 
 app.conf.task_routes = {
     "app.workers.campaign_scheduler.enqueue_due_campaigns": {"queue": "scheduled"},
+    "app.workers.campaign_scheduler.complete_finished_campaigns": {"queue": "scheduled"},
     "app.workers.campaign_send.send_campaign": {"queue": "campaigns"},
     "app.workers.email_batch.send_campaign_batch": {"queue": "email_batches"},
+    "app.workers.batch_dispatcher.dispatch_campaign_batches": {"queue": "scheduled"},
+    "app.workers.transactional_email.send_transactional_email": {"queue": "transactional"},
+    "app.workers.send_log_partitions.maintain_send_log_partitions": {"queue": "scheduled"},
 }
 
 # Task time limits
@@ -72,18 +85,55 @@ app.conf.beat_schedule = {
             "priority": 10,
         },
     },
+    "complete-finished-campaigns": {
+        "task": "app.workers.campaign_scheduler.complete_finished_campaigns",
+        "schedule": constants.CAMPAIGN_SCHEDULER_INTERVAL_SECONDS,
+        "options": {
+            "queue": "scheduled",
+            "priority": 10,
+        },
+    },
+    "dispatch-campaign-batches": {
+        "task": "app.workers.batch_dispatcher.dispatch_campaign_batches",
+        "schedule": constants.FAIR_DISPATCH_INTERVAL_SECONDS,
+        "options": {
+            "queue": "scheduled",
+            "priority": 10,
+        },
+    },
+    "maintain-send-log-partitions": {
+        "task": "app.workers.send_log_partitions.maintain_send_log_partitions",
+        "schedule": crontab(hour=3, minute=15),  # Daily, off-peak
+        "options": {
+            "queue": "scheduled",
+            "priority": 5,
+        },
+    },
 }
 
 # Use database-backed schedule for distributed environments
 app.conf.beat_scheduler = "celery.beat:PersistentScheduler"
 
 
+# ======================== WORKER PROCESS SETUP ========================
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Replace the DB pool inherited across fork with one owned by this process."""
+    from app.database.database import init_worker_engine
+    
+    init_worker_engine()
+
+
 # ======================== AUTO-DISCOVER TASKS ========================
 
 app.autodiscover_tasks([
     "app.workers.campaign_scheduler",
     "app.workers.campaign_send",
     "app.workers.email_batch",
+    "app.workers.batch_dispatcher",
+    "app.workers.transactional_email",
+    "app.workers.send_log_partitions",
 ])
 
 
@@ -1,13 +1,78 @@
+import uuid
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.database.replica import ReplicaRouter
 from app.utils import constants # or wherever your DB URL is
 
 DATABASE_URL = constants.SQLALCHEMY_DATABASE_URL
+ASYNC_DATABASE_URL = constants.SQLALCHEMY_ASYNC_DATABASE_URL
+
+
+def _pool_options(pool_size: int, max_overflow: int) -> dict:
+    if constants.DB_PGBOUNCER:
+        # PgBouncer owns the pooling; a second pool in front of it only pins
+        # server connections
+        return {"poolclass": NullPool}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": constants.DB_POOL_TIMEOUT,
+        "pool_recycle": constants.DB_POOL_RECYCLE,
+    }
+
+
+def create_db_engine(
+    pool_size: int = constants.DB_POOL_SIZE,
+    max_overflow: int = constants.DB_MAX_OVERFLOW,
+    statement_timeout_ms: int = constants.DB_STATEMENT_TIMEOUT_MS,
+    url: str = DATABASE_URL,
+    connect_timeout: int | None = None,
+):
+    """Sync (psycopg2) engine with the configured pool."""
+    connect_args = {}
+    if connect_timeout:
+        connect_args["connect_timeout"] = connect_timeout
+    # PgBouncer rejects startup options; set statement_timeout on the database
+    # role there instead (ALTER ROLE ... SET statement_timeout)
+    if statement_timeout_ms and not constants.DB_PGBOUNCER:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+    return create_engine(
+        url,
+        connect_args=connect_args,
+        **_pool_options(pool_size, max_overflow),
+    )
+
+
+def create_async_db_engine(
+    pool_size: int = constants.DB_POOL_SIZE,
+    max_overflow: int = constants.DB_MAX_OVERFLOW,
+    statement_timeout_ms: int = constants.DB_STATEMENT_TIMEOUT_MS,
+    url: str = ASYNC_DATABASE_URL,
+    connect_timeout: int | None = None,
+):
+    """Async (asyncpg) engine with the configured pool."""
+    connect_args = {}
+    if connect_timeout:
+        connect_args["timeout"] = connect_timeout
+    if constants.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction a different server
+        # connection, so prepared statements must be neither cached nor reused
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    elif statement_timeout_ms:
+        connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+    return create_async_engine(
+        url,
+        connect_args=connect_args,
+        **_pool_options(pool_size, max_overflow),
+    )
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-)
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -15,9 +80,80 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# asyncpg engine for FastAPI routes: queries await instead of blocking the event loop.
+# Celery workers keep using the sync engine above.
+async_engine = create_async_db_engine()
+
+# expire_on_commit=False: attribute access after commit would otherwise need
+# an implicit (sync) reload, which AsyncSession can't do
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# Optional read replica for read-only dashboard routes. A short connect
+# timeout keeps an unreachable replica from stalling requests before the
+# router falls back to the primary.
+async_replica_engine = (
+    create_async_db_engine(url=constants.SQLALCHEMY_ASYNC_REPLICA_DATABASE_URL, connect_timeout=3)
+    if constants.SQLALCHEMY_ASYNC_REPLICA_DATABASE_URL
+    else None
+)
+
+AsyncReplicaSessionLocal = async_sessionmaker(
+    bind=async_replica_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+replica_router = ReplicaRouter(
+    max_lag_seconds=constants.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=constants.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+)
+
+
+def init_worker_engine() -> None:
+    """
+    Give a forked Celery worker process its own connection pool.
+
+    Connections inherited from the parent share sockets with it, so they're
+    dropped without being closed and SessionLocal is rebound to a fresh engine
+    sized for one worker process.
+    """
+    global engine
+    engine.dispose(close=False)
+    engine = create_db_engine(
+        pool_size=constants.WORKER_DB_POOL_SIZE,
+        max_overflow=constants.WORKER_DB_MAX_OVERFLOW,
+        statement_timeout_ms=constants.WORKER_DB_STATEMENT_TIMEOUT_MS,
+    )
+    SessionLocal.configure(bind=engine)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """
+    Session for read-only routes: the replica while it's within
+    DB_REPLICA_MAX_LAG_SECONDS of the primary, otherwise the primary.
+    Results may be that many seconds stale; never write through it.
+    """
+    if async_replica_engine is not None and await replica_router.available_async(async_replica_engine):
+        session_factory = AsyncReplicaSessionLocal
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
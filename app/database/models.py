@@ -6,4 +6,6 @@ from app.modules.newsletters.template_versions.model import *
 from app.modules.newsletters.newsletter_templates.model import *
 from app.modules.newsletters.template_assets.model import *
 from app.modules.campaign.model import Campaign
-from app.modules.campaign.send_log import CampaignSendLog
\ No newline at end of file
+from app.modules.campaign.send_log import CampaignSendLog
+from app.modules.campaign.recipient import CampaignRecipient
+from app.modules.campaign.stats import CampaignStats
@@ -0,0 +1,63 @@
+"""Lag-aware routing of read-only sessions to a streaming replica."""
+import time
+
+from loguru import logger
+from sqlalchemy import text
+
+
+# Seconds the replica is behind the primary. An idle primary writes no new
+# WAL, so a fully replayed replica counts as 0 however old its last replay is.
+REPLICATION_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """
+    Decides whether read-only sessions may use the replica.
+
+    Replication lag is measured at most every ``check_interval`` seconds and
+    cached. While the replica is unreachable or lags more than
+    ``max_lag_seconds``, reads fall back to the primary.
+    """
+
+    def __init__(self, max_lag_seconds: float, check_interval: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._available = False
+        self._checked_at = 0.0
+
+    def _due(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        # Claim the check so concurrent requests keep using the cached answer
+        self._checked_at = now
+        return True
+
+    def _record(self, lag: float | None) -> None:
+        available = lag is not None and lag <= self.max_lag_seconds
+        if available != self._available:
+            if available:
+                logger.info(f"Read replica in use (lag {lag:.1f}s)")
+            elif lag is None:
+                logger.warning("Read replica unreachable, reading from primary")
+            else:
+                logger.warning(f"Read replica lagging {lag:.1f}s, reading from primary")
+        self._available = available
+
+    async def available_async(self, engine) -> bool:
+        """Replica usable for async sessions."""
+        if self._due():
+            try:
+                async with engine.connect() as conn:
+                    self._record(float((await conn.execute(REPLICATION_LAG_QUERY)).scalar()))
+            except Exception as e:
+                logger.error(f"Read replica lag check failed: {str(e)}")
+                self._record(None)
+        return self._available
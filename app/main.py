@@ -6,7 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.redis.redis_manager import redis_manager
-from app.database.database import engine, SessionLocal, get_db
+from app.redis.progress_stream import progress_stream
+from app.database.database import engine, async_engine, async_replica_engine, SessionLocal, get_db
 from app.modules.auth.routes import router as auth_router
 from app.modules.newsletters.newsletter_templates.routes import router as newsletter_router
 from app.modules.subscribers.routes import public_router as subscription_router
@@ -28,7 +29,11 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await progress_stream.close()
     await redis_manager.redis_disconnect()
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
 
 
 # Create FastAPI app
@@ -58,7 +58,8 @@ class AuthService:
                 json.dumps(registration_data)
             )
             
-            await EmailService.send_otp_email(email, otp, company_name)
+            if not await EmailService.enqueue("otp", email, otp=otp, company_name=company_name):
+                return False, "Could not send the OTP email. Please try again.", "EMAIL_QUEUE_ERROR"
             
             logger.info(f"Registration initiated for {email}")
             return True, f"OTP sent to {email}", None
@@ -111,8 +112,8 @@ class AuthService:
             await redis_manager.redis.delete(otp_key)
             await redis_manager.redis.delete(reg_key)
             
-            # Send welcome email
-            await EmailService.send_verification_email(email, reg_data["company_name"])
+            # Send welcome email; the account exists either way, a failure is logged
+            await EmailService.enqueue("verification", email, company_name=reg_data["company_name"])
             
             logger.info(f"Company registered and verified: {email}")
             return True, new_company, "Company registered successfully"
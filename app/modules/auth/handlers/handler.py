@@ -1,4 +1,4 @@
-from fastapi import HTTPException, status, BackgroundTasks
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.modules.auth.register.service import RegisterService
@@ -24,7 +24,6 @@ class RegisterHandler:
     @staticmethod
     async def register(
         request: CompanyRegisterRequest,
-        background_tasks: BackgroundTasks,
         db: Session
     ) -> CompanyRegisterResponse:
         success, message, otp = await RegisterService.initiate_registration(
@@ -41,8 +40,13 @@ class RegisterHandler:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=message
             )
-        if otp:
-            background_tasks.add_task(EmailService.send_otp_email, request.email, otp, request.company_name)
+        if otp and not await EmailService.enqueue(
+            "otp", request.email, otp=otp, company_name=request.company_name
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not send the OTP email. Please try again."
+            )
 
         return CompanyRegisterResponse(
             message=message,
@@ -53,7 +57,6 @@ class RegisterHandler:
     @staticmethod
     async def resend_otp(
         email: str,
-        background_tasks: BackgroundTasks,
         db: Session
     ):
         success, message, otp = await RegisterService.resend_otp(email, db)
@@ -78,7 +81,11 @@ class RegisterHandler:
                 except Exception:
                     company_name = ""
 
-            background_tasks.add_task(EmailService.send_otp_email, email, otp, company_name)
+            if not await EmailService.enqueue("otp", email, otp=otp, company_name=company_name):
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Could not send the OTP email. Please try again."
+                )
 
         return {
             "message": message,
@@ -1,6 +1,6 @@
 import uuid
 import datetime
-from sqlalchemy import String, Boolean, Integer, TIMESTAMP, Text, func
+from sqlalchemy import String, Boolean, Integer, TIMESTAMP, Text, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -46,6 +46,15 @@ class Company(Base):
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Refresh and logout only ever look at a company's unrevoked tokens
+        Index(
+            "idx_refresh_tokens_company_active",
+            "company_id",
+            "token_hash",
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -56,7 +65,6 @@ class RefreshToken(Base):
     company_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         nullable=False,
-        index=True,
     )
 
     token_hash: Mapped[str] = mapped_column(Text, nullable=False)
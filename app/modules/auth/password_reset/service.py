@@ -43,7 +43,9 @@ class PasswordResetService:
             await redis_manager.setex(redis_key, 600, otp)
             
             # Send OTP via email
-            await EmailService.send_password_reset_otp(email, otp)
+            if not await EmailService.enqueue("password_reset_otp", email, otp=otp):
+                await redis_manager.delete(redis_key)
+                return False, "Could not send the OTP email. Please try again."
             
             logger.info(f"Password reset OTP sent to {email}")
             return True, "OTP sent to your email"
@@ -142,7 +142,8 @@ class RegisterService:
             await redis_manager.redis.delete(otp_key)
             await redis_manager.redis.delete(reg_key)
             
-            await EmailService.send_verification_email(email, reg_data["company_name"])
+            # The account exists either way; a failure is logged by enqueue
+            await EmailService.enqueue("verification", email, company_name=reg_data["company_name"])
             
             logger.info(f"Company registered and verified: {email}")
             return True, new_company, "Company registered successfully"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
@@ -25,7 +25,6 @@ security = HTTPBearer()
 
 async def get_current_company(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
 ) -> str:
     token = credentials.credentials
     
@@ -56,10 +55,9 @@ async def get_current_company(
 )
 async def register(
     request: CompanyRegisterRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    return await RegisterHandler.register(request, background_tasks, db)
+    return await RegisterHandler.register(request, db)
 
 
 @router.post(
@@ -70,10 +68,9 @@ async def register(
 )
 async def resend_otp(
     email: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    return await RegisterHandler.resend_otp(email, background_tasks, db)
+    return await RegisterHandler.resend_otp(email, db)
 
 
 @router.post(
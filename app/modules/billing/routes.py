@@ -3,9 +3,10 @@ Billing routes for premium subscription management.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.database import get_db
+from app.database.database import get_db, get_async_read_db
 from app.modules.auth.routes import get_current_company
 from app.modules.billing.schemas import (
     CreateOrderRequest,
@@ -118,7 +119,7 @@ async def verify_payment(
 )
 async def get_payment_history(
     company_id: str = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get payment history for the company.
@@ -129,7 +130,7 @@ async def get_payment_history(
     - Payment date
     - Validity period
     """
-    success, response = BillingService.get_payment_history(company_id, db)
+    success, response = await BillingService.get_payment_history(company_id, db)
     
     if not success:
         raise HTTPException(
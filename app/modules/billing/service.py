@@ -8,6 +8,8 @@ import hashlib
 import uuid
 from datetime import datetime, timedelta
 from typing import Tuple, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from loguru import logger
 
@@ -263,7 +265,7 @@ class BillingService:
             }
     
     @staticmethod
-    def get_payment_history(company_id: str, db: Session) -> Tuple[bool, dict]:
+    async def get_payment_history(company_id: str, db: AsyncSession) -> Tuple[bool, dict]:
         """
         Get payment history for a company.
         
@@ -275,9 +277,11 @@ class BillingService:
             (success, response_dict)
         """
         try:
-            payments = db.query(Payment).filter(
-                Payment.company_id == uuid.UUID(company_id)
-            ).order_by(Payment.created_at.desc()).all()
+            payments = (await db.execute(
+                select(Payment)
+                .where(Payment.company_id == uuid.UUID(company_id))
+                .order_by(Payment.created_at.desc())
+            )).scalars().all()
             
             payment_list = [
                 {
@@ -2,5 +2,7 @@
 
 from app.modules.campaign.model import Campaign
 from app.modules.campaign.send_log import CampaignSendLog
+from app.modules.campaign.recipient import CampaignRecipient
+from app.modules.campaign.stats import CampaignStats
 
-__all__ = ["Campaign", "CampaignSendLog"]
+__all__ = ["Campaign", "CampaignSendLog", "CampaignRecipient", "CampaignStats"]
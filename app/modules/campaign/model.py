@@ -1,6 +1,6 @@
 import uuid
 import datetime
-from sqlalchemy import String, TIMESTAMP, ForeignKey,CheckConstraint, func, Index
+from sqlalchemy import String, BigInteger, TIMESTAMP, ForeignKey,CheckConstraint, func, Index, text
 from sqlalchemy.dialects.postgresql import UUID,JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,11 +17,24 @@ class Campaign(Base):
     __tablename__ = "campaigns"
     __table_args__ = (
         CheckConstraint(
-            "status IN ('draft','scheduled','sending','sent','cancelled')"
+            "status IN ('draft','scheduled','sending','sent','partially_failed','cancelled')",
+            name="campaigns_status_check",
+        ),
+        # Dashboard campaign list, newest first
+        Index("idx_campaigns_company_created_at", "company_id", text("created_at DESC")),
+        # Scheduler: due campaigns only
+        Index(
+            "idx_campaigns_scheduled_due",
+            "scheduled_for",
+            postgresql_where=text("status = 'scheduled'"),
+        ),
+        # Fair-share dispatcher: each company's sending campaigns, oldest first
+        Index(
+            "idx_campaigns_sending",
+            "company_id",
+            "created_at",
+            postgresql_where=text("status = 'sending'"),
         ),
-        Index("idx_campaigns_company_id", "company_id"),
-        Index("idx_campaigns_status", "status"),
-        Index("idx_campaigns_scheduled_for", "scheduled_for"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -31,8 +44,7 @@ class Campaign(Base):
     company_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("companies.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     template_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -53,15 +65,30 @@ class Campaign(Base):
     # Timezone for display purposes (e.g., 'America/New_York')
     send_timezone: Mapped[str | None] = mapped_column(String(50), nullable=True)
 
-    # Status lifecycle: draft → scheduled → sending → sent OR cancelled
+    # Status lifecycle: draft → scheduled → sending → sent / partially_failed OR cancelled
     status: Mapped[str] = mapped_column(
         String(20),
         default="draft",
-        nullable=False,
-        index=True
+        nullable=False
+    )
+
+    # When send_campaign first locked the campaign; send logs are partitioned
+    # (and archived) by this month
+    send_started_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True
+    )
+
+    # Recipient snapshot seq up to which batches have been enqueued; a retried
+    # send_campaign resumes from here instead of enqueueing every range again
+    enqueued_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        server_default="0",
+        nullable=False
     )
 
-    # Timestamp when campaign was fully sent
+    # Timestamp when the campaign's last recipient finished
     sent_at: Mapped[datetime.datetime | None] = mapped_column(
         TIMESTAMP(timezone=True),
         nullable=True
@@ -0,0 +1,114 @@
+import uuid
+import datetime
+from sqlalchemy import String, Integer, BigInteger, TIMESTAMP, ForeignKey, CheckConstraint, UniqueConstraint, func, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class CampaignRecipient(Base):
+    """
+    Frozen audience of a campaign, snapshotted when sending starts.
+
+    🧠 MENTAL MODEL:
+    The snapshot is taken once, in the same transaction that locks the campaign,
+    so every batch and retry sees exactly the same recipients.
+
+    Rows are numbered 1..N per campaign (seq); batches are (start, end] seq ranges
+    walked in order, and ``state`` tracks each recipient through the send.
+    A batch claims its rows ('pending' → 'sending') in one UPDATE before sending,
+    so a duplicate batch for the same rows finds nothing left to send.
+    Recipients to retry go back to 'pending' with ``retry_at`` set; the
+    dispatcher sends them again as batches of their own once it's due.
+    Rows no batch will finish (expired claims, batches that never ran) are
+    handed back the same way by the campaign scheduler's sweeper.
+    """
+    __tablename__ = "campaign_recipients"
+    __table_args__ = (
+        CheckConstraint(
+            "state IN ('pending','sending','sent','failed')",
+            name="campaign_recipients_state_check",
+        ),
+        UniqueConstraint("campaign_id", "subscriber_email", name="uq_campaign_recipients_campaign_email"),
+        # Exact "remaining" counts without scanning finished rows
+        Index(
+            "idx_campaign_recipients_pending",
+            "campaign_id",
+            postgresql_where=text("state = 'pending'"),
+        ),
+        # Dispatcher: retries that are due
+        Index(
+            "idx_campaign_recipients_retry_due",
+            "retry_at",
+            postgresql_where=text("state = 'pending' AND retry_at IS NOT NULL"),
+        ),
+        # Sweeper: claims whose lease ran out
+        Index(
+            "idx_campaign_recipients_claimed",
+            "claimed_at",
+            postgresql_where=text("state = 'sending'"),
+        ),
+    )
+
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("campaigns.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Position in the snapshot (1..N), ordered by subscriber id
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    # No FK: the snapshot outlives subscribers who unsubscribe or are deleted
+    subscriber_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False
+    )
+
+    subscriber_email: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    subscriber_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    # Send state: 'pending' → 'sending' (claimed by a batch) → 'sent' OR 'failed'
+    state: Mapped[str] = mapped_column(
+        String(20),
+        default="pending",
+        server_default="pending",
+        nullable=False
+    )
+
+    # Send attempts made for this recipient
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+
+    # When a batch claimed the row; claims older than CAMPAIGN_CLAIM_LEASE_SECONDS
+    # belong to a dead worker and may be taken over
+    claimed_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True
+    )
+
+    # Set on rows waiting to be retried: the dispatcher sends them again from
+    # then on (and pushes it back by a lease while a batch is queued for them)
+    retry_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True
+    )
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
@@ -1,21 +1,26 @@
 """Campaign API routes."""
 
+import asyncio
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from app.database.database import get_db
+from app.database.database import get_async_db, get_async_read_db
 from app.modules.campaign.schemas import (
     CampaignCreateRequest,
     CampaignScheduleRequest,
     CampaignRescheduleRequest,
     CampaignResponse,
+    CampaignDeliveryStats,
+    CampaignListItem,
     CampaignListResponse,
     CampaignStatusResponse,
 )
 from app.modules.campaign.service import CampaignService
 from app.modules.auth.routes import get_current_company
+from app.redis.progress_stream import format_sse, progress_stream
 from app.utils.exceptions import (
     ResourceNotFoundError,
     ValidationError,
@@ -36,7 +41,7 @@ router = APIRouter(
 @router.post("", response_model=CampaignResponse, status_code=201)
 async def create_campaign(
     req: CampaignCreateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -49,7 +54,7 @@ async def create_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        campaign = CampaignService.create_campaign(
+        campaign = await CampaignService.create_campaign(
             db=db,
             company_id=company_uuid,
             name=req.name,
@@ -69,7 +74,7 @@ async def create_campaign(
 async def schedule_campaign(
     campaign_id: uuid.UUID,
     req: CampaignScheduleRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -84,7 +89,7 @@ async def schedule_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        campaign = CampaignService.schedule_campaign(
+        campaign = await CampaignService.schedule_campaign(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
@@ -103,7 +108,7 @@ async def schedule_campaign(
 @router.post("/{campaign_id}/cancel", response_model=CampaignResponse)
 async def cancel_campaign(
     campaign_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -114,7 +119,7 @@ async def cancel_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        campaign = CampaignService.cancel_campaign(
+        campaign = await CampaignService.cancel_campaign(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
@@ -132,7 +137,7 @@ async def cancel_campaign(
 async def reschedule_campaign(
     campaign_id: uuid.UUID,
     request: CampaignRescheduleRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -146,7 +151,7 @@ async def reschedule_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        campaign = CampaignService.reschedule_campaign(
+        campaign = await CampaignService.reschedule_campaign(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
@@ -165,7 +170,7 @@ async def reschedule_campaign(
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(
     campaign_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -173,7 +178,7 @@ async def get_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        campaign = CampaignService.get_campaign(
+        campaign = await CampaignService.get_campaign(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
@@ -190,17 +195,18 @@ async def list_campaigns(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: str = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
-    List campaigns for your company.
+    List campaigns for your company, each with its delivery stats
+    (total_recipients, sent, failed, bounced, complained, last_event_at).
     
     Optional filters:
-    - status: Filter by campaign status (draft, scheduled, sending, sent, cancelled)
+    - status: Filter by campaign status (draft, scheduled, sending, sent, partially_failed, cancelled)
     """
     company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-    campaigns, total = CampaignService.list_campaigns(
+    campaigns, total = await CampaignService.list_campaigns(
         db=db,
         company_id=company_uuid,
         skip=skip,
@@ -212,14 +218,20 @@ async def list_campaigns(
         total=total,
         page=skip // limit + 1,
         page_size=limit,
-        campaigns=campaigns,
+        campaigns=[
+            CampaignListItem(
+                **CampaignResponse.model_validate(campaign).model_dump(),
+                stats=CampaignDeliveryStats.model_validate(stats) if stats else CampaignDeliveryStats(),
+            )
+            for campaign, stats in campaigns
+        ],
     )
 
 
 @router.get("/{campaign_id}/status", response_model=CampaignStatusResponse)
 async def get_campaign_status(
     campaign_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -228,11 +240,16 @@ async def get_campaign_status(
     Returns:
     - sent_count: Number of emails successfully sent
     - failed_count: Number of emails that failed
+    - bounced_count / complained_count: SES bounces and complaints
+    - remaining_count: Number of emails not finished yet
     - total_recipients: Total emails in this campaign
+    - last_event_at: When any of the counts last changed
+    
+    For live updates use /{campaign_id}/progress/stream instead of polling.
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        status_info = CampaignService.get_campaign_status(
+        status_info = await CampaignService.get_campaign_status(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
@@ -244,10 +261,68 @@ async def get_campaign_status(
         raise HTTPException(status_code=403, detail=str(e))
 
 
+@router.get("/{campaign_id}/progress/stream")
+async def stream_campaign_progress(
+    campaign_id: uuid.UUID,
+    request: Request,
+    company_id: uuid.UUID = Depends(get_current_company),
+):
+    """
+    Live campaign progress as Server-Sent Events.
+    
+    Events:
+    - progress: sent, failed, remaining, total, rate (emails/s), eta_seconds
+      (the first event is the current state; later ones carry sent_delta/failed_delta)
+    - status: final campaign status ('sent' or 'partially_failed'); the stream ends
+    
+    Served entirely from Redis (no database queries). Only campaigns that are
+    sending, or finished in the last 7 days, have progress.
+    """
+    snapshot = await progress_stream.snapshot(str(campaign_id))
+    
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"No progress for campaign {campaign_id}")
+    
+    if snapshot["company_id"] != str(company_id):
+        raise HTTPException(status_code=403, detail="Campaign doesn't belong to your company")
+    
+    async def events():
+        snapshot.pop("company_id")
+        yield format_sse("progress", snapshot)
+        if snapshot["remaining"] == 0:
+            return
+        
+        async with progress_stream.subscribe(str(campaign_id)) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Finished while we were subscribing?
+                    current = await progress_stream.snapshot(str(campaign_id))
+                    if current is not None and current["remaining"] == 0:
+                        current.pop("company_id")
+                        yield format_sse("progress", current)
+                        return
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                # Events are shared between watchers, so don't mutate them
+                yield format_sse(event["event"], {k: v for k, v in event.items() if k != "event"})
+                if event["event"] == "status":
+                    return
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/{campaign_id}", status_code=204)
 async def delete_campaign(
     campaign_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     company_id: uuid.UUID = Depends(get_current_company),
 ):
     """
@@ -260,7 +335,7 @@ async def delete_campaign(
     """
     try:
         company_uuid = uuid.UUID(company_id) if isinstance(company_id, str) else company_id
-        CampaignService.delete_campaign(
+        await CampaignService.delete_campaign(
             db=db,
             company_id=company_uuid,
             campaign_id=campaign_id,
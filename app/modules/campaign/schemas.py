@@ -59,13 +59,33 @@ class CampaignResponse(BaseModel):
         from_attributes = True
 
 
+class CampaignDeliveryStats(BaseModel):
+    """Delivery counters from the campaign_stats rollup."""
+    
+    total_recipients: int = 0
+    sent: int = 0
+    failed: int = 0
+    bounced: int = 0
+    complained: int = 0
+    last_event_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class CampaignListItem(CampaignResponse):
+    """Campaign in a list, with its delivery numbers."""
+    
+    stats: CampaignDeliveryStats = Field(default_factory=CampaignDeliveryStats)
+
+
 class CampaignListResponse(BaseModel):
     """List of campaigns with pagination."""
     
     total: int
     page: int
     page_size: int
-    campaigns: list[CampaignResponse]
+    campaigns: list[CampaignListItem]
 
 
 class CampaignStatusResponse(BaseModel):
@@ -75,6 +95,10 @@ class CampaignStatusResponse(BaseModel):
     status: str
     sent_count: int = 0
     failed_count: int = 0
+    bounced_count: int = 0
+    complained_count: int = 0
+    remaining_count: int = 0
     total_recipients: int = 0
     scheduled_for: Optional[datetime]
     sent_at: Optional[datetime]
+    last_event_at: Optional[datetime] = None
@@ -1,6 +1,6 @@
 import uuid
 import datetime
-from sqlalchemy import String, TIMESTAMP, ForeignKey, CheckConstraint, func, Index, Text
+from sqlalchemy import String, TIMESTAMP, ForeignKey, CheckConstraint, UniqueConstraint, func, Index, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,16 +16,28 @@ class CampaignSendLog(Base):
     - Idempotent retries
     - SES bounce/complaint handling
     - Audit trail
+    
+    Range-partitioned by month of campaign_send_started_at (see
+    app.workers.send_log_partitions): every row of a campaign lands in the same
+    partition, and expired months are detached and archived instead of deleted.
+    Unique keys on a partitioned table must include the partition key.
     """
     __tablename__ = "campaign_send_logs"
     __table_args__ = (
         CheckConstraint(
             "status IN ('pending','sending','sent','failed','bounced','complained')"
         ),
-        Index("idx_campaign_send_logs_campaign_id", "campaign_id"),
+        # One log row per recipient per campaign; send logs are upserted on this key
+        # Also serves every lookup by campaign_id alone (leading column)
+        UniqueConstraint(
+            "campaign_id", "subscriber_email", "campaign_send_started_at",
+            name="uq_campaign_send_logs_campaign_email",
+        ),
         Index("idx_campaign_send_logs_email", "subscriber_email"),
-        Index("idx_campaign_send_logs_status", "status"),
-        Index("idx_campaign_send_logs_created_at", "created_at"),
+        Index("idx_campaign_send_logs_ses_message_id", "ses_message_id"),
+        # Per-campaign status counts
+        Index("idx_campaign_send_logs_campaign_status", "campaign_id", "status"),
+        {"postgresql_partition_by": "RANGE (campaign_send_started_at)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -34,31 +46,36 @@ class CampaignSendLog(Base):
         default=uuid.uuid4
     )
 
+    # Partition key: when the campaign started sending (campaigns.send_started_at),
+    # so retention follows send time and retries in a later month still upsert
+    # into the campaign's partition
+    campaign_send_started_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=True
+    )
+
     campaign_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("campaigns.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     subscriber_email: Mapped[str] = mapped_column(
         String(255),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
-    # SES Message ID for tracking bounces/complaints
+    # SES Message ID for tracking bounces/complaints (unique per SES, indexed
+    # for lookups; a unique constraint would have to include the partition key)
     ses_message_id: Mapped[str | None] = mapped_column(
         String(255),
-        nullable=True,
-        unique=True  # Ensure SES Message ID is unique
+        nullable=True
     )
 
     status: Mapped[str] = mapped_column(
         String(20),
         default="pending",
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Error details if failed
@@ -3,11 +3,11 @@
 from datetime import datetime, timezone
 import uuid
 from sqlalchemy import select, and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from app.modules.campaign.model import Campaign
-from app.modules.campaign.send_log import CampaignSendLog
+from app.modules.campaign.stats import CampaignStats
 from app.modules.newsletters.newsletter_templates.model import NewsletterTemplate
 from app.modules.subscribers.model import Subscriber
 from app.modules.auth.model import Company
@@ -22,8 +22,8 @@ class CampaignService:
     """Service for campaign operations."""
     
     @staticmethod
-    def create_campaign(
-        db: Session,
+    async def create_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         name: str,
         template_id: uuid.UUID,
@@ -52,14 +52,14 @@ class CampaignService:
         """
         
         # Verify template exists and belongs to company
-        template = db.execute(
+        template = (await db.execute(
             select(NewsletterTemplate).where(
                 and_(
                     NewsletterTemplate.id == template_id,
                     NewsletterTemplate.company_id == company_id,
                 )
             )
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not template:
             raise ResourceNotFoundError(f"Template {template_id} not found or doesn't belong to your company")
@@ -99,16 +99,16 @@ class CampaignService:
         )
         
         db.add(campaign)
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         logger.info(f"✅ Created campaign {campaign.id} (Company: {company_id})")
         
         return campaign
     
     @staticmethod
-    def schedule_campaign(
-        db: Session,
+    async def schedule_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
         scheduled_for: datetime,
@@ -140,9 +140,9 @@ class CampaignService:
         """
         
         # Fetch campaign
-        campaign = db.execute(
+        campaign = (await db.execute(
             select(Campaign).where(Campaign.id == campaign_id)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not campaign:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
@@ -161,21 +161,21 @@ class CampaignService:
             raise ValidationError("scheduled_for must be in the future (UTC)")
         
         # Check subscriber count vs plan limit
-        company = db.execute(
+        company = (await db.execute(
             select(Company).where(Company.id == company_id)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not company:
             raise ResourceNotFoundError("Company not found")
         
-        subscriber_count = db.execute(
+        subscriber_count = (await db.execute(
             select(func.count(Subscriber.id)).where(
                 and_(
                     Subscriber.company_id == company_id,
                     Subscriber.status == "subscribed",
                 )
             )
-        ).scalar()
+        )).scalar()
         
         # Plan enforcement
         if company.subscription_tier == "free" and subscriber_count > 250:
@@ -191,16 +191,16 @@ class CampaignService:
         campaign.send_timezone = send_timezone
         campaign.updated_at = now
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         logger.info(f"✅ Scheduled campaign {campaign_id} for {scheduled_for}")
         
         return campaign
     
     @staticmethod
-    def cancel_campaign(
-        db: Session,
+    async def cancel_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
     ) -> Campaign:
@@ -224,9 +224,9 @@ class CampaignService:
         """
         
         # Fetch campaign
-        campaign = db.execute(
+        campaign = (await db.execute(
             select(Campaign).where(Campaign.id == campaign_id)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not campaign:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
@@ -247,16 +247,16 @@ class CampaignService:
         campaign.status = "cancelled"
         campaign.updated_at = now
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         logger.info(f"✅ Cancelled campaign {campaign_id}")
         
         return campaign
     
     @staticmethod
-    def reschedule_campaign(
-        db: Session,
+    async def reschedule_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
         scheduled_for: datetime,
@@ -285,9 +285,9 @@ class CampaignService:
         """
         
         # Fetch campaign
-        campaign = db.execute(
+        campaign = (await db.execute(
             select(Campaign).where(Campaign.id == campaign_id)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not campaign:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
@@ -314,16 +314,16 @@ class CampaignService:
         campaign.status = "scheduled"  # 🎯 KEY FIX: transition to scheduled
         campaign.updated_at = now
         
-        db.commit()
-        db.refresh(campaign)
+        await db.commit()
+        await db.refresh(campaign)
         
         logger.info(f"✅ Rescheduled campaign {campaign_id} to {scheduled_for}")
         
         return campaign
     
     @staticmethod
-    def get_campaign(
-        db: Session,
+    async def get_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
     ) -> Campaign:
@@ -343,9 +343,9 @@ class CampaignService:
             PermissionError: If campaign doesn't belong to company
         """
         
-        campaign = db.execute(
+        campaign = (await db.execute(
             select(Campaign).where(Campaign.id == campaign_id)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not campaign:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
@@ -356,15 +356,15 @@ class CampaignService:
         return campaign
     
     @staticmethod
-    def list_campaigns(
-        db: Session,
+    async def list_campaigns(
+        db: AsyncSession,
         company_id: uuid.UUID,
         skip: int = 0,
         limit: int = 20,
         status: str = None,
-    ) -> tuple[list[Campaign], int]:
+    ) -> tuple[list[tuple[Campaign, CampaignStats | None]], int]:
         """
-        List campaigns for a company.
+        List campaigns for a company with their delivery stats.
         
         Args:
             db: Database session
@@ -374,36 +374,43 @@ class CampaignService:
             status: Filter by status (optional)
         
         Returns:
-            Tuple of (campaigns list, total count)
+            Tuple of ((campaign, stats) list, total count); stats is None
+            for campaigns that haven't started sending
         """
         
-        query = select(Campaign).where(Campaign.company_id == company_id)
+        # Stats are one row per campaign, joined on its primary key
+        query = (
+            select(Campaign, CampaignStats)
+            .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+            .where(Campaign.company_id == company_id)
+        )
         
         if status:
             query = query.where(Campaign.status == status)
         
         # Get total count
-        total = db.execute(
+        total = (await db.execute(
             select(func.count(Campaign.id)).where(Campaign.company_id == company_id)
-        ).scalar()
+        )).scalar()
         
         # Get paginated results
-        campaigns = db.execute(
+        rows = (await db.execute(
             query.order_by(Campaign.created_at.desc()).offset(skip).limit(limit)
-        ).scalars().all()
+        )).all()
         
-        return campaigns, total
+        return [(campaign, stats) for campaign, stats in rows], total
     
     @staticmethod
-    def get_campaign_status(
-        db: Session,
+    async def get_campaign_status(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
     ) -> dict:
         """
         Get campaign send status.
         
-        Returns counts of sent/failed emails from send logs.
+        Counts come from the campaign's campaign_stats row, maintained by the
+        batch workers, so this is one primary-key join whatever the audience size.
         
         Args:
             db: Database session
@@ -418,54 +425,41 @@ class CampaignService:
             PermissionError: If campaign doesn't belong to company
         """
         
-        campaign = db.execute(
-            select(Campaign).where(Campaign.id == campaign_id)
-        ).scalar_one_or_none()
+        row = (await db.execute(
+            select(Campaign, CampaignStats)
+            .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+            .where(Campaign.id == campaign_id)
+        )).one_or_none()
         
-        if not campaign:
+        if not row:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
         
+        campaign, stats = row
+        
         if campaign.company_id != company_id:
             raise AppPermissionError("Campaign doesn't belong to your company")
         
-        # Get send log stats
-        sent_count = db.execute(
-            select(func.count(CampaignSendLog.id)).where(
-                and_(
-                    CampaignSendLog.campaign_id == campaign_id,
-                    CampaignSendLog.status == "sent",
-                )
-            )
-        ).scalar()
-        
-        failed_count = db.execute(
-            select(func.count(CampaignSendLog.id)).where(
-                and_(
-                    CampaignSendLog.campaign_id == campaign_id,
-                    CampaignSendLog.status == "failed",
-                )
-            )
-        ).scalar()
-        
-        total_recipients = db.execute(
-            select(func.count(CampaignSendLog.id)).where(
-                CampaignSendLog.campaign_id == campaign_id
-            )
-        ).scalar()
+        # No stats row until sending starts
+        if stats is None:
+            stats = CampaignStats(total_recipients=0, sent=0, failed=0, bounced=0, complained=0)
         
         return {
             "id": campaign.id,
             "status": campaign.status,
-            "sent_count": sent_count,
-            "failed_count": failed_count,
-            "total_recipients": total_recipients,
+            "sent_count": stats.sent,
+            "failed_count": stats.failed,
+            "bounced_count": stats.bounced,
+            "complained_count": stats.complained,
+            "remaining_count": max(0, stats.total_recipients - stats.sent - stats.failed),
+            "total_recipients": stats.total_recipients,
             "scheduled_for": campaign.scheduled_for,
             "sent_at": campaign.sent_at,
+            "last_event_at": stats.last_event_at,
         }
 
     @staticmethod
-    def delete_campaign(
-        db: Session,
+    async def delete_campaign(
+        db: AsyncSession,
         company_id: uuid.UUID,
         campaign_id: uuid.UUID,
     ) -> None:
@@ -486,26 +480,26 @@ class CampaignService:
             ResourceNotFoundError: If campaign not found
             AppPermissionError: If campaign doesn't belong to company or cannot be deleted
         """
-        campaign = db.execute(
+        campaign = (await db.execute(
             select(Campaign).where(
                 and_(
                     Campaign.id == campaign_id,
                     Campaign.company_id == company_id,
                 )
             )
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         
         if not campaign:
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
         
         # Prevent deletion of campaigns that are sending or already sent
-        if campaign.status in ["sending", "sent"]:
+        if campaign.status in ["sending", "sent", "partially_failed"]:
             raise AppPermissionError(
                 f"Cannot delete campaign in '{campaign.status}' status. "
                 f"Only draft and scheduled campaigns can be deleted."
             )
         
-        db.delete(campaign)
-        db.commit()
+        await db.delete(campaign)
+        await db.commit()
         
         logger.info(f"Campaign deleted: {campaign_id} (status: {campaign.status})")
@@ -0,0 +1,48 @@
+import uuid
+import datetime
+from sqlalchemy import BigInteger, TIMESTAMP, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class CampaignStats(Base):
+    """
+    Delivery counters of a campaign, one row per campaign.
+
+    🧠 MENTAL MODEL:
+    A rollup, never recounted on read. send_campaign creates the row with the
+    snapshot size; each batch adds the recipients it finished in the same
+    transaction as its send log upsert, so the counters can't drift from the
+    recipient snapshot. Status and list endpoints read this row instead of
+    counting send logs.
+    """
+    __tablename__ = "campaign_stats"
+
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("campaigns.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Recipients in the campaign's snapshot
+    total_recipients: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+    sent: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    failed: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    bounced: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    complained: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+    # Last time any counter moved
+    last_event_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True
+    )
+
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
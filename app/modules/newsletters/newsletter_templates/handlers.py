@@ -1,5 +1,6 @@
 from typing import Optional, List
 from fastapi import HTTPException, status, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from loguru import logger
 
@@ -158,7 +159,7 @@ class TemplateHandler:
     @staticmethod
     async def list_templates(
         company_id: str,
-        db: Session,
+        db: AsyncSession,
         page: int = 1,
         limit: int = 20
     ):
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Query, Form
 from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.database import get_db
+from app.database.database import get_db, get_async_read_db
 from app.modules.auth.routes import get_current_company
 from app.modules.newsletters.newsletter_templates.schemas import (
     TemplateCreateRequest,
@@ -97,7 +98,7 @@ async def list_templates(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     company_id: str = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     return await TemplateHandler.list_templates(company_id, db, page, limit)
 
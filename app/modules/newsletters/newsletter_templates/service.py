@@ -1,8 +1,9 @@
 import uuid
 from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
 from loguru import logger
 
 from app.modules.auth.model import Company
@@ -180,20 +181,26 @@ class TemplateService:
     @staticmethod
     async def list_templates(
         company_id: str,
-        db: Session,
+        db: AsyncSession,
         page: int = 1,
         limit: int = 20
     ) -> TemplateListResponse:
         try:
             skip = (page - 1) * limit
             
-            total = db.query(func.count(NewsletterTemplate.id)).filter(
-                NewsletterTemplate.company_id == uuid.UUID(company_id)
-            ).scalar() or 0
+            company_filter = NewsletterTemplate.company_id == uuid.UUID(company_id)
             
-            templates = db.query(NewsletterTemplate).filter(
-                NewsletterTemplate.company_id == uuid.UUID(company_id)
-            ).order_by(desc(NewsletterTemplate.updated_at)).offset(skip).limit(limit).all()
+            total = (await db.execute(
+                select(func.count(NewsletterTemplate.id)).where(company_filter)
+            )).scalar() or 0
+            
+            templates = (await db.execute(
+                select(NewsletterTemplate)
+                .where(company_filter)
+                .order_by(desc(NewsletterTemplate.updated_at))
+                .offset(skip)
+                .limit(limit)
+            )).scalars().all()
             
             items = [
                 TemplateListItem(
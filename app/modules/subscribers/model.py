@@ -1,6 +1,6 @@
 import uuid
 import datetime
-from sqlalchemy import String, TIMESTAMP, ForeignKey, UniqueConstraint, Index, func
+from sqlalchemy import String, TIMESTAMP, ForeignKey, UniqueConstraint, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -15,10 +15,19 @@ class Subscriber(Base):
     """
     __tablename__ = "subscribers"
     __table_args__ = (
+        # Also serves every lookup by company_id alone (leading column)
         UniqueConstraint("company_id", "subscriber_email", name="uq_subscriber_company_email"),
-        Index("idx_subscribers_company_id", "company_id"),
         Index("idx_subscribers_email", "subscriber_email"),
-        Index("idx_subscribers_status", "status"),
+        # Dashboard subscriber list, newest first
+        Index("idx_subscribers_company_created_at", "company_id", text("created_at DESC")),
+        # Company's active audience: recipient snapshots and subscribed counts
+        # (index-only), in place of a (company_id, status) index
+        Index(
+            "idx_subscribers_company_subscribed_id",
+            "company_id",
+            "id",
+            postgresql_where=text("status = 'subscribed'"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -27,12 +36,11 @@ class Subscriber(Base):
 
     company_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("companies.id", ondelete="CASCADE"),
-        index=True
+        ForeignKey("companies.id", ondelete="CASCADE")
     )
 
     # Email normalized to lowercase
-    subscriber_email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    subscriber_email: Mapped[str] = mapped_column(String(255), nullable=False)
 
     subscriber_name : Mapped[str | None] = mapped_column(String(100), nullable=True)
 
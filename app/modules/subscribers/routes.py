@@ -5,11 +5,12 @@ These routes are PUBLIC - no authentication required.
 They handle newsletter subscriptions from company websites.
 """
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status, BackgroundTasks, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.database.database import get_db
+from app.database.database import get_async_db, get_async_read_db
 from app.modules.subscribers.service import SubscriptionService
 from app.modules.subscribers.schemas import (
     SubscribeRequest,
@@ -38,8 +39,7 @@ public_router = APIRouter(
 async def subscribe_to_newsletter(
     company_id: str,
     request: SubscribeRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     origin: str = Header(None, description="Request Origin header")
 ) -> SubscribeResponse:
     """
@@ -84,8 +84,7 @@ async def subscribe_to_newsletter(
         company_id=company_id,
         email=request.email,
         origin=origin,
-        db=db,
-        background_tasks=background_tasks
+        db=db
     )
     
     # Handle responses
@@ -140,8 +139,7 @@ async def subscribe_to_newsletter(
 async def unsubscribe_from_newsletter(
     company_id: str,
     request: UnsubscribeRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> UnsubscribeResponse:
     """
     Unsubscribe an email from a company's newsletter.
@@ -174,11 +172,10 @@ async def unsubscribe_from_newsletter(
         )
     
     # Call subscription service
-    success, response = SubscriptionService.unsubscribe(
+    success, response = await SubscriptionService.unsubscribe(
         company_id=company_id,
         email=request.email,
-        db=db,
-        background_tasks=background_tasks
+        db=db
     )
     
     # Handle responses
@@ -218,7 +215,7 @@ protected_router = APIRouter(
 )
 async def get_subscriber_stats(
     company_id: str = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get subscriber statistics for the company.
@@ -233,9 +230,9 @@ async def get_subscriber_stats(
     import uuid
     
     try:
-        company = db.query(Company).filter(
-            Company.id == uuid.UUID(company_id)
-        ).first()
+        company = (await db.execute(
+            select(Company).where(Company.id == uuid.UUID(company_id))
+        )).scalar_one_or_none()
         
         if not company:
             raise HTTPException(
@@ -245,10 +242,12 @@ async def get_subscriber_stats(
         
         # Count active subscribers
         from app.modules.subscribers.model import Subscriber
-        active_count = db.query(Subscriber).filter(
-            Subscriber.company_id == uuid.UUID(company_id),
-            Subscriber.status == "subscribed"
-        ).count()
+        active_count = (await db.execute(
+            select(func.count(Subscriber.id)).where(
+                Subscriber.company_id == uuid.UUID(company_id),
+                Subscriber.status == "subscribed"
+            )
+        )).scalar()
         
         return {
             "company_id": str(company.id),
@@ -285,7 +284,7 @@ async def list_subscribers(
     limit: int = Query(20, ge=1, le=100),
     email: str = Query(None),
     company_id: str = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     List all subscribers for a company with pagination and optional search.
@@ -310,24 +309,26 @@ async def list_subscribers(
         limit = min(100, max(1, limit))
         skip = (page - 1) * limit
         
-        # Build query
-        query = db.query(Subscriber).filter(
-            Subscriber.company_id == uuid.UUID(company_id)
-        )
+        # Build filters
+        filters = [Subscriber.company_id == uuid.UUID(company_id)]
         
         # Apply email filter if provided
         if email:
-            query = query.filter(
+            filters.append(
                 Subscriber.subscriber_email.ilike(f"%{email}%")
             )
         
         # Get total count
-        total = query.count()
+        total = (await db.execute(
+            select(func.count(Subscriber.id)).where(*filters)
+        )).scalar()
         
         # Get paginated results
-        subscribers = query.order_by(
-            Subscriber.created_at.desc()
-        ).offset(skip).limit(limit).all()
+        subscribers = (await db.execute(
+            select(Subscriber).where(*filters).order_by(
+                Subscriber.created_at.desc()
+            ).offset(skip).limit(limit)
+        )).scalars().all()
         
         return {
             "subscribers": [
@@ -367,7 +368,7 @@ async def list_subscribers(
 async def delete_subscriber(
     subscriber_id: str,
     company_id: str = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a subscriber by ID.
@@ -383,10 +384,12 @@ async def delete_subscriber(
     
     try:
         # Verify subscriber exists and belongs to the company
-        subscriber = db.query(Subscriber).filter(
-            Subscriber.id == uuid.UUID(subscriber_id),
-            Subscriber.company_id == uuid.UUID(company_id)
-        ).first()
+        subscriber = (await db.execute(
+            select(Subscriber).where(
+                Subscriber.id == uuid.UUID(subscriber_id),
+                Subscriber.company_id == uuid.UUID(company_id)
+            )
+        )).scalar_one_or_none()
         
         if not subscriber:
             raise HTTPException(
@@ -395,8 +398,8 @@ async def delete_subscriber(
             )
         
         # Delete the subscriber
-        db.delete(subscriber)
-        db.commit()
+        await db.delete(subscriber)
+        await db.commit()
         
         return {
             "message": "Subscriber deleted successfully",
@@ -411,7 +414,7 @@ async def delete_subscriber(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error deleting subscriber: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
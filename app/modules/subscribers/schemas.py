@@ -20,6 +20,7 @@ class SubscribeResponse(BaseModel):
     code: Optional[str] = Field(None, description="Error code (if failed)")
     max_subscribers: Optional[int] = Field(None, description="Max subscribers for tier (if upgrade_required)")
     current_subscribers: Optional[int] = Field(None, description="Current subscriber count (if upgrade_required)")
+    email_queued: Optional[bool] = Field(None, description="Whether the welcome email was queued (if subscribed)")
 
 
 class UnsubscribeRequest(BaseModel):
@@ -32,3 +33,4 @@ class UnsubscribeResponse(BaseModel):
     status: str = Field(..., description="Unsubscription status")
     message: str = Field(..., description="Human-readable message")
     code: Optional[str] = Field(None, description="Error code (if failed)")
+    email_queued: Optional[bool] = Field(None, description="Whether the confirmation email was queued (if unsubscribed)")
@@ -14,10 +14,9 @@ import re
 import uuid
 from typing import Tuple, Optional
 from urllib.parse import urlparse
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
-from fastapi import BackgroundTasks
 
 from app.modules.auth.model import Company
 from app.modules.subscribers.model import Subscriber
@@ -132,8 +131,7 @@ class SubscriptionService:
         company_id: str,
         email: str,
         origin: Optional[str],
-        db: Session,
-        background_tasks: Optional[BackgroundTasks] = None
+        db: AsyncSession
     ) -> Tuple[bool, dict]:
         """
         Subscribe an email to company newsletter.
@@ -159,9 +157,9 @@ class SubscriptionService:
         """
         try:
             # Step 1: Validate and fetch company
-            company = db.query(Company).filter(
-                Company.id == uuid.UUID(company_id)
-            ).first()
+            company = (await db.execute(
+                select(Company).where(Company.id == uuid.UUID(company_id))
+            )).scalar_one_or_none()
             
             if not company:
                 return False, {
@@ -203,12 +201,14 @@ class SubscriptionService:
             normalized_email = SubscriptionService.normalize_email(email)
             
             # Step 5: Check for existing subscription
-            existing = db.query(Subscriber).filter(
-                and_(
-                    Subscriber.company_id == uuid.UUID(company_id),
-                    Subscriber.subscriber_email == normalized_email
+            existing = (await db.execute(
+                select(Subscriber).where(
+                    and_(
+                        Subscriber.company_id == uuid.UUID(company_id),
+                        Subscriber.subscriber_email == normalized_email
+                    )
                 )
-            ).first()
+            )).scalar_one_or_none()
             
             if existing:
                 if existing.status == "subscribed":
@@ -223,22 +223,22 @@ class SubscriptionService:
                     # Re-activate unsubscribed email
                     existing.status = "subscribed"
                     existing.source_origin = origin
-                    db.commit()
+                    await db.commit()
                     
                     # Send welcome email for resubscription
-                    if background_tasks:
-                        background_tasks.add_task(
-                            EmailService.send_subscription_welcome_email,
-                            normalized_email,
-                            company.company_name,
-                            company.website_url
-                        )
+                    email_queued = await EmailService.enqueue(
+                        "subscription_welcome",
+                        normalized_email,
+                        company_name=company.company_name,
+                        website_url=company.website_url
+                    )
                     
                     return True, {
                         "status": "resubscribed",
                         "message": "Successfully resubscribed",
                         "subscriber_id": str(existing.id),
-                        "email": normalized_email
+                        "email": normalized_email,
+                        "email_queued": email_queued
                     }
             
             # Step 6: Enforce free tier limits
@@ -271,17 +271,15 @@ class SubscriptionService:
             company.subscriber_count = (company.subscriber_count or 0) + 1
             
             # Commit transaction
-            db.commit()
-            db.refresh(new_subscriber)
-            
-            # Send welcome email in background
-            if background_tasks:
-                background_tasks.add_task(
-                    EmailService.send_subscription_welcome_email,
-                    normalized_email,
-                    company.company_name,
-                    company.website_url
-                )
+            await db.commit()
+            
+            # Send welcome email on the transactional lane
+            email_queued = await EmailService.enqueue(
+                "subscription_welcome",
+                normalized_email,
+                company_name=company.company_name,
+                website_url=company.website_url
+            )
             
             logger.info(
                 f"Subscription successful. Company: {company_id}, "
@@ -292,11 +290,12 @@ class SubscriptionService:
                 "status": "subscribed",
                 "message": "Successfully subscribed to newsletter",
                 "subscriber_id": str(new_subscriber.id),
-                "email": normalized_email
+                "email": normalized_email,
+                "email_queued": email_queued
             }
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Subscription error for company {company_id}: {str(e)}")
             return False, {
                 "status": "error",
@@ -305,11 +304,10 @@ class SubscriptionService:
             }
 
     @staticmethod
-    def unsubscribe(
+    async def unsubscribe(
         company_id: str,
         email: str,
-        db: Session,
-        background_tasks: Optional[BackgroundTasks] = None
+        db: AsyncSession
     ) -> Tuple[bool, dict]:
         """
         Unsubscribe an email from company newsletter.
@@ -318,7 +316,6 @@ class SubscriptionService:
             company_id: UUID of company
             email: Email to unsubscribe
             db: Database session
-            background_tasks: Optional BackgroundTasks for sending emails
             
         Returns:
             (success, response_dict)
@@ -326,12 +323,14 @@ class SubscriptionService:
         try:
             normalized_email = SubscriptionService.normalize_email(email)
             
-            subscriber = db.query(Subscriber).filter(
-                and_(
-                    Subscriber.company_id == uuid.UUID(company_id),
-                    Subscriber.subscriber_email == normalized_email
+            subscriber = (await db.execute(
+                select(Subscriber).where(
+                    and_(
+                        Subscriber.company_id == uuid.UUID(company_id),
+                        Subscriber.subscriber_email == normalized_email
+                    )
                 )
-            ).first()
+            )).scalar_one_or_none()
             
             if not subscriber:
                 return False, {
@@ -350,22 +349,23 @@ class SubscriptionService:
             subscriber.status = "unsubscribed"
             
             # Decrement subscriber count
-            company = db.query(Company).filter(
-                Company.id == uuid.UUID(company_id)
-            ).first()
+            company = (await db.execute(
+                select(Company).where(Company.id == uuid.UUID(company_id))
+            )).scalar_one_or_none()
             
             if company:
                 company.subscriber_count = max(0, (company.subscriber_count or 1) - 1)
             
-            db.commit()
+            await db.commit()
             
-            # Send unsubscribe confirmation email in background
-            if background_tasks and company:
-                background_tasks.add_task(
-                    EmailService.send_unsubscribe_confirmation_email,
+            # Send unsubscribe confirmation email on the transactional lane
+            email_queued = None
+            if company:
+                email_queued = await EmailService.enqueue(
+                    "unsubscribe_confirmation",
                     normalized_email,
-                    company.company_name,
-                    company.website_url
+                    company_name=company.company_name,
+                    website_url=company.website_url
                 )
             
             logger.info(
@@ -375,11 +375,12 @@ class SubscriptionService:
             
             return True, {
                 "status": "unsubscribed",
-                "message": "Successfully unsubscribed"
+                "message": "Successfully unsubscribed",
+                "email_queued": email_queued
             }
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Unsubscription error for company {company_id}: {str(e)}")
             return False, {
                 "status": "error",
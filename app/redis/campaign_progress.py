@@ -0,0 +1,191 @@
+"""Per-campaign send progress counters kept in Redis."""
+import json
+import time
+
+import redis
+from loguru import logger
+
+from app.utils import constants
+
+
+# Atomically adds this batch's outcome, publishes a progress event and returns
+# the updated counters.
+# KEYS[1] = progress hash, ARGV = sent delta, failed delta, ttl seconds, channel.
+# Returns {total, sent, failed, remaining}, or nil when tracking never started.
+RECORD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local sent = redis.call('HINCRBY', KEYS[1], 'sent', ARGV[1])
+local failed = redis.call('HINCRBY', KEYS[1], 'failed', ARGV[2])
+local total = tonumber(redis.call('HGET', KEYS[1], 'total')) or 0
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+
+local now_t = redis.call('TIME')
+local now = tonumber(now_t[1]) + tonumber(now_t[2]) / 1000000
+local started_at = tonumber(redis.call('HGET', KEYS[1], 'started_at')) or now
+local baseline = tonumber(redis.call('HGET', KEYS[1], 'baseline')) or 0
+local remaining = total - sent - failed
+local event = {
+    event = 'progress',
+    total = total,
+    sent = sent,
+    failed = failed,
+    remaining = remaining,
+    sent_delta = tonumber(ARGV[1]),
+    failed_delta = tonumber(ARGV[2]),
+}
+if now > started_at then
+    event.rate = (sent + failed - baseline) / (now - started_at)
+    if event.rate > 0 then
+        event.eta_seconds = remaining / event.rate
+    end
+end
+redis.call('PUBLISH', ARGV[4], cjson.encode(event))
+
+return {total, sent, failed, remaining}
+"""
+
+
+def parse_progress(counters: dict, now: float | None = None) -> dict | None:
+    """Turn a raw progress hash into counters with rate (emails/s) and ETA."""
+    if not counters:
+        return None
+
+    total = int(counters.get("total", 0))
+    sent = int(counters.get("sent", 0))
+    failed = int(counters.get("failed", 0))
+    remaining = max(0, total - sent - failed)
+
+    progress = {
+        "total": total,
+        "sent": sent,
+        "failed": failed,
+        "remaining": remaining,
+        "enqueued": int(counters.get("enqueued", 0)),
+        "company_id": counters.get("company_id"),
+        "rate": None,
+        "eta_seconds": None,
+    }
+
+    now = now if now is not None else time.time()
+    elapsed = now - float(counters.get("started_at", now))
+    if elapsed > 0:
+        rate = (sent + failed - int(counters.get("baseline", 0))) / elapsed
+        progress["rate"] = round(rate, 2)
+        if rate > 0:
+            progress["eta_seconds"] = round(remaining / rate, 1)
+
+    return progress
+
+
+class CampaignProgress:
+    """
+    Atomic enqueued / sent / failed / remaining counters per campaign.
+
+    send_campaign starts tracking with the snapshot totals and every batch
+    records its newly finished recipients. Every update is published on the
+    campaign's events channel for live progress streams.
+
+    These counters are best effort: completion and status come from the
+    campaign_stats table, updated in the batch's own transaction.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "skymail:campaign_progress",
+        ttl_seconds: int = 7 * 24 * 3600,
+    ):
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis.Redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=20,
+            retry_on_timeout=True,
+        )
+        self._record = self.redis.register_script(RECORD_SCRIPT)
+
+    def key(self, campaign_id: str) -> str:
+        return f"{self.key_prefix}:{campaign_id}"
+
+    def channel(self, campaign_id: str) -> str:
+        return f"{self.key_prefix}:events:{campaign_id}"
+
+    def start(
+        self,
+        campaign_id: str,
+        total: int,
+        sent: int = 0,
+        failed: int = 0,
+        company_id: str | None = None,
+    ) -> None:
+        """(Re)initialize counters from the recipient snapshot."""
+        key = self.key(campaign_id)
+        state = {
+            "total": total,
+            "sent": sent,
+            "failed": failed,
+            "enqueued": 0,
+            # Rate is measured from this point, excluding already finished recipients
+            "started_at": time.time(),
+            "baseline": sent + failed,
+        }
+        if company_id:
+            state["company_id"] = company_id
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping=state)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis campaign progress not started for {campaign_id}: {str(e)}")
+
+    def add_enqueued(self, campaign_id: str, batches: int = 1) -> None:
+        try:
+            self.redis.hincrby(self.key(campaign_id), "enqueued", batches)
+        except redis.RedisError as e:
+            logger.warning(f"Redis campaign progress not updated for {campaign_id}: {str(e)}")
+
+    def record(self, campaign_id: str, sent: int = 0, failed: int = 0) -> dict | None:
+        """
+        Add newly finished recipients.
+
+        Returns:
+            Updated counters, or None if not tracked
+
+        Raises:
+            redis.RedisError: callers log it; campaign_stats stays authoritative
+        """
+        counters = self._record(
+            keys=[self.key(campaign_id)],
+            args=[sent, failed, self.ttl_seconds, self.channel(campaign_id)],
+        )
+        if counters is None:
+            return None
+        total, sent, failed, remaining = (int(value) for value in counters)
+        return {"total": total, "sent": sent, "failed": failed, "remaining": remaining}
+
+    def publish_status(self, campaign_id: str, status: str) -> None:
+        """Tell progress streams the campaign reached a final status."""
+        try:
+            self.redis.publish(
+                self.channel(campaign_id), json.dumps({"event": "status", "status": status})
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Redis campaign status not published for {campaign_id}: {str(e)}")
+
+    def get(self, campaign_id: str) -> dict | None:
+        """Current counters, or None if not tracked (or Redis is unavailable)."""
+        try:
+            counters = self.redis.hgetall(self.key(campaign_id))
+        except redis.RedisError as e:
+            logger.warning(f"Redis campaign progress unavailable for {campaign_id}: {str(e)}")
+            return None
+
+        return parse_progress(counters)
+
+
+campaign_progress = CampaignProgress(redis_url=constants.REDIS_URL)
@@ -0,0 +1,164 @@
+"""Fair-share scheduling of campaign batches across companies."""
+import time
+import uuid
+
+import redis
+from loguru import logger
+
+
+# Puts companies at the tail of the round-robin ring unless they're already in it.
+# KEYS = ring; ARGV = company ids
+ACTIVATE_SCRIPT = """
+local added = 0
+for _, company in ipairs(ARGV) do
+    if not redis.call('LPOS', KEYS[1], company) then
+        redis.call('RPUSH', KEYS[1], company)
+        added = added + 1
+    end
+end
+return added
+"""
+
+# Reserves one in-flight slot for a company if neither it nor the cluster is at
+# its cap. In-flight slots are sorted sets scored by expiry, so slots of crashed
+# workers free themselves.
+# KEYS = global in-flight set, company in-flight set
+# ARGV = now, slot expiry, company cap, global cap, company id, slot token
+# Returns 1 when reserved, 0 when the company is at its cap, -1 when the cluster is
+TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local expires_at = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[4]) then
+    return -1
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+if redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[3]) then
+    return 0
+end
+
+redis.call('ZADD', KEYS[2], expires_at, ARGV[6])
+redis.call('EXPIRE', KEYS[2], math.ceil(expires_at - now) + 60)
+redis.call('ZADD', KEYS[1], expires_at, ARGV[5] .. ':' .. ARGV[6])
+return 1
+"""
+
+
+class FairBatchScheduler:
+    """
+    Round-robin in-flight slots across companies, with per-company and global caps.
+
+    Instead of pushing every batch straight into the FIFO ``email_batches``
+    queue, campaigns wait for a slot: the dispatcher walks a ring of companies
+    with work left and hands out one slot per company per round, never more
+    than ``company_cap`` in flight for one company and ``global_cap`` overall,
+    so a small sender's batches are queued behind at most one round of other
+    tenants instead of a whale's whole campaign.
+
+    Redis only holds the ring and the slots, never batches: what is left to
+    send lives in Postgres (see batch_dispatcher), so state lost to eviction or
+    a flush is rebuilt from there. Every key shares the ``{...}`` hash tag in
+    ``key_prefix`` and is declared to its script, which keeps the scripts valid
+    on Redis Cluster.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        company_cap: int,
+        global_cap: int,
+        slot_timeout: float,
+        key_prefix: str = "skymail:{fair}",
+    ):
+        self.company_cap = max(1, company_cap)
+        self.global_cap = max(1, global_cap)
+        self.slot_timeout = slot_timeout
+        self.key_prefix = key_prefix
+        self.redis = redis.Redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=20,
+            retry_on_timeout=True,
+        )
+        self._activate = self.redis.register_script(ACTIVATE_SCRIPT)
+        self._take = self.redis.register_script(TAKE_SCRIPT)
+
+    def _ring_key(self) -> str:
+        return f"{self.key_prefix}:ring"
+
+    def _global_inflight_key(self) -> str:
+        return f"{self.key_prefix}:inflight"
+
+    def _inflight_key(self, company_id: str) -> str:
+        return f"{self.key_prefix}:inflight:{company_id}"
+
+    def activate(self, company_ids: list[str]) -> int:
+        """
+        Put companies with batches to send in the ring.
+
+        Returns:
+            Number of companies that weren't in it yet
+        """
+        if not company_ids:
+            return 0
+        return self._activate(keys=[self._ring_key()], args=list(company_ids))
+
+    def deactivate(self, company_id: str) -> None:
+        """Drop a company with nothing left to send from the ring."""
+        self.redis.lrem(self._ring_key(), 1, company_id)
+
+    def take(self, max_batches: int) -> list[tuple[str, str]]:
+        """
+        Reserve up to ``max_batches`` in-flight slots in round-robin company order.
+
+        Returns:
+            (company_id, slot token) per slot; the slot must be given back with
+            release() when its batch finishes (or if no batch is sent for it)
+        """
+        ring_key = self._ring_key()
+        slots = []
+        capped = 0
+        ring_len = self.redis.llen(ring_key)
+
+        while len(slots) < max_batches and capped < ring_len:
+            # Rotate: the tail company moves to the head
+            company_id = self.redis.rpoplpush(ring_key, ring_key)
+            if company_id is None:
+                break
+
+            token = uuid.uuid4().hex
+            now = time.time()
+            taken = self._take(
+                keys=[self._global_inflight_key(), self._inflight_key(company_id)],
+                args=[
+                    now,
+                    now + self.slot_timeout,
+                    self.company_cap,
+                    self.global_cap,
+                    company_id,
+                    token,
+                ],
+            )
+            if taken < 0:
+                break
+            if taken == 0:
+                capped += 1
+                continue
+
+            capped = 0
+            slots.append((company_id, token))
+
+        return slots
+
+    def release(self, company_id: str, token: str) -> None:
+        try:
+            pipe = self.redis.pipeline()
+            pipe.zrem(self._inflight_key(company_id), token)
+            pipe.zrem(self._global_inflight_key(), f"{company_id}:{token}")
+            pipe.execute()
+        except redis.RedisError as e:
+            # The slot expires on its own after slot_timeout
+            logger.warning(f"Redis fair scheduler slot not released: {str(e)}")
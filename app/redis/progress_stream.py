@@ -0,0 +1,100 @@
+"""Fan-out of campaign progress events from Redis pub/sub to SSE clients."""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from loguru import logger
+
+from app.redis.campaign_progress import campaign_progress, parse_progress
+from app.redis.redis_manager import redis_manager
+
+
+class CampaignProgressStream:
+    """
+    One Redis pattern subscription per API process, shared by every watcher.
+
+    Events published by the batch workers are routed to per-client asyncio
+    queues, so watchers cost no Redis connections of their own and no database
+    queries at all.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._watchers: dict[str, set[asyncio.Queue]] = {}
+        self._reader: asyncio.Task | None = None
+        self._pattern = campaign_progress.channel("*")
+        self._channel_prefix = campaign_progress.channel("")
+
+    async def snapshot(self, campaign_id: str) -> dict | None:
+        """Current counters straight from the Redis progress hash."""
+        try:
+            counters = await redis_manager.redis.hgetall(campaign_progress.key(campaign_id))
+        except Exception as e:
+            logger.error(f"Redis campaign progress error: {str(e)}")
+            return None
+        return parse_progress(counters)
+
+    @asynccontextmanager
+    async def subscribe(self, campaign_id: str):
+        """Yield a queue receiving this campaign's events until the block exits."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._watchers.setdefault(campaign_id, set()).add(queue)
+        self._ensure_reader()
+        try:
+            yield queue
+        finally:
+            watchers = self._watchers.get(campaign_id)
+            if watchers is not None:
+                watchers.discard(queue)
+                if not watchers:
+                    del self._watchers[campaign_id]
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            pubsub = redis_manager.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(self._pattern)
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Campaign progress subscription failed, resubscribing: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        campaign_id = channel[len(self._channel_prefix):]
+        watchers = self._watchers.get(campaign_id)
+        if not watchers:
+            return
+        event = json.loads(data)
+        for queue in watchers:
+            # A slow client only misses intermediate deltas; counters are cumulative
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+progress_stream = CampaignProgressStream()
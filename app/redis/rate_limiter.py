@@ -0,0 +1,242 @@
+"""Cluster-wide SES send rate limiter backed by Redis."""
+import time
+
+import redis
+from loguru import logger
+
+from app.utils.rate_limiter import TokenBucket
+
+
+# Atomically refills and (if every bucket has room) debits all buckets in KEYS.
+# KEYS = bucket keys, global first, then the AIMD state hash when ARGV[2] is 1
+# ARGV[1] = permits requested, ARGV[2] = adaptive flag, then one (rate, capacity)
+# pair per bucket. With the flag set, the global bucket refills at the rate the
+# AIMD controllers keep in the state hash (capped at its configured rate), so
+# every worker uses the same rate.
+# Returns 0 when permits were granted, otherwise milliseconds to wait.
+TOKEN_BUCKET_SCRIPT = """
+local now_t = redis.call('TIME')
+local now = tonumber(now_t[1]) * 1000 + math.floor(tonumber(now_t[2]) / 1000)
+local second = tonumber(now_t[1])
+local requested = tonumber(ARGV[1])
+local adaptive = ARGV[2] == '1'
+local bucket_count = #KEYS
+if adaptive then
+    bucket_count = bucket_count - 1
+end
+local wait = 0
+local buckets = {}
+
+for i = 1, bucket_count do
+    local key = KEYS[i]
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local capacity = tonumber(ARGV[i * 2 + 2])
+    if i == 1 and adaptive then
+        local learned = tonumber(redis.call('HGET', KEYS[#KEYS], 'rate'))
+        if learned and learned > 0 and learned < rate then
+            rate = learned
+            -- At most one second of burst at the learned rate
+            capacity = math.max(requested, math.min(capacity, math.max(1, rate)))
+        end
+    end
+    local state = redis.call('HMGET', key, 'tokens', 'ts', 'window', 'count', 'prev_count')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+    if tokens < requested then
+        wait = math.max(wait, math.ceil((requested - tokens) * 1000 / rate))
+    end
+    buckets[i] = {
+        rate = rate,
+        capacity = capacity,
+        tokens = tokens,
+        window = tonumber(state[3]) or second,
+        count = tonumber(state[4]) or 0,
+        prev_count = tonumber(state[5]) or 0,
+    }
+end
+
+for i = 1, bucket_count do
+    local key = KEYS[i]
+    local b = buckets[i]
+    if wait == 0 then
+        b.tokens = b.tokens - requested
+        -- Per-second grant counters used for utilization reporting
+        if b.window == second then
+            b.count = b.count + requested
+        elseif b.window == second - 1 then
+            b.prev_count = b.count
+            b.count = requested
+        else
+            b.prev_count = 0
+            b.count = requested
+        end
+        b.window = second
+    end
+    redis.call('HSET', key,
+        'tokens', tostring(b.tokens), 'ts', now,
+        'window', b.window, 'count', b.count, 'prev_count', b.prev_count)
+    redis.call('PEXPIRE', key, math.ceil(b.capacity * 1000 / b.rate) + 60000)
+end
+
+return wait
+"""
+
+
+class DistributedRateLimiter:
+    """
+    Token bucket shared by every Celery worker through an atomic Lua script.
+
+    A global bucket enforces the account-wide SES quota; an optional
+    per-company bucket keeps one tenant from taking the whole quota.
+    With ``adaptive_rate_key`` (the AdaptiveSendController state hash), the
+    global bucket refills at the rate the controllers learned from throttling,
+    read inside the script. ``global_rate`` stays the ceiling.
+    If Redis is unreachable, falls back to a process-local token bucket.
+
+    Every key shares the ``{...}`` hash tag in ``key_prefix`` (the AIMD state
+    key must too), which keeps the script valid on Redis Cluster.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        global_rate: float,
+        company_rate: float = 0,
+        key_prefix: str = "skymail:{ses_rate}",
+        adaptive_rate_key: str | None = None,
+    ):
+        self.global_rate = global_rate
+        self.company_rate = company_rate
+        self.key_prefix = key_prefix
+        self.adaptive_rate_key = adaptive_rate_key
+        self.redis = redis.Redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=20,
+            retry_on_timeout=True,
+        )
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._fallback = TokenBucket(rate=global_rate)
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the rate of the process-local fallback bucket.
+
+        The Redis bucket never takes a per-process rate: an adaptive rate is
+        shared through ``adaptive_rate_key`` instead.
+        """
+        self._fallback.set_rate(min(rate, self.global_rate))
+
+    def _global_key(self) -> str:
+        return f"{self.key_prefix}:global"
+
+    def _company_key(self, company_id: str) -> str:
+        return f"{self.key_prefix}:company:{company_id}"
+
+    def _buckets(self, company_id: str | None) -> list[tuple[str, float]]:
+        buckets = [(self._global_key(), self.global_rate)]
+        if company_id and self.company_rate > 0:
+            buckets.append((self._company_key(company_id), self.company_rate))
+        return buckets
+
+    def max_permits(self, company_id: str | None = None) -> int:
+        """Largest request every bucket involved can grant at once (its capacity)."""
+        return max(1, int(min(max(1, rate) for _, rate in self._buckets(company_id))))
+
+    def try_acquire(self, company_id: str | None = None, permits: int = 1) -> float:
+        """
+        Take ``permits`` from the global (and company) bucket if all have room.
+
+        Returns:
+            0.0 on success, otherwise the seconds to wait before retrying
+
+        Raises:
+            ValueError: If ``permits`` exceeds max_permits(); such a request
+                could never be granted
+        """
+        if self.global_rate <= 0:
+            return 0.0
+
+        if permits > self.max_permits(company_id):
+            raise ValueError(
+                f"{permits} permits exceed the bucket capacity of {self.max_permits(company_id)}"
+            )
+
+        buckets = self._buckets(company_id)
+        keys = [key for key, _ in buckets]
+        args = [permits, 1 if self.adaptive_rate_key else 0]
+        for _, rate in buckets:
+            args.extend([rate, max(1, rate)])
+        if self.adaptive_rate_key:
+            keys.append(self.adaptive_rate_key)
+
+        try:
+            wait_ms = self._script(keys=keys, args=args)
+            return int(wait_ms) / 1000
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using local limit: {str(e)}")
+            return self._fallback.try_acquire(permits)
+
+    def acquire(
+        self,
+        company_id: str | None = None,
+        permits: int = 1,
+        timeout: float | None = None,
+    ) -> bool:
+        """
+        Block until permits are granted. Returns False if ``timeout`` expires first.
+
+        Requests larger than max_permits() are taken in capacity-sized chunks;
+        chunks granted before a timeout are not given back.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while permits > 0:
+            chunk = min(permits, self.max_permits(company_id))
+            while True:
+                wait = self.try_acquire(company_id, chunk)
+                if wait <= 0:
+                    break
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                time.sleep(wait)
+            permits -= chunk
+        return True
+
+    def utilization(self, company_id: str | None = None) -> dict:
+        """
+        Report permits granted in the last full second against the configured rate.
+
+        Returns:
+            Dict with rate, sent_last_second and utilization (0.0 - 1.0)
+        """
+        key, rate = (
+            (self._company_key(company_id), self.company_rate)
+            if company_id
+            else (self._global_key(), self.global_rate)
+        )
+        try:
+            now_seconds, _ = self.redis.time()
+            window, count, prev_count = self.redis.hmget(key, "window", "count", "prev_count")
+            if not company_id and self.adaptive_rate_key:
+                learned = self.redis.hget(self.adaptive_rate_key, "rate")
+                if learned is not None and 0 < float(learned) < rate:
+                    rate = float(learned)
+        except redis.RedisError as e:
+            logger.error(f"Redis rate limiter utilization error: {str(e)}")
+            return {"rate": rate, "sent_last_second": None, "utilization": None}
+
+        window = int(window or 0)
+        if window == now_seconds:
+            sent = int(prev_count or 0)
+        elif window == now_seconds - 1:
+            sent = int(count or 0)
+        else:
+            sent = 0
+
+        return {
+            "rate": rate,
+            "sent_last_second": sent,
+            "utilization": round(sent / rate, 4) if rate > 0 else 0.0,
+        }
@@ -0,0 +1,201 @@
+"""AIMD controller that adapts SES send rate and concurrency to throttling."""
+import threading
+import time
+from contextlib import contextmanager
+
+import redis
+from loguru import logger
+
+
+# The AIMD rate lives in one Redis hash shared by every worker (and read by the
+# token bucket script, see DistributedRateLimiter), so changes are made in place.
+# Lua numbers come back as integers, so rates are returned as strings.
+
+# KEYS = state hash; ARGV = step, max rate, ttl
+INCREASE_SCRIPT = """
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or tonumber(ARGV[2])
+rate = math.min(tonumber(ARGV[2]), rate + tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'rate', tostring(rate))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return tostring(rate)
+"""
+
+# A throttle burst seen by many workers counts once: decreases closer together
+# than the cooldown, cluster-wide, are ignored.
+# KEYS = state hash; ARGV = factor, min rate, max rate, cooldown ms, ttl
+# Returns {1 if lowered else 0, rate}
+DECREASE_SCRIPT = """
+local now_t = redis.call('TIME')
+local now = tonumber(now_t[1]) * 1000 + math.floor(tonumber(now_t[2]) / 1000)
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or tonumber(ARGV[3])
+local decreased_at = tonumber(redis.call('HGET', KEYS[1], 'decreased_at')) or 0
+if now - decreased_at < tonumber(ARGV[4]) then
+    return {0, tostring(rate)}
+end
+rate = math.max(tonumber(ARGV[2]), rate * tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'rate', tostring(rate), 'decreased_at', now)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {1, tostring(rate)}
+"""
+
+
+class AdaptiveSendController:
+    """
+    Additive-increase / multiplicative-decrease control of the SES send path.
+
+    - Every ``increase_after`` consecutive successes add ``increase_step`` emails/s
+      and one in-flight slot.
+    - A throttle multiplies the rate by ``decrease_factor`` and halves the slots
+      (at most once per ``decrease_cooldown`` seconds, so one burst of throttles
+      counts as a single signal).
+
+    The rate is one cluster-wide value in the ``state_key`` hash, changed
+    atomically by every worker's feedback and read by the Redis token bucket,
+    so all workers refill the shared bucket at the same rate. ``self.rate`` is
+    this process's last view of it, used by process-local limiters (and while
+    Redis is unreachable). Concurrency is per process.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        max_rate: float,
+        max_concurrency: int,
+        min_rate: float = 1.0,
+        increase_step: float = 1.0,
+        increase_after: int = 50,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        state_key: str = "skymail:{ses_rate}:aimd",
+        state_ttl: int = 3600,
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.state_key = state_key
+        self.state_ttl = state_ttl
+
+        self.rate = max_rate
+        self.concurrency = self.max_concurrency
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+
+        self.redis = redis.Redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=20,
+            retry_on_timeout=True,
+        )
+        self._increase = self.redis.register_script(INCREASE_SCRIPT)
+        self._decrease = self.redis.register_script(DECREASE_SCRIPT)
+
+    # ======================== PERSISTED STATE ========================
+
+    def load(self) -> None:
+        """Start from the rate learned by the cluster, if any."""
+        try:
+            rate, concurrency = self.redis.hmget(self.state_key, "rate", "concurrency")
+        except redis.RedisError as e:
+            logger.warning(f"Redis AIMD state unavailable: {str(e)}")
+            return
+
+        with self._lock:
+            if rate is not None:
+                self.rate = min(self.max_rate, max(self.min_rate, float(rate)))
+            if concurrency is not None:
+                self.concurrency = min(self.max_concurrency, max(1, int(concurrency)))
+            self._slots.notify_all()
+
+    def save(self) -> None:
+        """Keep the concurrency this process reached for future batches."""
+        with self._lock:
+            concurrency = self.concurrency
+        try:
+            # The rate is never written back from here: it only changes atomically
+            self.redis.hset(self.state_key, "concurrency", concurrency)
+            self.redis.expire(self.state_key, self.state_ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Redis AIMD state not saved: {str(e)}")
+
+    # ======================== CONCURRENCY ========================
+
+    @contextmanager
+    def slot(self):
+        """Hold one in-flight slot; blocks while ``concurrency`` slots are busy."""
+        with self._slots:
+            while self._in_flight >= self.concurrency:
+                self._slots.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._in_flight -= 1
+                self._slots.notify()
+
+    # ======================== FEEDBACK ========================
+
+    def on_success(self, count: int = 1) -> None:
+        with self._lock:
+            self._successes += count
+            if self._successes < self.increase_after:
+                return
+            self._successes = 0
+            if self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._slots.notify()
+
+        try:
+            rate = float(self._increase(
+                keys=[self.state_key], args=[self.increase_step, self.max_rate, self.state_ttl]
+            ))
+        except redis.RedisError as e:
+            logger.warning(f"Redis AIMD rate not raised, raising local rate: {str(e)}")
+            rate = min(self.max_rate, self.rate + self.increase_step)
+
+        with self._lock:
+            self.rate = rate
+
+    def on_throttle(self) -> bool:
+        """Back off. Returns True if this call actually lowered the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self._successes = 0
+            if now - self._last_decrease < self.decrease_cooldown:
+                return False
+            self._last_decrease = now
+            self.concurrency = max(1, self.concurrency // 2)
+
+        try:
+            lowered, rate = self._decrease(
+                keys=[self.state_key],
+                args=[
+                    self.decrease_factor,
+                    self.min_rate,
+                    self.max_rate,
+                    int(self.decrease_cooldown * 1000),
+                    self.state_ttl,
+                ],
+            )
+            lowered, rate = bool(int(lowered)), float(rate)
+        except redis.RedisError as e:
+            logger.warning(f"Redis AIMD rate not lowered, lowering local rate: {str(e)}")
+            lowered, rate = True, max(self.min_rate, self.rate * self.decrease_factor)
+
+        with self._lock:
+            self.rate = rate
+            concurrency = self.concurrency
+
+        if lowered:
+            logger.warning(
+                f"⏬ SES throttled: send rate lowered to {rate:.2f}/s, concurrency {concurrency}"
+            )
+        return lowered
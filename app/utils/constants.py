@@ -30,9 +30,43 @@ SQLALCHEMY_DATABASE_URL = (
     f"postgresql+psycopg2://"
     f"{os.getenv('DB_USER')}:"
     f"{os.getenv('DB_PASSWORD')}@"
-    f"{os.getenv('DB_HOST', 'localhost')}:5432/"
+    f"{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/"
     f"{os.getenv('DB_NAME')}"
 ) 
+# Same database through asyncpg, for the FastAPI request path
+SQLALCHEMY_ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    "postgresql+psycopg2://", "postgresql+asyncpg://", 1
+)
+
+# Connection pools. Each engine holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections: API processes have two engines (sync + async), every Celery
+# worker process one engine sized by the WORKER_DB_* settings.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # persistent connections per engine
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))  # extra connections under burst load
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds before a connection is replaced
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # per-statement limit, 0 = none
+WORKER_DB_POOL_SIZE = int(os.getenv("WORKER_DB_POOL_SIZE", "2"))  # per Celery worker process
+WORKER_DB_MAX_OVERFLOW = int(os.getenv("WORKER_DB_MAX_OVERFLOW", "2"))
+WORKER_DB_STATEMENT_TIMEOUT_MS = int(os.getenv("WORKER_DB_STATEMENT_TIMEOUT_MS", "600000"))  # audience snapshots can take minutes
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"  # behind PgBouncer transaction pooling: no local pool, no prepared statements
+
+# Optional streaming replica for read-only dashboard routes (get_async_read_db)
+DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST", "")  # empty = every read goes to the primary
+SQLALCHEMY_REPLICA_DATABASE_URL = (
+    f"postgresql+psycopg2://"
+    f"{os.getenv('DB_USER')}:"
+    f"{os.getenv('DB_PASSWORD')}@"
+    f"{DB_REPLICA_HOST}:{os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT', '5432'))}/"
+    f"{os.getenv('DB_NAME')}"
+) if DB_REPLICA_HOST else None
+SQLALCHEMY_ASYNC_REPLICA_DATABASE_URL = (
+    SQLALCHEMY_REPLICA_DATABASE_URL.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if SQLALCHEMY_REPLICA_DATABASE_URL
+    else None
+)
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))  # staler replica -> read from primary
+DB_REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "5"))  # how often lag is measured
 
 # ======================== REDIS CONFIGURATION ========================
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -48,6 +82,8 @@ MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
 MAIL_FROM = os.getenv("MAIL_FROM")
 MAIL_SMTP_HOST = os.getenv("MAIL_SMTP_HOST", "smtp.gmail.com")
 MAIL_SMTP_PORT = int(os.getenv("MAIL_SMTP_PORT", 587))
+MAIL_SMTP_SECURITY = os.getenv("MAIL_SMTP_SECURITY", "starttls").lower()  # "starttls", "ssl" (implicit TLS, usually port 465) or "none"
+MAIL_SMTP_POOL_SIZE = int(os.getenv("MAIL_SMTP_POOL_SIZE", os.getenv("SES_SEND_CONCURRENCY", "10")))  # SMTP connections per worker process
 
 # ======================== RATE LIMITING CONFIGURATION ========================
 LOGIN_RATE_LIMIT_PERIOD = int(os.getenv("LOGIN_RATE_LIMIT_PERIOD", 60))
@@ -70,9 +106,52 @@ AWS_SES_ACCESS_KEY_ID = os.getenv("MAIL_USERNAME")
 AWS_SES_SECRET_ACCESS_KEY = os.getenv("MAIL_PASSWORD")
 AWS_SES_SENDER_EMAIL = os.getenv("MAIL_FROM")
 AWS_SES_CONFIGURATION_SET = os.getenv("AWS_SES_CONFIGURATION_SET", "skymail-events")
+AWS_SES_ENDPOINT_URL = os.getenv("AWS_SES_ENDPOINT_URL") or None  # e.g. a local SES stand-in for testing
 
 # ======================== CAMPAIGN CONFIGURATION ========================
 CAMPAIGN_BATCH_SIZE = int(os.getenv("CAMPAIGN_BATCH_SIZE", "100"))
 CAMPAIGN_SCHEDULER_INTERVAL_SECONDS = int(os.getenv("CAMPAIGN_SCHEDULER_INTERVAL_SECONDS", "60"))
 SES_SEND_RATE_LIMIT = int(os.getenv("SES_SEND_RATE_LIMIT", "14"))  # emails per second
- 
\ No newline at end of file
+SES_SEND_CONCURRENCY = int(os.getenv("SES_SEND_CONCURRENCY", "10"))  # parallel SES calls per batch
+SES_RATE_LIMITER_BACKEND = os.getenv("SES_RATE_LIMITER_BACKEND", "redis")  # "redis" (cluster-wide) or "local"
+SES_COMPANY_SEND_RATE_LIMIT = int(os.getenv("SES_COMPANY_SEND_RATE_LIMIT", "0"))  # per-company emails per second, 0 = no sub-limit
+SES_SEND_MODE = os.getenv("SES_SEND_MODE", "single")  # "single" (SendEmail) or "bulk" (SendBulkTemplatedEmail)
+SES_BULK_DESTINATIONS = min(50, int(os.getenv("SES_BULK_DESTINATIONS", "50")))  # SES allows at most 50
+CAMPAIGN_CONTEXT_CACHE_SIZE = int(os.getenv("CAMPAIGN_CONTEXT_CACHE_SIZE", "256"))  # campaigns cached per worker process
+CAMPAIGN_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("CAMPAIGN_CONTEXT_CACHE_TTL_SECONDS", "300"))
+CAMPAIGN_RECIPIENT_MAX_ATTEMPTS = int(os.getenv("CAMPAIGN_RECIPIENT_MAX_ATTEMPTS", "5"))  # send attempts per recipient
+CAMPAIGN_RETRY_BASE_DELAY_SECONDS = int(os.getenv("CAMPAIGN_RETRY_BASE_DELAY_SECONDS", "30"))
+CAMPAIGN_RETRY_MAX_DELAY_SECONDS = int(os.getenv("CAMPAIGN_RETRY_MAX_DELAY_SECONDS", "900"))
+CAMPAIGN_CLAIM_LEASE_SECONDS = int(os.getenv("CAMPAIGN_CLAIM_LEASE_SECONDS", "1800"))  # batch claim on recipients, keep >= the task hard time limit
+SES_ADAPTIVE_RATE = os.getenv("SES_ADAPTIVE_RATE", "true").lower() == "true"  # AIMD control on SES throttling
+SES_AIMD_INCREASE_STEP = float(os.getenv("SES_AIMD_INCREASE_STEP", "1"))  # emails/s added after sustained success
+SES_AIMD_INCREASE_AFTER = int(os.getenv("SES_AIMD_INCREASE_AFTER", "50"))  # consecutive successes per increase
+SES_AIMD_DECREASE_FACTOR = float(os.getenv("SES_AIMD_DECREASE_FACTOR", "0.5"))  # rate multiplier on throttling
+CAMPAIGN_BATCH_PAYLOAD = os.getenv("CAMPAIGN_BATCH_PAYLOAD", "emails")  # "emails" (address list) or "range" (recipient snapshot seq range); fair scheduling always dispatches ranges
+CAMPAIGN_FAIR_SCHEDULING = os.getenv("CAMPAIGN_FAIR_SCHEDULING", "true").lower() == "true"  # round-robin batches across companies
+COMPANY_MAX_INFLIGHT_BATCHES = int(os.getenv("COMPANY_MAX_INFLIGHT_BATCHES", "4"))  # batches one company may have queued/running
+MAX_INFLIGHT_BATCHES = int(os.getenv("MAX_INFLIGHT_BATCHES", "32"))  # batches released to email_batches at once, all companies
+FAIR_DISPATCH_INTERVAL_SECONDS = int(os.getenv("FAIR_DISPATCH_INTERVAL_SECONDS", "5"))  # safety-net dispatcher run
+
+# ======================== SEND LOG PARTITIONS ========================
+# campaign_send_logs is partitioned by month; a daily job creates upcoming
+# partitions and archives expired ones (see app.workers.send_log_partitions)
+SEND_LOG_PARTITIONS_AHEAD = int(os.getenv("SEND_LOG_PARTITIONS_AHEAD", "3"))  # months created in advance
+SEND_LOG_RETENTION_MONTHS = int(os.getenv("SEND_LOG_RETENTION_MONTHS", "12"))  # full months kept online, 0 = keep forever
+SEND_LOG_ARCHIVE_DIR = os.getenv("SEND_LOG_ARCHIVE_DIR", "archives/send_logs")  # gzipped CSV exports of archived months
+SEND_LOG_ARCHIVE_S3_PREFIX = os.getenv("SEND_LOG_ARCHIVE_S3_PREFIX", "")  # upload exports to AWS_S3_BUCKET under this prefix, empty = keep local
+SEND_LOG_DETACH_LOCK_TIMEOUT_MS = int(os.getenv("SEND_LOG_DETACH_LOCK_TIMEOUT_MS", "5000"))  # give up DETACH instead of queueing writers behind it
+
+# ======================== TRANSACTIONAL EMAIL ========================
+TRANSACTIONAL_SEND_RATE_LIMIT = int(os.getenv("TRANSACTIONAL_SEND_RATE_LIMIT", "5"))  # emails per second, separate from campaigns, 0 = unlimited
+TRANSACTIONAL_MAX_RETRIES = int(os.getenv("TRANSACTIONAL_MAX_RETRIES", "5"))  # SMTP retries per email
+TRANSACTIONAL_RETRY_BACKOFF_MAX = int(os.getenv("TRANSACTIONAL_RETRY_BACKOFF_MAX", "60"))  # max seconds between retries
+OTP_EMAIL_EXPIRES_SECONDS = int(os.getenv("OTP_EMAIL_EXPIRES_SECONDS", "600"))  # undelivered OTP emails are dropped after this
+
+# ======================== MAIL TRANSPORT ========================
+MAIL_TRANSPORT = os.getenv("MAIL_TRANSPORT", "ses")  # "ses", "smtp" or "fake" (load tests / CI)
+FAKE_MAIL_LATENCY_MS = float(os.getenv("FAKE_MAIL_LATENCY_MS", "50"))  # simulated latency per call
+FAKE_MAIL_JITTER_MS = float(os.getenv("FAKE_MAIL_JITTER_MS", "20"))  # +/- random latency
+FAKE_MAIL_THROTTLE_RATE = float(os.getenv("FAKE_MAIL_THROTTLE_RATE", "0"))  # fraction of sends answered with Throttling
+FAKE_MAIL_REJECT_RATE = float(os.getenv("FAKE_MAIL_REJECT_RATE", "0"))  # fraction of sends answered with MessageRejected
+FAKE_MAIL_MAX_RATE = float(os.getenv("FAKE_MAIL_MAX_RATE", "0"))  # simulated account quota in emails/s, 0 = unlimited
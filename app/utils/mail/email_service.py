@@ -1,15 +1,62 @@
 from fastapi_mail import FastMail, MessageSchema, MessageType
+from app.celery_app import app
+from app.utils import constants
 from app.utils.mail.mail_config import mail_config
 from loguru import logger
+import asyncio
 import random, string
 import time
 
+# Kind -> EmailService method name, sent by the transactional worker lane
+TRANSACTIONAL_EMAILS = {
+    "otp": "send_otp_email",
+    "verification": "send_verification_email",
+    "password_reset_otp": "send_password_reset_otp",
+    "subscription_welcome": "send_subscription_welcome_email",
+    "unsubscribe_confirmation": "send_unsubscribe_confirmation_email",
+}
+
+# OTPs are only valid for 10 minutes; don't deliver them after that
+EXPIRING_EMAILS = {"otp", "password_reset_otp"}
+
 class EmailService:
 
     @staticmethod
     def generate_otp(length: int = 6) -> str:
         return ''.join(random.choices(string.digits, k=length))
 
+    @staticmethod
+    async def enqueue(kind: str, email: str, **params) -> bool:
+        """
+        Queue a transactional email on the dedicated Celery ``transactional`` lane.
+
+        The web process only publishes the task; SMTP happens in the
+        transactional worker, with retries and its own rate budget. Publishing
+        is a blocking broker round trip (longer while the broker reconnects),
+        so it runs in a worker thread instead of on the event loop.
+
+        Returns:
+            False if the email could not be queued; callers must not report it as sent
+        """
+        if kind not in TRANSACTIONAL_EMAILS:
+            raise ValueError(f"Unknown transactional email: {kind}")
+
+        try:
+            await asyncio.to_thread(
+                app.send_task,
+                "app.workers.transactional_email.send_transactional_email",
+                args=[kind, email],
+                kwargs=params,
+                queue="transactional",
+                priority=10,
+                expires=constants.OTP_EMAIL_EXPIRES_SECONDS if kind in EXPIRING_EMAILS else None,
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to queue {kind} email for {email}: {e}")
+            return False
+
     @staticmethod
     async def send_otp_email(email: str, otp: str, company_name: str = "") -> bool:
         try:
@@ -7,7 +7,7 @@ mail_config = ConnectionConfig(
     MAIL_FROM=constants.MAIL_FROM,
     MAIL_SERVER=constants.MAIL_SMTP_HOST,
     MAIL_PORT=constants.MAIL_SMTP_PORT,
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
+    MAIL_STARTTLS=constants.MAIL_SMTP_SECURITY == "starttls",
+    MAIL_SSL_TLS=constants.MAIL_SMTP_SECURITY == "ssl",
     USE_CREDENTIALS=True,
 )
@@ -0,0 +1,476 @@
+"""
+Pluggable mail transports for campaign sending.
+
+The batch worker only talks to ``MailTransport``; which backend it gets is chosen
+by ``MAIL_TRANSPORT``:
+
+- ``ses``:  AWS SES API (``AWS_SES_ENDPOINT_URL`` can point at a local SES stand-in)
+- ``smtp``: any SMTP relay (``MAIL_SMTP_HOST``/``MAIL_SMTP_PORT``/``MAIL_SMTP_SECURITY``)
+- ``fake``: in-process fake with configurable latency, throttling and rejections,
+  for load tests and CI without network access
+"""
+
+import hashlib
+import json
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from email.message import EmailMessage
+from typing import NamedTuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from app.utils import constants
+from app.utils.template_renderer import PLACEHOLDER_PATTERN, CompiledCampaignTemplate
+
+
+class SendResult(NamedTuple):
+    """Outcome of one recipient's send."""
+
+    email: str
+    message_id: str | None = None
+    error_code: str | None = None
+    error_message: str | None = None
+
+
+class MailTransport(ABC):
+    """
+    Base class for campaign mail transports.
+
+    Every transport implements ``send``. register_template/send_bulk/
+    delete_template are optional: callers must check ``supports_bulk`` first.
+    """
+
+    name = "base"
+
+    # Whether register_template/send_bulk/delete_template are available
+    supports_bulk = False
+
+    @abstractmethod
+    def send(self, from_email: str, to_email: str, subject: str, html: str) -> SendResult:
+        """Send one rendered email; failures are returned, never raised."""
+
+    def close(self) -> None:
+        """Release connections held by the transport (called on worker shutdown)."""
+
+    def register_template(self, name: str, subject: str, html: str, text: str | None) -> None:
+        """Create template ``name``, or update it if its content changed."""
+        raise NotImplementedError(f"{self.name} transport does not support bulk sending")
+
+    def delete_template(self, name: str) -> None:
+        raise NotImplementedError(f"{self.name} transport does not support bulk sending")
+
+    def send_bulk(
+        self,
+        from_email: str,
+        template_name: str,
+        default_data: str,
+        destinations: list[tuple[str, dict]],
+    ) -> list[SendResult]:
+        """
+        Send a registered template to many recipients in one call.
+
+        Args:
+            default_data: JSON object with fallback values for every variable
+            destinations: (email, replacement data) pairs
+        """
+        raise NotImplementedError(f"{self.name} transport does not support bulk sending")
+
+
+# ======================== SES ========================
+
+def _unescaped_placeholders(text: str) -> str:
+    """{{variable}} → {{{variable}}}: SES (Handlebars) inserts triple-stash values as-is."""
+    return PLACEHOLDER_PATTERN.sub(r"{{{\1}}}", text)
+
+
+class SESTransport(MailTransport):
+    """AWS SES API transport (SendEmail / SendBulkTemplatedEmail)."""
+
+    name = "ses"
+    supports_bulk = True
+
+    def __init__(self):
+        # Connection pool sized so every send thread gets its own HTTP connection
+        self.client = boto3.client(
+            "ses",
+            region_name=constants.AWS_SES_REGION,
+            aws_access_key_id=constants.AWS_SES_ACCESS_KEY_ID,
+            aws_secret_access_key=constants.AWS_SES_SECRET_ACCESS_KEY,
+            endpoint_url=constants.AWS_SES_ENDPOINT_URL,
+            config=Config(max_pool_connections=max(10, constants.SES_SEND_CONCURRENCY)),
+        )
+        # Digest of the content this process last uploaded, per SES template
+        self._registered_templates: dict[str, str] = {}
+
+    def send(self, from_email: str, to_email: str, subject: str, html: str) -> SendResult:
+        try:
+            response = self.client.send_email(
+                Source=from_email,
+                Destination={"ToAddresses": [to_email]},
+                Message={
+                    "Subject": {"Data": subject, "Charset": "UTF-8"},
+                    "Body": {
+                        "Html": {"Data": html, "Charset": "UTF-8"},
+                    },
+                },
+            )
+        except ClientError as ses_error:
+            error = ses_error.response["Error"]
+            return SendResult(to_email, error_code=error["Code"], error_message=error["Message"])
+        except Exception as exc:
+            return SendResult(to_email, error_message=str(exc))
+
+        return SendResult(to_email, message_id=response["MessageId"])
+
+    def register_template(self, name: str, subject: str, html: str, text: str | None) -> None:
+        """
+        Create the SES template, or update it when this process has newer content.
+
+        SES renders the same {{variable}} placeholders our templates use, but
+        HTML-escapes their values; they are uploaded as {{{variable}}} so values
+        go in unescaped, same as single mode's local rendering. Each process
+        uploads a given content once.
+        """
+        template = {
+            "TemplateName": name,
+            "SubjectPart": _unescaped_placeholders(subject),
+            "HtmlPart": _unescaped_placeholders(html),
+        }
+        if text:
+            template["TextPart"] = _unescaped_placeholders(text)
+
+        digest = hashlib.sha256(json.dumps(template, sort_keys=True).encode()).hexdigest()
+        if self._registered_templates.get(name) == digest:
+            return
+
+        try:
+            self.client.create_template(Template=template)
+            logger.info(f"📄 Registered SES template {name}")
+        except ClientError as ses_error:
+            if ses_error.response["Error"]["Code"] != "AlreadyExists":
+                raise
+            # Created by another worker, maybe from an older template version
+            self.client.update_template(Template=template)
+
+        self._registered_templates[name] = digest
+
+    def delete_template(self, name: str) -> None:
+        self._registered_templates.pop(name, None)
+        try:
+            self.client.delete_template(TemplateName=name)
+            logger.info(f"🗑️ Deleted SES template {name}")
+        except ClientError as ses_error:
+            if ses_error.response["Error"]["Code"] != "TemplateDoesNotExist":
+                raise
+
+    def send_bulk(
+        self,
+        from_email: str,
+        template_name: str,
+        default_data: str,
+        destinations: list[tuple[str, dict]],
+    ) -> list[SendResult]:
+        try:
+            response = self.client.send_bulk_templated_email(
+                Source=from_email,
+                Template=template_name,
+                DefaultTemplateData=default_data,
+                Destinations=[
+                    {
+                        "Destination": {"ToAddresses": [email]},
+                        "ReplacementTemplateData": json.dumps(data),
+                    }
+                    for email, data in destinations
+                ],
+            )
+        except ClientError as ses_error:
+            error = ses_error.response["Error"]
+            return [
+                SendResult(email, error_code=error["Code"], error_message=error["Message"])
+                for email, _ in destinations
+            ]
+        except Exception as exc:
+            return [SendResult(email, error_message=str(exc)) for email, _ in destinations]
+
+        # Statuses come back in the same order as Destinations
+        results = []
+        for (email, _), status in zip(destinations, response["Status"]):
+            if status["Status"] == "Success":
+                results.append(SendResult(email, message_id=status["MessageId"]))
+            else:
+                error_code = "Throttling" if status["Status"] == "AccountThrottled" else status["Status"]
+                results.append(
+                    SendResult(email, error_code=error_code, error_message=status.get("Error", ""))
+                )
+        return results
+
+
+# ======================== SMTP ========================
+
+class SMTPTransport(MailTransport):
+    """
+    SMTP relay transport.
+
+    Connections come from a pool shared by every send thread of the process,
+    at most ``pool_size`` open at once; a thread waits for a free one instead
+    of opening more. ``security`` is "starttls" (upgrade a plain connection),
+    "ssl" (implicit TLS, usually port 465) or "none".
+    """
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        security: str | None = None,
+        pool_size: int | None = None,
+    ):
+        self.host = host or constants.MAIL_SMTP_HOST
+        self.port = port or constants.MAIL_SMTP_PORT
+        self.security = (security or constants.MAIL_SMTP_SECURITY).lower()
+        if self.security not in ("starttls", "ssl", "none"):
+            raise ValueError(f"Unknown MAIL_SMTP_SECURITY '{self.security}' (expected starttls, ssl or none)")
+
+        # Idle connections, most recently used first so stale ones age out
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(1, pool_size or constants.MAIL_SMTP_POOL_SIZE))
+        self._closed = False
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.security == "ssl":
+            connection = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=30, context=ssl.create_default_context()
+            )
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            if self.security == "starttls":
+                connection.starttls(context=ssl.create_default_context())
+            if constants.MAIL_USERNAME:
+                connection.login(constants.MAIL_USERNAME, constants.MAIL_PASSWORD)
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def _checkin(self, connection: smtplib.SMTP) -> None:
+        if self._closed:
+            self._quit(connection)
+        else:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(connection)
+
+    @staticmethod
+    def _error_code(smtp_code: int) -> str:
+        # 421/454 are what SES and most relays return when over the sending rate
+        if smtp_code in (421, 454):
+            return "Throttling"
+        if 400 <= smtp_code < 500:
+            return "TransientFailure"
+        return "MessageRejected"
+
+    def send(self, from_email: str, to_email: str, subject: str, html: str) -> SendResult:
+        message = EmailMessage()
+        message["From"] = from_email
+        message["To"] = to_email
+        message["Subject"] = subject
+        message["Message-ID"] = f"<{uuid.uuid4()}@skymail>"
+        message.set_content(html, subtype="html")
+
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = None
+                reused = False
+
+            try:
+                if connection is None:
+                    connection = self._connect()
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    if not reused:
+                        raise
+                    # The relay closed the idle connection; nothing was sent on it
+                    connection.close()
+                    connection = None
+                    connection = self._connect()
+                    connection.send_message(message)
+            except smtplib.SMTPRecipientsRefused as exc:
+                # The connection itself is fine
+                self._checkin(connection)
+                code, reason = next(iter(exc.recipients.values()))
+                return SendResult(to_email, error_code=self._error_code(code), error_message=str(reason))
+            except smtplib.SMTPResponseException as exc:
+                if connection is not None:
+                    self._quit(connection)
+                return SendResult(
+                    to_email, error_code=self._error_code(exc.smtp_code), error_message=str(exc.smtp_error)
+                )
+            except (smtplib.SMTPException, OSError) as exc:
+                if connection is not None:
+                    self._quit(connection)
+                return SendResult(to_email, error_message=str(exc))
+
+            self._checkin(connection)
+
+        return SendResult(to_email, message_id=message["Message-ID"])
+
+
+# ======================== FAKE ========================
+
+class FakeTransport(MailTransport):
+    """
+    In-process stand-in for SES used for benchmarks and tests.
+
+    Simulates per-call latency, a maximum account send rate (calls above it are
+    throttled, and random throttling/rejection rates. Bulk templates are really
+    rendered so CPU cost stays realistic; with ``keep_outbox`` the delivered
+    (to, subject, html) messages are kept in ``outbox`` for tests.
+    """
+
+    name = "fake"
+    supports_bulk = True
+
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        jitter_ms: float = 20,
+        throttle_rate: float = 0.0,
+        reject_rate: float = 0.0,
+        max_rate: float = 0,
+        keep_outbox: bool = False,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.reject_rate = reject_rate
+        self.max_rate = max_rate
+        self.keep_outbox = keep_outbox
+        self.outbox: list[tuple[str, str, str]] = []
+        self.sent_count = 0
+        self.call_count = 0
+        self._templates: dict[str, CompiledCampaignTemplate] = {}
+        self._recent_sends: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _sleep(self) -> None:
+        delay = max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms))
+        time.sleep(delay / 1000)
+
+    def _over_max_rate(self, count: int) -> bool:
+        """Sliding one-second window check of the simulated account quota."""
+        if self.max_rate <= 0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_sends and now - self._recent_sends[0] > 1.0:
+                self._recent_sends.popleft()
+            if len(self._recent_sends) + count > self.max_rate:
+                return True
+            self._recent_sends.extend([now] * count)
+            return False
+
+    def _outcome(self, email: str, subject: str, html: str) -> SendResult:
+        roll = random.random()
+        if roll < self.throttle_rate:
+            return SendResult(email, error_code="Throttling", error_message="Maximum sending rate exceeded.")
+        if roll < self.throttle_rate + self.reject_rate:
+            return SendResult(email, error_code="MessageRejected", error_message="Email address is not verified.")
+        with self._lock:
+            self.sent_count += 1
+            if self.keep_outbox:
+                self.outbox.append((email, subject, html))
+        return SendResult(email, message_id=f"fake-{uuid.uuid4()}")
+
+    def send(self, from_email: str, to_email: str, subject: str, html: str) -> SendResult:
+        self._sleep()
+        with self._lock:
+            self.call_count += 1
+        if self._over_max_rate(1):
+            return SendResult(to_email, error_code="Throttling", error_message="Maximum sending rate exceeded.")
+        return self._outcome(to_email, subject, html)
+
+    def register_template(self, name: str, subject: str, html: str, text: str | None) -> None:
+        self._templates[name] = CompiledCampaignTemplate(subject, html, text, known_variables=())
+
+    def delete_template(self, name: str) -> None:
+        self._templates.pop(name, None)
+
+    def send_bulk(
+        self,
+        from_email: str,
+        template_name: str,
+        default_data: str,
+        destinations: list[tuple[str, dict]],
+    ) -> list[SendResult]:
+        self._sleep()
+        with self._lock:
+            self.call_count += 1
+
+        template = self._templates.get(template_name)
+        if template is None:
+            return [
+                SendResult(email, error_code="TemplateDoesNotExist", error_message=template_name)
+                for email, _ in destinations
+            ]
+        if self._over_max_rate(len(destinations)):
+            return [
+                SendResult(email, error_code="Throttling", error_message="Maximum sending rate exceeded.")
+                for email, _ in destinations
+            ]
+
+        defaults = json.loads(default_data)
+        results = []
+        for email, data in destinations:
+            subject, html, _ = template.render({**defaults, **data})
+            results.append(self._outcome(email, subject, html))
+        return results
+
+
+def get_mail_transport(name: str | None = None) -> MailTransport:
+    """Build the transport selected by ``MAIL_TRANSPORT`` (or ``name``)."""
+    name = (name or constants.MAIL_TRANSPORT).lower()
+
+    if name == "ses":
+        return SESTransport()
+    if name == "smtp":
+        return SMTPTransport()
+    if name == "fake":
+        return FakeTransport(
+            latency_ms=constants.FAKE_MAIL_LATENCY_MS,
+            jitter_ms=constants.FAKE_MAIL_JITTER_MS,
+            throttle_rate=constants.FAKE_MAIL_THROTTLE_RATE,
+            reject_rate=constants.FAKE_MAIL_REJECT_RATE,
+            max_rate=constants.FAKE_MAIL_MAX_RATE,
+        )
+
+    raise ValueError(f"Unknown MAIL_TRANSPORT '{name}' (expected ses, smtp or fake)")
@@ -0,0 +1,65 @@
+"""Rate limiting utilities for outbound email sending."""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting callers to ``rate`` acquisitions per second.
+
+    The bucket is local to the process: with N worker processes the combined
+    rate is N x ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate (e.g. from an adaptive controller)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take ``tokens`` if available.
+
+        Returns:
+            0.0 on success, otherwise the seconds to wait before retrying
+
+        Raises:
+            ValueError: If ``tokens`` exceeds the capacity; such a request
+                could never be granted
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        if tokens > self.capacity:
+            raise ValueError(f"{tokens} tokens exceed the bucket capacity of {self.capacity}")
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` are available, in capacity-sized chunks if needed."""
+        while tokens > 0:
+            chunk = min(tokens, self.capacity)
+            while True:
+                wait = self.try_acquire(chunk)
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            tokens -= chunk
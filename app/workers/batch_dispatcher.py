@@ -0,0 +1,303 @@
+"""Fair-share dispatcher moving campaign batches into the email_batches queue."""
+
+import uuid
+from datetime import timedelta
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from app.celery_app import app
+from app.database.database import SessionLocal
+# Import all models with proper initialization order
+from app.database.models import Campaign, CampaignRecipient, CampaignStats
+from app.redis.campaign_progress import campaign_progress
+from app.redis.fair_scheduler import FairBatchScheduler
+from app.utils import constants
+
+
+# In-flight slots expire with the batch task's hard time limit, so a crashed
+# worker can't hold a company's slot forever
+fair_scheduler = FairBatchScheduler(
+    redis_url=constants.REDIS_URL,
+    company_cap=constants.COMPANY_MAX_INFLIGHT_BATCHES,
+    global_cap=constants.MAX_INFLIGHT_BATCHES,
+    slot_timeout=app.conf.task_time_limit,
+)
+
+
+def _has_work():
+    """Campaigns still sending with snapshot ranges not yet enqueued."""
+    return (
+        (Campaign.status == "sending")
+        & (Campaign.enqueued_seq < CampaignStats.total_recipients)
+    )
+
+
+def _next_batch_range(db: Session, company_id: str) -> tuple[uuid.UUID, int, int] | None:
+    """
+    Lock the company's oldest campaign with ranges left and return its next one.
+    
+    The row lock is held until the caller checkpoints enqueued_seq, so
+    concurrent dispatchers hand out consecutive ranges, never the same one.
+    
+    Returns:
+        (campaign_id, start_seq, end_seq), or None if the company has nothing left
+    """
+    row = db.execute(
+        select(Campaign.id, Campaign.enqueued_seq, CampaignStats.total_recipients)
+        .join(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+        .where((Campaign.company_id == uuid.UUID(company_id)) & _has_work())
+        .order_by(Campaign.created_at)
+        .limit(1)
+        .with_for_update(of=Campaign)
+    ).one_or_none()
+    
+    if row is None:
+        return None
+    
+    end_seq = min(row.enqueued_seq + constants.CAMPAIGN_BATCH_SIZE, row.total_recipients)
+    return row.id, row.enqueued_seq, end_seq
+
+
+def _retry_due():
+    """Snapshot recipients of sending campaigns waiting for a retry that is due."""
+    return (
+        (Campaign.status == "sending")
+        & (CampaignRecipient.state == "pending")
+        & (CampaignRecipient.retry_at <= func.now())
+    )
+
+
+def _next_retry_batch(db: Session, company_id: str | None = None) -> tuple[uuid.UUID, list[str]] | None:
+    """
+    Take up to CAMPAIGN_BATCH_SIZE due retries of one campaign (of the company).
+    
+    Their retry_at is pushed back by the claim lease, so they aren't handed
+    out again while the batch is queued, and are if its task is lost. Rows
+    locked by a concurrent dispatcher are skipped.
+    
+    Returns:
+        (campaign_id, emails), or None if nothing is due
+    """
+    query = (
+        select(CampaignRecipient.campaign_id)
+        .join(Campaign, Campaign.id == CampaignRecipient.campaign_id)
+        .where(_retry_due())
+    )
+    if company_id is not None:
+        query = query.where(Campaign.company_id == uuid.UUID(company_id))
+    campaign_id = db.execute(
+        query.order_by(CampaignRecipient.retry_at).limit(1)
+    ).scalar_one_or_none()
+    
+    if campaign_id is None:
+        return None
+    
+    rows = db.execute(
+        select(CampaignRecipient.seq, CampaignRecipient.subscriber_email)
+        .where(
+            (CampaignRecipient.campaign_id == campaign_id)
+            & (CampaignRecipient.state == "pending")
+            & (CampaignRecipient.retry_at <= func.now())
+        )
+        .order_by(CampaignRecipient.retry_at)
+        .limit(constants.CAMPAIGN_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    ).all()
+    
+    if not rows:
+        return None
+    
+    db.execute(
+        update(CampaignRecipient)
+        .where(
+            (CampaignRecipient.campaign_id == campaign_id)
+            & (CampaignRecipient.seq.in_([row.seq for row in rows]))
+        )
+        .values(
+            retry_at=func.now() + timedelta(seconds=constants.CAMPAIGN_CLAIM_LEASE_SECONDS),
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return campaign_id, [row.subscriber_email for row in rows]
+
+
+def _companies_with_work(db: Session) -> list[str]:
+    with_ranges = db.execute(
+        select(Campaign.company_id)
+        .join(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+        .where(_has_work())
+        .distinct()
+    ).scalars()
+    with_retries = db.execute(
+        select(Campaign.company_id)
+        .join(CampaignRecipient, CampaignRecipient.campaign_id == Campaign.id)
+        .where(_retry_due())
+        .distinct()
+    ).scalars()
+    return sorted({str(company_id) for company_id in (*with_ranges, *with_retries)})
+
+
+def dispatch_pending_batches(max_batches: int | None = None) -> int:
+    """
+    Release waiting batches to email_batches in round-robin company order.
+    
+    Batches are not queued anywhere before this: each slot granted by the fair
+    scheduler takes the company's due retries (recipients back in 'pending'
+    with retry_at set) or else the next (start, end] seq range of its campaign
+    from its enqueue watermark (campaigns.enqueued_seq), so the only state kept
+    in Redis is who's next and what's in flight.
+    
+    Called by send_campaign once the snapshot is ready, by every batch as it
+    finishes (to refill its slot), and periodically by beat as a safety net.
+    
+    Returns:
+        Number of batches dispatched
+    """
+    # Imported here: email_batch calls this module when a batch finishes
+    from app.workers.email_batch import send_campaign_batch
+    
+    slots = fair_scheduler.take(max_batches or constants.MAX_INFLIGHT_BATCHES)
+    if not slots:
+        return 0
+    
+    db = SessionLocal()
+    idle = set()
+    dispatched = 0
+    try:
+        while slots:
+            company_id, token = slots[0]
+            retry = None if company_id in idle else _next_retry_batch(db, company_id)
+            
+            if retry is not None:
+                campaign_id, emails = retry
+                send_campaign_batch.apply_async(
+                    args=[str(campaign_id), emails],
+                    kwargs={"fair_slot": [company_id, token]},
+                    queue="email_batches",
+                    priority=9,
+                )
+                slots.pop(0)
+                db.commit()
+                dispatched += 1
+                continue
+            
+            batch = None if company_id in idle else _next_batch_range(db, company_id)
+            
+            if batch is None:
+                db.rollback()
+                fair_scheduler.release(company_id, token)
+                if company_id not in idle:
+                    idle.add(company_id)
+                    fair_scheduler.deactivate(company_id)
+                slots.pop(0)
+                continue
+            
+            campaign_id, start_seq, end_seq = batch
+            send_campaign_batch.apply_async(
+                args=[str(campaign_id)],
+                kwargs={"key_range": [start_seq, end_seq], "fair_slot": [company_id, token]},
+                queue="email_batches",
+                priority=9,
+            )
+            slots.pop(0)
+            
+            # Checkpoint after publishing: a crash in between enqueues the range
+            # again, which the batch's atomic recipient claim makes harmless
+            db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(enqueued_seq=end_seq)
+            )
+            db.commit()
+            campaign_progress.add_enqueued(str(campaign_id))
+            dispatched += 1
+    finally:
+        # Slots not used because of an error go back right away
+        for company_id, token in slots:
+            fair_scheduler.release(company_id, token)
+        db.close()
+    
+    if dispatched:
+        logger.debug(f"⚖️ Dispatched {dispatched} batches")
+    
+    return dispatched
+
+
+def dispatch_due_retries(max_batches: int | None = None) -> int:
+    """
+    Send due retries of every company without fair-share slots.
+    
+    With CAMPAIGN_FAIR_SCHEDULING off there are no slots to wait for, but
+    retried recipients still wait in the snapshot for their retry_at.
+    
+    Returns:
+        Number of batches dispatched
+    """
+    # Imported here: email_batch calls this module when a batch finishes
+    from app.workers.email_batch import send_campaign_batch
+    
+    db = SessionLocal()
+    dispatched = 0
+    try:
+        while dispatched < (max_batches or constants.MAX_INFLIGHT_BATCHES):
+            retry = _next_retry_batch(db)
+            if retry is None:
+                break
+            campaign_id, emails = retry
+            send_campaign_batch.apply_async(
+                args=[str(campaign_id), emails],
+                queue="email_batches",
+                priority=9,
+            )
+            db.commit()
+            dispatched += 1
+    finally:
+        db.close()
+    
+    if dispatched:
+        logger.debug(f"⏱️ Dispatched {dispatched} retry batches")
+    
+    return dispatched
+
+
+@app.task(
+    name="app.workers.batch_dispatcher.dispatch_campaign_batches",
+    bind=True,
+    queue="scheduled",
+    max_retries=0,
+)
+def dispatch_campaign_batches(self):
+    """
+    Periodic fair-share dispatch.
+    
+    Batches are normally dispatched as slots free up; this run picks up anything
+    left behind (e.g. slots that expired after a worker crash, retries that
+    became due) and puts every company with work left back in the ring, so
+    scheduler state lost in Redis is rebuilt from Postgres.
+    
+    Without fair scheduling, only due retries are dispatched here.
+    """
+    if not constants.CAMPAIGN_FAIR_SCHEDULING:
+        try:
+            dispatched = dispatch_due_retries()
+            return {"status": "success", "batches_dispatched": dispatched}
+        except Exception as exc:
+            logger.error(f"❌ Retry dispatch failed: {str(exc)}", exc_info=True)
+            return {"status": "error", "reason": str(exc)}
+    
+    try:
+        db = SessionLocal()
+        try:
+            restored = fair_scheduler.activate(_companies_with_work(db))
+        finally:
+            db.close()
+        if restored:
+            logger.warning(f"⚖️ Restored {restored} companies to the fair-share ring")
+        
+        dispatched = dispatch_pending_batches()
+        return {"status": "success", "batches_dispatched": dispatched}
+    except Exception as exc:
+        logger.error(f"❌ Batch dispatch failed: {str(exc)}", exc_info=True)
+        return {"status": "error", "reason": str(exc)}
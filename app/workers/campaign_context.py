@@ -0,0 +1,188 @@
+"""Per-worker cache of the immutable data every batch of a campaign needs."""
+
+from dataclasses import dataclass
+import datetime
+import json
+import uuid
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from loguru import logger
+
+# Import all models with proper initialization order
+from app.database.models import Campaign
+from app.modules.auth.model import Company
+from app.modules.newsletters.newsletter_templates.model import NewsletterTemplate
+from app.modules.newsletters.template_assets.model import TemplateAsset
+from app.utils import constants
+from app.utils.template_renderer import CompiledCampaignTemplate, get_compiled_template
+from app.utils.ttl_cache import TTLCache
+
+
+# System variables resolved for every recipient (see render context in email_batch)
+SYSTEM_RENDER_VARIABLES = (
+    "company_name",
+    "website_url",
+    "subscriber_email",
+    "subscriber_username",
+    "template_asset",
+)
+
+
+@dataclass(frozen=True)
+class CampaignSendContext:
+    """Everything a batch needs about its campaign, template, company and assets."""
+
+    campaign_id: uuid.UUID
+    send_started_at: datetime.datetime
+    company_id: uuid.UUID
+    template_id: uuid.UUID
+    template_name: str
+    template_updated_at: datetime.datetime
+    subject: str
+    html_content: str
+    text_content: str | None
+    constants_values: Mapping[str, object]
+    company_name: str
+    website_url: str
+    template_asset_urls: str
+    compiled_template: CompiledCampaignTemplate
+
+
+_context_cache = TTLCache(
+    maxsize=constants.CAMPAIGN_CONTEXT_CACHE_SIZE,
+    ttl_seconds=constants.CAMPAIGN_CONTEXT_CACHE_TTL_SECONDS,
+)
+
+
+def get_campaign_send_context(
+    db: Session, campaign_id: uuid.UUID
+) -> tuple[CampaignSendContext | None, str | None]:
+    """
+    Return the send context for a campaign, loading it only on a cache miss.
+
+    A single lightweight version query validates the cache: the key is made of
+    the campaign fields the context uses plus the template's updated_at, so an
+    edit to either changes it. Campaign.updated_at is left out on purpose: the
+    dispatcher's enqueued_seq checkpoints bump it on every batch. Asset changes
+    are picked up when the entry's TTL expires.
+
+    Returns:
+        (context, error_reason) - error_reason is set when context is None
+    """
+    version = db.execute(
+        select(
+            Campaign.template_id,
+            Campaign.subject,
+            Campaign.constants_values,
+            Campaign.send_started_at,
+            NewsletterTemplate.updated_at,
+        )
+        .outerjoin(NewsletterTemplate, NewsletterTemplate.id == Campaign.template_id)
+        .where(Campaign.id == campaign_id)
+    ).one_or_none()
+
+    if version is None:
+        return None, "campaign_not_found"
+
+    template_id, subject, constants_values, send_started_at, template_updated_at = version
+    cache_key = (
+        campaign_id,
+        template_id,
+        subject,
+        json.dumps(constants_values or {}, sort_keys=True, default=str),
+        send_started_at,
+        template_updated_at,
+    )
+    context = _context_cache.get(cache_key)
+    if context is not None:
+        return context, None
+
+    context, error = _load_campaign_send_context(db, campaign_id)
+    if context is not None:
+        _context_cache.set(cache_key, context)
+    return context, error
+
+
+def _load_campaign_send_context(
+    db: Session, campaign_id: uuid.UUID
+) -> tuple[CampaignSendContext | None, str | None]:
+    """Query campaign, template, company and assets and build the context."""
+    campaign = db.execute(
+        select(Campaign).where(Campaign.id == campaign_id)
+    ).scalar_one_or_none()
+
+    if not campaign:
+        logger.error(f"❌ Campaign {campaign_id} not found")
+        return None, "campaign_not_found"
+
+    template = None
+    if campaign.template_id:
+        template = db.execute(
+            select(NewsletterTemplate).where(
+                NewsletterTemplate.id == campaign.template_id
+            )
+        ).scalar_one_or_none()
+
+    if not template:
+        logger.error(f"❌ Template {campaign.template_id} not found")
+        return None, "template_not_found"
+
+    if campaign.send_started_at is None:
+        # Set when send_campaign locks the campaign; send logs are keyed on it
+        logger.error(f"❌ Campaign {campaign_id} has not started sending")
+        return None, "campaign_not_started"
+
+    company = db.execute(
+        select(Company).where(Company.id == campaign.company_id)
+    ).scalar_one_or_none()
+
+    if not company:
+        logger.error(f"❌ Company {campaign.company_id} not found")
+        return None, "company_not_found"
+
+    asset_urls = db.execute(
+        select(TemplateAsset.file_url).where(
+            (TemplateAsset.template_id == campaign.template_id)
+            & (TemplateAsset.company_id == campaign.company_id)
+        )
+    ).scalars().all()
+
+    logger.debug(f"📦 Found {len(asset_urls)} template assets")
+
+    subject = campaign.subject or template.subject
+    constants_values = dict(campaign.constants_values or {})
+
+    # Parsed once per campaign + template version, reused for every recipient
+    compiled_template = get_compiled_template(
+        cache_key=(campaign.id, template.id, template.updated_at, subject),
+        subject=subject,
+        html_content=template.html_content,
+        text_content=template.text_content,
+        known_variables=(*SYSTEM_RENDER_VARIABLES, *constants_values.keys()),
+    )
+
+    if compiled_template.unresolved:
+        logger.warning(f"⚠️ Unresolved variables in template: {compiled_template.unresolved}")
+
+    logger.info(f"📄 Loaded send context for campaign {campaign_id} (template: {template.name})")
+
+    return CampaignSendContext(
+        campaign_id=campaign.id,
+        send_started_at=campaign.send_started_at,
+        company_id=campaign.company_id,
+        template_id=template.id,
+        template_name=template.name,
+        template_updated_at=template.updated_at,
+        subject=subject,
+        html_content=template.html_content,
+        text_content=template.text_content,
+        constants_values=MappingProxyType(constants_values),
+        company_name=company.company_name,
+        website_url=company.website_url or "",
+        # Comma-separated URLs for {{template_asset}}
+        template_asset_urls=",".join(asset_urls),
+        compiled_template=compiled_template,
+    ), None
@@ -1,13 +1,18 @@
-"""Campaign scheduler task - runs every minute to enqueue due campaigns."""
+"""Campaign scheduler tasks - run every minute to enqueue due campaigns and complete finished ones."""
 
-from sqlalchemy import select, and_, func
+from datetime import timedelta
+from sqlalchemy import select, and_, func, case, update
+from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.celery_app import app
 from app.database.database import SessionLocal
 # Import all models with proper initialization order
-from app.database.models import Campaign
+from app.database.models import Campaign, CampaignRecipient, CampaignStats
+from app.redis.campaign_progress import campaign_progress
+from app.utils import constants
 from app.workers.campaign_send import send_campaign
+from app.workers.email_batch import delete_campaign_template, requeue_recipients
 
 
 @app.task(
@@ -86,3 +91,134 @@ def enqueue_due_campaigns(self):
     
     finally:
         db.close()
+
+
+def _recover_stranded_recipients(db: Session) -> tuple[int, int]:
+    """
+    Hand snapshot recipients no batch will ever finish back to the dispatcher.
+    
+    - Rows still 'sending' past CAMPAIGN_CLAIM_LEASE_SECONDS belong to a
+      hard-killed worker: they go back to 'pending' as an attempt, or fail
+      once their attempts are used up.
+    - 'pending' rows below the enqueue watermark without a retry_at were in a
+      batch that never ran (task lost, task retries used up). Once the
+      campaign has made no progress for a lease, they're made due right away.
+    
+    The dispatcher then sends them like any other retry. Commits.
+    
+    Returns:
+        (recipients requeued, recipients failed)
+    """
+    lease = timedelta(seconds=constants.CAMPAIGN_CLAIM_LEASE_SECONDS)
+    lease_expired = (
+        (CampaignRecipient.state == "sending")
+        & (CampaignRecipient.claimed_at < func.now() - lease)
+    )
+    
+    requeued = 0
+    failed = 0
+    campaign_ids = db.execute(
+        select(CampaignRecipient.campaign_id)
+        .join(Campaign, Campaign.id == CampaignRecipient.campaign_id)
+        .where((Campaign.status == "sending") & lease_expired)
+        .distinct()
+    ).scalars().all()
+    for campaign_id in campaign_ids:
+        rows = db.execute(
+            select(func.count()).where((CampaignRecipient.campaign_id == campaign_id) & lease_expired)
+        ).scalar()
+        exhausted = requeue_recipients(db, campaign_id, lease_expired, retry_in=0)
+        db.commit()
+        requeued += rows - len(exhausted)
+        failed += len(exhausted)
+        logger.warning(
+            f"🧹 Took back {rows} expired recipient claims of campaign {campaign_id} "
+            f"({len(exhausted)} out of attempts)"
+        )
+    
+    orphaned = db.execute(
+        update(CampaignRecipient)
+        .where(
+            and_(
+                CampaignRecipient.campaign_id == Campaign.id,
+                Campaign.id == CampaignStats.campaign_id,
+                Campaign.status == "sending",
+                CampaignStats.updated_at < func.now() - lease,
+                CampaignRecipient.state == "pending",
+                CampaignRecipient.retry_at.is_(None),
+                CampaignRecipient.seq <= Campaign.enqueued_seq,
+            )
+        )
+        .values(retry_at=func.now(), updated_at=func.now())
+        .returning(CampaignRecipient.campaign_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    for campaign_id in set(orphaned):
+        logger.warning(
+            f"🧹 {orphaned.count(campaign_id)} recipients of stalled campaign {campaign_id} "
+            f"were never sent, requeued"
+        )
+    
+    return requeued + len(orphaned), failed
+
+
+@app.task(
+    name="app.workers.campaign_scheduler.complete_finished_campaigns",
+    bind=True,
+    queue="scheduled",
+    priority=10,
+    max_retries=3,
+)
+def complete_finished_campaigns(self):
+    """
+    Sweeper that runs every minute.
+    
+    First hands stranded snapshot recipients (expired claims, batches that
+    never ran) back to the dispatcher, so every recipient eventually ends
+    'sent' or 'failed'. Then completes 'sending' campaigns whose
+    campaign_stats show no recipients remaining. Normally the last batch does
+    this right after its commit; the sweeper covers a worker dying in between.
+    """
+    db = SessionLocal()
+    try:
+        requeued, failed = _recover_stranded_recipients(db)
+        
+        now = func.now()
+        completed = db.execute(
+            update(Campaign)
+            .where(
+                and_(
+                    Campaign.id == CampaignStats.campaign_id,
+                    Campaign.status == "sending",
+                    CampaignStats.sent + CampaignStats.failed >= CampaignStats.total_recipients,
+                )
+            )
+            .values(
+                status=case((CampaignStats.failed > 0, "partially_failed"), else_="sent"),
+                sent_at=now,
+                updated_at=now,
+            )
+            .returning(Campaign.id, Campaign.status)
+        ).all()
+        db.commit()
+        
+        for campaign_id, status in completed:
+            logger.warning(f"🧹 Completed stalled campaign {campaign_id}: {status}")
+            campaign_progress.publish_status(str(campaign_id), status)
+            delete_campaign_template(campaign_id)
+        
+        return {
+            "status": "success",
+            "recipients_requeued": requeued,
+            "recipients_failed": failed,
+            "campaigns_completed": len(completed),
+        }
+    
+    except Exception as exc:
+        db.rollback()
+        logger.error(f"❌ Campaign completion sweep failed: {str(exc)}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+    
+    finally:
+        db.close()
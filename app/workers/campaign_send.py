@@ -2,20 +2,27 @@
 
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, exists, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.celery_app import app
 from app.database.database import SessionLocal
 # Import all models with proper initialization order
-from app.database.models import Campaign
+from app.database.models import Campaign, CampaignRecipient, CampaignStats
 from app.modules.subscribers.model import Subscriber
 from app.modules.auth.model import Company
+from app.redis.campaign_progress import campaign_progress
 from app.utils import constants
+from app.workers.batch_dispatcher import dispatch_pending_batches, fair_scheduler
 from app.workers.email_batch import send_campaign_batch
 
 
+# Batches per enqueue watermark checkpoint
+ENQUEUE_CHUNK_SIZE = 500
+
+
 @app.task(
     name="app.workers.campaign_send.send_campaign",
     bind=True,
@@ -23,7 +30,7 @@ from app.workers.email_batch import send_campaign_batch
     max_retries=3,
     default_retry_delay=60,
 )
-def send_campaign(self, campaign_id: str):
+def send_campaign(self, campaign_id: str, resume: bool = False):
     """
     Main campaign send orchestrator.
     
@@ -33,12 +40,21 @@ def send_campaign(self, campaign_id: str):
     
     Then:
     1. Fetch campaign & template details
-    2. Fetch subscribers in batches
-    3. Enqueue batch send tasks
-    4. Mark campaign as sent when all batches complete
+    2. Snapshot the audience into campaign_recipients (same transaction as the lock)
+    3. Enqueue batch send tasks over snapshot ranges, checkpointing how far it
+       got in campaigns.enqueued_seq (with fair scheduling, the batch
+       dispatcher walks the ranges instead)
+    4. Start completion counters; the last batch marks the campaign sent
+       (or partially_failed)
+    
+    A failure part-way keeps the campaign 'sending' and retries with
+    ``resume=True``, which picks up from the checkpoint. Ranges enqueued twice
+    (between a publish and its checkpoint) are harmless: batches claim their
+    recipients atomically, so the second copy finds nothing to send.
     
     Args:
         campaign_id: UUID of campaign to send
+        resume: Retry of a send that already holds the lock ('sending')
     """
     db = SessionLocal()
     try:
@@ -47,6 +63,7 @@ def send_campaign(self, campaign_id: str):
         
         # ======================== PHASE 1: ACQUIRE LOCK ========================
         # Update campaign status to 'sending' only if it's currently 'scheduled'
+        # (or already 'sending' when resuming our own failed attempt)
         # This is our distributed lock mechanism
         
         lock_query = (
@@ -54,16 +71,22 @@ def send_campaign(self, campaign_id: str):
             .where(
                 and_(
                     Campaign.id == campaign_id_obj,
-                    Campaign.status == "scheduled",
+                    Campaign.status.in_(("scheduled", "sending") if resume else ("scheduled",)),
                 )
             )
-            .values(status="sending", updated_at=datetime.now(timezone.utc))
+            .values(
+                status="sending",
+                # Kept across retries: every send log of the campaign lands in
+                # this month's partition
+                send_started_at=func.coalesce(Campaign.send_started_at, func.now()),
+                updated_at=datetime.now(timezone.utc),
+            )
         )
         
         result = db.execute(lock_query)
-        db.commit()
         
         if result.rowcount == 0:
+            db.rollback()
             logger.warning(
                 f"⚠️ Failed to acquire lock for campaign {campaign_id}. "
                 f"Another worker may be processing it."
@@ -74,7 +97,15 @@ def send_campaign(self, campaign_id: str):
                 "reason": "Campaign not in 'scheduled' status",
             }
         
-        logger.info(f"✅ Lock acquired for campaign {campaign_id}")
+        # Freeze the audience in the same transaction as the lock, so batches and
+        # retries all see exactly these recipients
+        recipients_count = _snapshot_recipients(db, campaign_id_obj)
+        db.commit()
+        
+        logger.info(
+            f"✅ Lock acquired for campaign {campaign_id} "
+            f"({recipients_count} recipients in snapshot)"
+        )
         
         # ======================== PHASE 2: FETCH CAMPAIGN ========================
         
@@ -92,7 +123,7 @@ def send_campaign(self, campaign_id: str):
             f"Subject: {campaign.subject}"
         )
         
-        # ======================== PHASE 3: FETCH SUBSCRIBERS IN BATCHES ========================
+        # ======================== PHASE 3: VERIFY COMPANY ========================
         
         # Get company info for plan limit check
         company = db.execute(
@@ -104,20 +135,7 @@ def send_campaign(self, campaign_id: str):
             _mark_campaign_failed(db, campaign_id_obj, "Company not found")
             return {"status": "error", "campaign_id": campaign_id, "reason": "company_not_found"}
         
-        # Fetch active subscribers
-        subscriber_query = select(Subscriber).where(
-            and_(
-                Subscriber.company_id == campaign.company_id,
-                Subscriber.status == "subscribed",
-            )
-        )
-        
-        all_subscribers = db.execute(subscriber_query).scalars().all()
-        subscriber_emails = [s.subscriber_email for s in all_subscribers]
-        
-        logger.info(f"📊 Found {len(subscriber_emails)} active subscribers")
-        
-        if not subscriber_emails:
+        if not recipients_count:
             logger.warning(f"⚠️ No active subscribers for campaign {campaign_id}")
             _mark_campaign_sent(db, campaign_id_obj)
             return {
@@ -127,75 +145,251 @@ def send_campaign(self, campaign_id: str):
                 "batches_enqueued": 0,
             }
         
+        sent_count, failed_count = _finished_recipient_counts(db, campaign_id_obj)
+        if not campaign.enqueued_seq:
+            # Live progress counters; a retried send starts from what's already
+            # finished. Once batches are out they own the counters, so a resumed
+            # send leaves them alone.
+            campaign_progress.start(
+                campaign_id,
+                total=recipients_count,
+                sent=sent_count,
+                failed=failed_count,
+                company_id=str(campaign.company_id),
+            )
+        
+        if sent_count + failed_count >= recipients_count:
+            # Every recipient already finished on an earlier attempt
+            _mark_campaign_sent(
+                db, campaign_id_obj, "partially_failed" if failed_count else "sent"
+            )
+            return {
+                "status": "success",
+                "campaign_id": campaign_id,
+                "subscribers_count": recipients_count,
+                "batches_enqueued": 0,
+            }
+        
         # ======================== PHASE 4: ENQUEUE BATCH TASKS ========================
+        # Batches are (start, end] seq ranges of the recipient snapshot, from the
+        # enqueue watermark on
         
         batch_size = constants.CAMPAIGN_BATCH_SIZE
-        batch_tasks = []
+        batches_enqueued = 0
+        subscribers_count = 0
+        
+        if constants.CAMPAIGN_FAIR_SCHEDULING:
+            # Nothing is enqueued up front: the dispatcher hands out ranges from
+            # the watermark round-robin across companies (see batch_dispatcher)
+            fair_scheduler.activate([str(campaign.company_id)])
+            batches_enqueued = dispatch_pending_batches()
+            logger.info(
+                f"⚖️ Campaign {campaign_id} waiting for fair-share dispatch "
+                f"({batches_enqueued} batches dispatched now)"
+            )
+            return {
+                "status": "success",
+                "campaign_id": campaign_id,
+                "company_id": str(campaign.company_id),
+                "subscribers_count": recipients_count - campaign.enqueued_seq,
+                "batches_enqueued": batches_enqueued,
+                "batch_size": batch_size,
+            }
         
-        for i in range(0, len(subscriber_emails), batch_size):
-            batch = subscriber_emails[i : i + batch_size]
-            batch_num = i // batch_size + 1
+        if campaign.enqueued_seq:
+            logger.info(
+                f"↪️ Resuming enqueue for campaign {campaign_id} after recipient {campaign.enqueued_seq}"
+            )
+        
+        for start_seq in range(campaign.enqueued_seq, recipients_count, batch_size):
+            end_seq = min(start_seq + batch_size, recipients_count)
+            
+            if constants.CAMPAIGN_BATCH_PAYLOAD == "range":
+                # Compact descriptor; the batch worker resolves the recipients
+                # itself, so each broker message is constant-size
+                batch_args, batch_kwargs = [str(campaign_id)], {"key_range": [start_seq, end_seq]}
+                batch_count = end_seq - start_seq
+            else:
+                batch = _pending_recipient_emails(db, campaign_id_obj, start_seq, end_seq)
+                if not batch:
+                    continue
+                batch_args, batch_kwargs = [str(campaign_id), batch], {}
+                batch_count = len(batch)
             
-            # Enqueue batch send task
-            task = send_campaign_batch.apply_async(
-                args=[str(campaign_id), batch],
+            send_campaign_batch.apply_async(
+                args=batch_args,
+                kwargs=batch_kwargs,
                 queue="email_batches",
                 priority=9,
             )
-            batch_tasks.append(task)
+            
+            batches_enqueued += 1
+            subscribers_count += batch_count
+            campaign_progress.add_enqueued(campaign_id)
             
             logger.info(
-                f"📨 Enqueued batch {batch_num} "
-                f"({len(batch)} emails) for campaign {campaign_id}"
+                f"📨 Enqueued batch {batches_enqueued} "
+                f"(recipients {start_seq + 1}-{end_seq}) for campaign {campaign_id}"
             )
+            
+            if batches_enqueued % ENQUEUE_CHUNK_SIZE == 0:
+                _advance_enqueued_seq(db, campaign_id_obj, end_seq)
+        
+        _advance_enqueued_seq(db, campaign_id_obj, recipients_count)
         
         logger.info(
-            f"✅ All {len(batch_tasks)} batches enqueued "
-            f"({len(subscriber_emails)} total emails)"
+            f"✅ All {batches_enqueued} batches enqueued "
+            f"({subscribers_count} total emails)"
         )
         
-        # ======================== PHASE 5: WAIT FOR COMPLETION ========================
-        # In production, we'd use a chord/group to track completion
-        # For now, mark as sent - send logs will track actual delivery
-        
-        _mark_campaign_sent(db, campaign_id_obj)
+        # ======================== PHASE 5: COMPLETION ========================
+        # Not awaited here: the batch that finishes the last recipient moves the
+        # campaign to 'sent' or 'partially_failed' (see email_batch._add_campaign_stats)
         
         return {
             "status": "success",
             "campaign_id": campaign_id,
             "company_id": str(campaign.company_id),
-            "subscribers_count": len(subscriber_emails),
-            "batches_enqueued": len(batch_tasks),
+            "subscribers_count": subscribers_count,
+            "batches_enqueued": batches_enqueued,
             "batch_size": batch_size,
         }
     
     except Exception as exc:
+        db.rollback()
         logger.error(f"❌ send_campaign failed: {str(exc)}", exc_info=True)
-        _mark_campaign_failed(db, uuid.UUID(campaign_id), str(exc))
-        raise self.retry(exc=exc, countdown=120)
+        if self.request.retries >= self.max_retries:
+            # Out of retries: hand the campaign back to the scheduler; the next
+            # send resumes from the enqueue watermark
+            _mark_campaign_failed(db, uuid.UUID(campaign_id), str(exc))
+            raise
+        # Stays 'sending' so completion isn't blocked while batches already
+        # enqueued finish
+        raise self.retry(exc=exc, countdown=120, kwargs={"resume": True})
     
     finally:
         db.close()
 
 
-def _mark_campaign_sent(db: Session, campaign_id: uuid.UUID):
-    """Mark campaign as sent."""
+def _snapshot_recipients(db: Session, campaign_id: uuid.UUID) -> int:
+    """
+    Copy the company's subscribed audience into campaign_recipients.
+    
+    A single INSERT ... SELECT numbers recipients 1..N by subscriber id. If the
+    campaign already has a snapshot (send_campaign retried), it is kept as-is.
+    The campaign_stats row is created with the snapshot size in the same
+    transaction.
+    
+    Returns:
+        Number of recipients in the snapshot
+    """
+    snapshot = (
+        select(
+            Campaign.id,
+            func.row_number().over(order_by=Subscriber.id),
+            Subscriber.id,
+            Subscriber.subscriber_email,
+            Subscriber.subscriber_name,
+        )
+        .join(
+            Subscriber,
+            and_(
+                Subscriber.company_id == Campaign.company_id,
+                Subscriber.status == "subscribed",
+            ),
+        )
+        .where(Campaign.id == campaign_id)
+        .where(~exists().where(CampaignRecipient.campaign_id == campaign_id))
+    )
+    
+    db.execute(
+        insert(CampaignRecipient).from_select(
+            ["campaign_id", "seq", "subscriber_id", "subscriber_email", "subscriber_name"],
+            snapshot,
+        )
+    )
+    
+    # seq is dense, so the highest seq is the recipient count (primary key lookup)
+    recipients_count = db.execute(
+        select(func.coalesce(func.max(CampaignRecipient.seq), 0)).where(
+            CampaignRecipient.campaign_id == campaign_id
+        )
+    ).scalar_one()
+    
+    # Counters already recorded by a previous attempt are kept
+    stmt = pg_insert(CampaignStats).values(campaign_id=campaign_id, total_recipients=recipients_count)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignStats.campaign_id],
+            set_={"total_recipients": stmt.excluded.total_recipients, "updated_at": func.now()},
+        )
+    )
+    
+    return recipients_count
+
+
+def _finished_recipient_counts(db: Session, campaign_id: uuid.UUID) -> tuple[int, int]:
+    """(sent, failed) recipients from the campaign_stats rollup."""
+    stats = db.execute(
+        select(CampaignStats.sent, CampaignStats.failed).where(
+            CampaignStats.campaign_id == campaign_id
+        )
+    ).one_or_none()
+    return (stats.sent, stats.failed) if stats else (0, 0)
+
+
+def _pending_recipient_emails(
+    db: Session, campaign_id: uuid.UUID, start_seq: int, end_seq: int
+) -> list[str]:
+    """Emails in a (start, end] seq range of the snapshot that still need sending."""
+    return db.execute(
+        select(CampaignRecipient.subscriber_email)
+        .where(
+            and_(
+                CampaignRecipient.campaign_id == campaign_id,
+                CampaignRecipient.seq > start_seq,
+                CampaignRecipient.seq <= end_seq,
+                CampaignRecipient.state == "pending",
+            )
+        )
+        .order_by(CampaignRecipient.seq)
+    ).scalars().all()
+
+
+def _advance_enqueued_seq(db: Session, campaign_id: uuid.UUID, enqueued_seq: int) -> None:
+    """Checkpoint the enqueue watermark; everything up to ``enqueued_seq`` is out."""
+    db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(enqueued_seq=enqueued_seq, updated_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+
+
+def _mark_campaign_sent(db: Session, campaign_id: uuid.UUID, status: str = "sent"):
+    """Mark campaign as sent (or partially_failed)."""
     now = datetime.now(timezone.utc)
     db.execute(
         update(Campaign)
         .where(Campaign.id == campaign_id)
-        .values(status="sent", sent_at=now, updated_at=now)
+        .values(status=status, sent_at=now, updated_at=now)
     )
     db.commit()
-    logger.info(f"✅ Campaign {campaign_id} marked as sent")
+    logger.info(f"✅ Campaign {campaign_id} marked as {status}")
 
 
 def _mark_campaign_failed(db: Session, campaign_id: uuid.UUID, error_msg: str):
-    """Revert campaign to scheduled status (for retry) if it fails to enqueue batches."""
+    """
+    Revert campaign to scheduled status (for retry) if it fails to enqueue batches.
+    
+    The snapshot, stats and enqueue watermark are kept, so the next send resumes
+    where this one stopped.
+    """
     now = datetime.now(timezone.utc)
     db.execute(
         update(Campaign)
-        .where(Campaign.id == campaign_id)
+        # Not if it was cancelled meanwhile
+        .where((Campaign.id == campaign_id) & (Campaign.status == "sending"))
         .values(status="scheduled", updated_at=now)
     )
     db.commit()
@@ -1,28 +1,577 @@
-"""Email batch sending worker with AWS SES integration."""
+"""Email batch sending worker (AWS SES by default, see app.utils.mail.transports)."""
 
-import boto3
+import json
+import random
+import redis
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from datetime import timedelta
 import uuid
-from sqlalchemy import select, insert
+from celery.signals import worker_process_shutdown, worker_shutdown
+from sqlalchemy import select, update, func, exists, or_, case, null
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 from loguru import logger
-from botocore.exceptions import ClientError
 
 from app.celery_app import app
 from app.database.database import SessionLocal
 # Import all models with proper initialization order
-from app.database.models import Campaign, CampaignSendLog
-from app.modules.newsletters.newsletter_templates.model import NewsletterTemplate
+from app.database.models import Campaign, CampaignRecipient, CampaignSendLog, CampaignStats
 from app.utils import constants
+from app.redis.campaign_progress import campaign_progress
+from app.redis.rate_limiter import DistributedRateLimiter
+from app.redis.send_controller import AdaptiveSendController
+from app.utils.mail.transports import SendResult, get_mail_transport
+from app.utils.rate_limiter import TokenBucket
+from app.utils.template_renderer import CompiledCampaignTemplate
+from app.workers.campaign_context import get_campaign_send_context
 
 
-# Initialize SES client
-ses_client = boto3.client(
-    "ses",
-    region_name=constants.AWS_SES_REGION,
-    aws_access_key_id=constants.AWS_SES_ACCESS_KEY_ID,
-    aws_secret_access_key=constants.AWS_SES_SECRET_ACCESS_KEY,
+# Mail backend selected by MAIL_TRANSPORT ("ses", "smtp" or "fake")
+mail_transport = get_mail_transport()
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def close_mail_transport(**kwargs):
+    """Close pooled mail connections (SMTP) when the worker or pool process exits."""
+    mail_transport.close()
+
+
+# AIMD controller lowering rate/concurrency on SES throttling and probing back up
+send_controller = (
+    AdaptiveSendController(
+        redis_url=constants.REDIS_URL,
+        max_rate=constants.SES_SEND_RATE_LIMIT,
+        max_concurrency=constants.SES_SEND_CONCURRENCY,
+        increase_step=constants.SES_AIMD_INCREASE_STEP,
+        increase_after=constants.SES_AIMD_INCREASE_AFTER,
+        decrease_factor=constants.SES_AIMD_DECREASE_FACTOR,
+    )
+    if constants.SES_ADAPTIVE_RATE
+    else None
 )
 
+# Limiter enforcing SES_SEND_RATE_LIMIT (emails per second).
+# "redis" shares the quota across every worker in the cluster, refilled at the
+# controller's cluster-wide adaptive rate; "local" is per process.
+if constants.SES_RATE_LIMITER_BACKEND == "redis":
+    send_rate_limiter = DistributedRateLimiter(
+        redis_url=constants.REDIS_URL,
+        global_rate=constants.SES_SEND_RATE_LIMIT,
+        company_rate=constants.SES_COMPANY_SEND_RATE_LIMIT,
+        adaptive_rate_key=send_controller.state_key if send_controller else None,
+    )
+else:
+    send_rate_limiter = TokenBucket(rate=constants.SES_SEND_RATE_LIMIT)
+
+
+def _acquire_send_permits(company_id: str, count: int = 1) -> None:
+    """
+    Block until the rate limiter allows ``count`` more emails.
+    
+    The limiters split requests larger than their smallest bucket (global or
+    per-company) into chunks, so a bulk call never asks for more than a bucket holds.
+    """
+    if isinstance(send_rate_limiter, DistributedRateLimiter):
+        send_rate_limiter.acquire(company_id=company_id, permits=count)
+    else:
+        send_rate_limiter.acquire(count)
+
+
+def _dispatch(send_fn, *args) -> list[SendResult]:
+    """Run one SES call inside an adaptive concurrency slot and feed back the outcome."""
+    if send_controller is None:
+        return send_fn(*args)
+    
+    with send_controller.slot():
+        results = send_fn(*args)
+    
+    if any(result.error_code == "Throttling" for result in results):
+        send_controller.on_throttle()
+    else:
+        send_controller.on_success(len(results))
+    # Only paces process-local buckets; the Redis bucket reads the shared rate itself
+    send_rate_limiter.set_rate(send_controller.rate)
+    
+    return results
+
+
+def _send_email(company_id: str, from_email: str, email: str, subject: str, html: str) -> list[SendResult]:
+    """Send a single rendered email through the mail transport."""
+    _acquire_send_permits(company_id)
+    return [mail_transport.send(from_email, email, subject, html)]
+
+
+# ======================== BULK TEMPLATED SENDING ========================
+
+def _ses_template_name(campaign_id: uuid.UUID) -> str:
+    """
+    Name of the campaign's SES template (max 64 chars).
+    
+    One per campaign: a new template version updates it in place, and it is
+    deleted when the campaign completes (SES caps templates per account).
+    """
+    return f"skymail-{campaign_id.hex}"
+
+
+def delete_campaign_template(campaign_id: uuid.UUID) -> None:
+    """Drop a completed campaign's SES template; best effort."""
+    if constants.SES_SEND_MODE != "bulk" or not mail_transport.supports_bulk:
+        return
+    try:
+        mail_transport.delete_template(_ses_template_name(campaign_id))
+    except Exception as e:
+        logger.warning(f"⚠️ SES template of campaign {campaign_id} not deleted: {str(e)}")
+
+
+def _bulk_template_data(
+    compiled_template: CompiledCampaignTemplate, pending_contexts: list[tuple[str, dict]]
+) -> tuple[str, list[tuple[str, dict]]]:
+    """
+    Default data and per-recipient replacement data for bulk templated sends.
+    
+    Variables missing from a recipient's data render as their original
+    placeholder, same as single mode.
+    
+    Returns:
+        (default data JSON, [(email, replacement data)])
+    """
+    default_data = json.dumps(
+        {name: f"{{{{{name}}}}}" for name in compiled_template.variables}
+    )
+    destinations = [
+        (email, {key: str(value) for key, value in render_context.items()})
+        for email, render_context in pending_contexts
+    ]
+    return default_data, destinations
+
+
+def _send_bulk_email(
+    company_id: str,
+    from_email: str,
+    template_name: str,
+    default_data: str,
+    destinations: list[tuple[str, dict]],
+) -> list[SendResult]:
+    """
+    Send up to SES_BULK_DESTINATIONS recipients in one bulk templated call.
+    
+    Args:
+        destinations: (email, replacement data) pairs
+    """
+    _acquire_send_permits(company_id, len(destinations))
+    return mail_transport.send_bulk(from_email, template_name, default_data, destinations)
+
+
+# ======================== SEND LOG UPSERT ========================
+
+# Rows per INSERT ... ON CONFLICT statement
+SEND_LOG_UPSERT_CHUNK_SIZE = 1000
+
+
+def _send_log_row(
+    campaign_id: uuid.UUID,
+    send_started_at: datetime,
+    result: SendResult,
+    batch_size: int,
+    attempt: int = 1,
+    retrying: bool = False,
+) -> dict:
+    """
+    Build the campaign_send_logs row for one send result.
+    
+    Failures that will be retried by a follow-up batch are stored as 'pending'.
+    """
+    extra_data = {"batch_size": batch_size, "attempt": attempt}
+    
+    if result.message_id:
+        return {
+            "id": uuid.uuid4(),
+            "campaign_id": campaign_id,
+            "campaign_send_started_at": send_started_at,
+            "subscriber_email": result.email,
+            "ses_message_id": result.message_id,
+            "status": "sent",
+            "error_message": None,
+            "sent_at": datetime.now(timezone.utc),
+            "extra_data": extra_data,
+        }
+    
+    if result.error_code:
+        extra_data["error_code"] = result.error_code
+    
+    return {
+        "id": uuid.uuid4(),
+        "campaign_id": campaign_id,
+        "campaign_send_started_at": send_started_at,
+        "subscriber_email": result.email,
+        "ses_message_id": None,
+        "status": "pending" if retrying else "failed",
+        "error_message": (
+            f"{result.error_code}: {result.error_message}" if result.error_code else result.error_message
+        ),
+        "sent_at": None,
+        "extra_data": extra_data,
+    }
+
+
+def _upsert_send_logs(db: Session, rows: list[dict]) -> None:
+    """
+    Write send logs with set-based INSERT ... ON CONFLICT DO UPDATE statements.
+    
+    Keyed on (campaign_id, subscriber_email) plus the campaign_send_started_at
+    partition key; a row already marked 'sent' is never downgraded, so concurrent
+    retries of the same batch can't clobber a delivery.
+    """
+    for i in range(0, len(rows), SEND_LOG_UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(CampaignSendLog).values(rows[i : i + SEND_LOG_UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                CampaignSendLog.campaign_id,
+                CampaignSendLog.subscriber_email,
+                CampaignSendLog.campaign_send_started_at,
+            ],
+            set_={
+                "status": stmt.excluded.status,
+                "ses_message_id": stmt.excluded.ses_message_id,
+                "error_message": stmt.excluded.error_message,
+                "sent_at": stmt.excluded.sent_at,
+                "extra_data": stmt.excluded.extra_data,
+                "updated_at": func.now(),
+            },
+            where=CampaignSendLog.status != "sent",
+        )
+        db.execute(stmt)
+
+
+# ======================== PER-RECIPIENT RETRIES ========================
+
+# SES errors worth retrying; anything else (e.g. MessageRejected) is final
+TRANSIENT_SES_ERRORS = {
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+    "InternalFailure",
+    "TransientFailure",
+    "RequestTimeout",
+}
+
+
+def _is_transient(result: SendResult) -> bool:
+    """Errors without an SES code are network/client failures and are retried too."""
+    return result.error_code is None or result.error_code in TRANSIENT_SES_ERRORS
+
+
+def _retry_delay(attempt: int) -> int:
+    """Exponential backoff with jitter for the follow-up batch."""
+    delay = constants.CAMPAIGN_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1))
+    delay = min(delay, constants.CAMPAIGN_RETRY_MAX_DELAY_SECONDS)
+    return int(delay + random.uniform(0, delay / 4))
+
+
+# ======================== RECIPIENT SNAPSHOT ========================
+
+def _claim_snapshot_recipients(
+    db: Session,
+    campaign_id: uuid.UUID,
+    key_range: list | None = None,
+    emails: list | None = None,
+) -> dict:
+    """
+    Claim the pending snapshot rows of a (start, end] seq range or an email list.
+    
+    One UPDATE ... RETURNING moves them to 'sending', so when the same range is
+    enqueued twice (a resumed send_campaign, a redelivered message) only one
+    batch gets the rows and the other sends nothing. Claims older than
+    CAMPAIGN_CLAIM_LEASE_SECONDS were left by a dead worker and are taken over.
+    The caller commits right away so concurrent batches see the claim.
+    
+    Returns:
+        {email: row} with subscriber_name and attempts, in snapshot order
+    """
+    lease_expired = CampaignRecipient.claimed_at < func.now() - timedelta(
+        seconds=constants.CAMPAIGN_CLAIM_LEASE_SECONDS
+    )
+    query = (
+        update(CampaignRecipient)
+        .where(CampaignRecipient.campaign_id == campaign_id)
+        .where(
+            or_(
+                CampaignRecipient.state == "pending",
+                (CampaignRecipient.state == "sending") & lease_expired,
+            )
+        )
+    )
+    
+    if key_range:
+        start_seq, end_seq = key_range
+        query = query.where(
+            (CampaignRecipient.seq > start_seq) & (CampaignRecipient.seq <= end_seq)
+        )
+    else:
+        query = query.where(CampaignRecipient.subscriber_email.in_(emails))
+    
+    rows = db.execute(
+        query.values(state="sending", claimed_at=func.now(), retry_at=None, updated_at=func.now())
+        .returning(
+            CampaignRecipient.seq,
+            CampaignRecipient.subscriber_email,
+            CampaignRecipient.subscriber_name,
+            CampaignRecipient.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    return {row.subscriber_email: row for row in sorted(rows, key=lambda row: row.seq)}
+
+
+def _release_recipient_claims(
+    db: Session, campaign_id: uuid.UUID, emails: list, retry_in: int | None = None
+) -> None:
+    """
+    Hand claimed recipients that were never attempted back to 'pending'.
+    
+    With ``retry_in``, the dispatcher sends them again after that many seconds.
+    """
+    if not emails:
+        return
+    db.execute(
+        update(CampaignRecipient)
+        .where(
+            (CampaignRecipient.campaign_id == campaign_id)
+            & (CampaignRecipient.subscriber_email.in_(emails))
+            & (CampaignRecipient.state == "sending")
+        )
+        .values(
+            state="pending",
+            claimed_at=None,
+            retry_at=func.now() + timedelta(seconds=retry_in) if retry_in is not None else None,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def requeue_recipients(
+    db: Session, campaign_id: uuid.UUID, condition, retry_in: int
+) -> list[str]:
+    """
+    Put snapshot rows matching ``condition`` back to 'pending' for the dispatcher.
+    
+    Used for rows a batch claimed but could not finish: its own claims when it
+    fails, and claims of hard-killed workers once their lease expired. Each
+    such round counts as an attempt, so a recipient that keeps breaking its
+    batch fails after CAMPAIGN_RECIPIENT_MAX_ATTEMPTS instead of looping;
+    those rows go to 'failed' right away, with a failed send log and stats.
+    The caller commits.
+    
+    Returns:
+        Emails that used up their attempts and failed
+    """
+    exhausted = CampaignRecipient.attempts + 1 >= constants.CAMPAIGN_RECIPIENT_MAX_ATTEMPTS
+    rows = db.execute(
+        update(CampaignRecipient)
+        .where((CampaignRecipient.campaign_id == campaign_id) & condition)
+        .values(
+            state=case((exhausted, "failed"), else_="pending"),
+            attempts=CampaignRecipient.attempts + 1,
+            claimed_at=None,
+            retry_at=case((exhausted, null()), else_=func.now() + timedelta(seconds=retry_in)),
+            updated_at=func.now(),
+        )
+        .returning(CampaignRecipient.subscriber_email, CampaignRecipient.state, CampaignRecipient.attempts)
+        .execution_options(synchronize_session=False)
+    ).all()
+    
+    failed = [row for row in rows if row.state == "failed"]
+    if failed:
+        send_started_at = db.execute(
+            select(Campaign.send_started_at).where(Campaign.id == campaign_id)
+        ).scalar_one()
+        _upsert_send_logs(db, [
+            _send_log_row(
+                campaign_id,
+                send_started_at,
+                SendResult(row.subscriber_email, error_message="Send attempts exhausted"),
+                len(failed),
+                row.attempts,
+            )
+            for row in failed
+        ])
+        _add_campaign_stats(db, campaign_id, 0, len(failed))
+    
+    return [row.subscriber_email for row in failed]
+
+
+def _has_snapshot(db: Session, campaign_id: uuid.UUID) -> bool:
+    return db.execute(
+        select(exists().where(CampaignRecipient.campaign_id == campaign_id))
+    ).scalar()
+
+
+def _load_legacy_recipients(
+    db: Session,
+    campaign_id: uuid.UUID,
+    send_started_at: datetime,
+    company_id: uuid.UUID,
+    emails: list,
+) -> tuple[dict, dict]:
+    """Names from subscribers and statuses from send logs, for pre-snapshot campaigns."""
+    from app.modules.subscribers.model import Subscriber
+    
+    subscriber_names = dict(
+        db.execute(
+            select(Subscriber.subscriber_email, Subscriber.subscriber_name).where(
+                (Subscriber.company_id == company_id)
+                & (Subscriber.subscriber_email.in_(emails))
+            )
+        ).all()
+    )
+    
+    # One set-based lookup for the whole batch instead of one query per email
+    existing_statuses = dict(
+        db.execute(
+            select(CampaignSendLog.subscriber_email, CampaignSendLog.status).where(
+                (CampaignSendLog.campaign_id == campaign_id)
+                # Partition key: only the campaign's partition is scanned
+                & (CampaignSendLog.campaign_send_started_at == send_started_at)
+                & (CampaignSendLog.subscriber_email.in_(emails))
+            )
+        ).all()
+    )
+    
+    return subscriber_names, existing_statuses
+
+
+def _update_recipient_states(
+    db: Session, campaign_id: uuid.UUID, states: dict[str, list], retry_in: int = 0
+) -> dict[str, int]:
+    """
+    Record the outcome of attempted recipients in the snapshot.
+    
+    One UPDATE per resulting state, applied only to rows claimed as 'sending'
+    ('sent' and 'failed' are final), so the returned row counts are exactly the
+    recipients this batch finished. Recipients to retry go back to 'pending'
+    with retry_at ``retry_in`` seconds from now, for the dispatcher to pick up.
+    
+    Returns:
+        {state: rows updated}
+    """
+    updated = {}
+    for state, emails in states.items():
+        if not emails:
+            updated[state] = 0
+            continue
+        result = db.execute(
+            update(CampaignRecipient)
+            .where(
+                (CampaignRecipient.campaign_id == campaign_id)
+                & (CampaignRecipient.subscriber_email.in_(emails))
+                & (CampaignRecipient.state == "sending")
+            )
+            .values(
+                state=state,
+                attempts=CampaignRecipient.attempts + 1,
+                claimed_at=None,
+                retry_at=func.now() + timedelta(seconds=retry_in) if state == "pending" else None,
+                updated_at=func.now(),
+            )
+        )
+        updated[state] = result.rowcount
+    return updated
+
+
+# ======================== CAMPAIGN STATS ========================
+
+def _add_campaign_stats(
+    db: Session, campaign_id: uuid.UUID, sent: int, failed: int
+) -> tuple[int, int] | None:
+    """
+    Add the recipients a batch finished to the campaign_stats rollup.
+    
+    Runs in the batch's transaction after the send log upsert and snapshot
+    update, so the counters move exactly when the snapshot does and the stats
+    row stays locked only until the commit right after. Batches finishing
+    concurrently are serialized on that row lock, so exactly one of them sees
+    the campaign reach zero remaining.
+    
+    Returns:
+        (remaining, failed) after this batch, or None for campaigns without a
+        recipient total (sent before snapshots existed)
+    """
+    stmt = pg_insert(CampaignStats).values(
+        campaign_id=campaign_id,
+        sent=sent,
+        failed=failed,
+        last_event_at=func.now(),
+    )
+    stats = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignStats.campaign_id],
+            set_={
+                "sent": CampaignStats.sent + stmt.excluded.sent,
+                "failed": CampaignStats.failed + stmt.excluded.failed,
+                "last_event_at": stmt.excluded.last_event_at,
+                "updated_at": func.now(),
+            },
+        ).returning(CampaignStats.total_recipients, CampaignStats.sent, CampaignStats.failed)
+    ).one()
+    
+    if not stats.total_recipients:
+        return None
+    return max(0, stats.total_recipients - stats.sent - stats.failed), stats.failed
+
+
+# ======================== COMPLETION TRACKING ========================
+# Completion is decided from campaign_stats in Postgres; the Redis counters
+# only feed live progress streams and may lag or be lost without harm.
+# campaign_scheduler.complete_finished_campaigns sweeps up any campaign whose
+# completing batch died between its commit and _complete_campaign.
+
+def _publish_progress(campaign_id: uuid.UUID, sent: int, failed: int) -> None:
+    """Add this batch's finished recipients to the live progress counters."""
+    try:
+        campaign_progress.record(str(campaign_id), sent=sent, failed=failed)
+    except redis.RedisError as e:
+        logger.warning(f"Redis campaign progress not updated for {campaign_id}: {str(e)}")
+
+
+def _complete_campaign(db: Session, campaign_id: uuid.UUID, failed: int) -> None:
+    """
+    Move the campaign out of 'sending' once its last recipient has finished.
+    
+    Conditional on status='sending', so concurrent last batches complete it once.
+    """
+    now = datetime.now(timezone.utc)
+    status = "partially_failed" if failed else "sent"
+    result = db.execute(
+        update(Campaign)
+        .where((Campaign.id == campaign_id) & (Campaign.status == "sending"))
+        .values(status=status, sent_at=now, updated_at=now)
+    )
+    db.commit()
+    
+    if result.rowcount:
+        logger.info(f"🏁 Campaign {campaign_id} completed: {status} ({failed} failed)")
+        campaign_progress.publish_status(str(campaign_id), status)
+        delete_campaign_template(campaign_id)
+
+
+# ======================== FAIR-SHARE SLOTS ========================
+
+def _release_fair_slot(company_id: str, token: str) -> None:
+    """Give the company's in-flight slot back and refill it with the next fair batch."""
+    # Imported here: batch_dispatcher imports this module
+    from app.workers.batch_dispatcher import dispatch_pending_batches, fair_scheduler
+    
+    fair_scheduler.release(company_id, token)
+    try:
+        dispatch_pending_batches(max_batches=1)
+    except Exception as e:
+        # The periodic dispatcher will pick it up
+        logger.warning(f"⚠️ Fair batch dispatch failed: {str(e)}")
+
 
 @app.task(
     name="app.workers.email_batch.send_campaign_batch",
@@ -30,282 +579,361 @@ ses_client = boto3.client(
     queue="email_batches",
     max_retries=5,
     default_retry_delay=30,
-    autoretry_for=(Exception,),
-    retry_backoff=True,
 )
-def send_campaign_batch(self, campaign_id: str, subscriber_emails: list):
+def send_campaign_batch(
+    self,
+    campaign_id: str,
+    subscriber_emails: list | None = None,
+    attempts: dict | None = None,
+    key_range: list | None = None,
+    fair_slot: list | None = None,
+):
     """
     Send emails to a batch of subscribers using AWS SES.
     
-    🚫 CRITICAL CONSTRAINT:
-    Must NOT update campaign status. Campaign status is managed by send_campaign task.
+    Campaign status: send_campaign moves the campaign to 'sending'; the batch
+    whose campaign_stats update leaves zero recipients remaining completes it
+    ('sent' or 'partially_failed') via _complete_campaign. Concurrent final
+    batches are serialized on the stats row and the status update is
+    conditional, so the campaign is completed once.
     
     Responsibilities:
     1. Render template with variables
     2. Send via AWS SES
     3. Log delivery status per email
     4. Handle SES errors (throttling, bounces, etc.)
-    5. Track via CampaignSendLog for idempotency
+    5. Track via CampaignSendLog and the recipient snapshot for idempotency
+    
+    Recipients that fail with a transient error (or are never attempted because
+    SES throttled the batch) go back to 'pending' in the snapshot with a backoff
+    retry_at, until CAMPAIGN_RECIPIENT_MAX_ATTEMPTS is reached; batch_dispatcher
+    sends them again as a smaller batch, within the company's fair-share slots.
+    
+    The batch is either an explicit list of emails or, with
+    CAMPAIGN_BATCH_PAYLOAD="range", a compact (start, end] seq range of the
+    campaign's recipient snapshot, resolved here with one primary-key range query.
     
     Args:
         campaign_id: UUID of campaign
         subscriber_emails: List of email addresses to send to
+        attempts: Previous attempt count per email (set on follow-up batches)
+        key_range: [start_seq, end_seq] of the recipient snapshot, start exclusive
+            and end inclusive; used instead of subscriber_emails
+        fair_slot: [company_id, token] in-flight slot from the fair-share
+            dispatcher, released when the batch finishes
     """
     db = SessionLocal()
+    campaign_id_obj = uuid.UUID(campaign_id)
+    # Snapshot rows this batch holds as 'sending', released if it fails
+    claimed = []
     try:
-        campaign_id_obj = uuid.UUID(campaign_id)
-        
         logger.info(
             f"📧 Starting batch send for campaign {campaign_id} "
-            f"({len(subscriber_emails)} emails)"
+            + (f"(range {key_range})" if key_range else f"({len(subscriber_emails)} emails)")
         )
         
-        # ======================== FETCH CAMPAIGN & TEMPLATE ========================
+        # ======================== LOAD CAMPAIGN SEND CONTEXT ========================
+        # Campaign, template, company and assets come from the per-worker cache;
+        # Postgres is only hit once per campaign version per process
         
-        campaign = db.execute(
-            select(Campaign).where(Campaign.id == campaign_id_obj)
-        ).scalar_one_or_none()
+        context, error_reason = get_campaign_send_context(db, campaign_id_obj)
         
-        if not campaign:
-            logger.error(f"❌ Campaign {campaign_id} not found")
-            return {"status": "error", "reason": "campaign_not_found"}
+        if not context:
+            logger.error(f"❌ Cannot send batch for campaign {campaign_id}: {error_reason}")
+            return {"status": "error", "reason": error_reason}
         
-        # Fetch template
-        template = None
-        if campaign.template_id:
-            template = db.execute(
-                select(NewsletterTemplate).where(
-                    NewsletterTemplate.id == campaign.template_id
-                )
-            ).scalar_one_or_none()
+        compiled_template = context.compiled_template
         
-        if not template:
-            logger.error(f"❌ Template {campaign.template_id} not found")
-            return {"status": "error", "reason": "template_not_found"}
+        # ======================== PREPARE EMAIL DETAILS ========================
         
-        logger.info(f"📄 Using template: {template.name}")
+        from_email = constants.AWS_SES_SENDER_EMAIL or constants.MAIL_FROM
         
-        # ======================== FETCH COMPANY DATA ========================
+        if not from_email:
+            logger.error("❌ AWS_SES_SENDER_EMAIL not configured")
+            return {"status": "error", "reason": "sender_email_not_configured"}
         
-        from app.modules.auth.model import Company
+        # ======================== RESOLVE RECIPIENTS ========================
+        # The batch claims its still-pending recipients from the campaign's frozen
+        # snapshot in one indexed UPDATE (no per-email send log queries); rows
+        # already sent, failed or claimed by another batch are left out
         
-        company = db.execute(
-            select(Company).where(Company.id == campaign.company_id)
-        ).scalar_one_or_none()
+        attempts = attempts or {}
         
-        if not company:
-            logger.error(f"❌ Company {campaign.company_id} not found")
-            return {"status": "error", "reason": "company_not_found"}
+        if key_range:
+            recipients = _claim_snapshot_recipients(db, campaign_id_obj, key_range=key_range)
+        else:
+            recipients = _claim_snapshot_recipients(db, campaign_id_obj, emails=subscriber_emails)
+        db.commit()
+        claimed = list(recipients)
         
-        # ======================== FETCH TEMPLATE ASSETS ========================
+        snapshot = bool(recipients or key_range or _has_snapshot(db, campaign_id_obj))
+        if snapshot:
+            subscriber_emails = claimed
+            logger.debug(f"🔑 Claimed {len(claimed)} recipients")
+            subscriber_names = {email: row.subscriber_name for email, row in recipients.items()}
+            existing_statuses = {}
+            for email, row in recipients.items():
+                attempts.setdefault(email, row.attempts)
+        else:
+            # Campaign started before recipient snapshots existed
+            subscriber_names, existing_statuses = _load_legacy_recipients(
+                db, campaign_id_obj, context.send_started_at, context.company_id, subscriber_emails
+            )
         
-        from app.modules.newsletters.template_assets.model import TemplateAsset
+        # ======================== BUILD RENDER CONTEXTS ========================
         
-        template_assets = db.execute(
-            select(TemplateAsset).where(
-                (TemplateAsset.template_id == campaign.template_id)
-                & (TemplateAsset.company_id == campaign.company_id)
-            )
-        ).scalars().all()
+        sent_count = 0
+        failed_count = 0
+        pending_contexts = []
         
-        # Build template_asset string (comma-separated URLs)
-        template_asset_urls = ",".join([asset.file_url for asset in template_assets]) if template_assets else ""
+        # Duplicate addresses in one batch would hit the same upsert key twice
+        for email in dict.fromkeys(subscriber_emails):
+            # Check if already sent (idempotency; legacy campaigns only, snapshot
+            # batches only ever claim unsent recipients)
+            if existing_statuses.get(email) == "sent":
+                logger.debug(f"⏭️  Email already sent to {email}, skipping")
+                sent_count += 1
+                continue
+            
+            # Merge system variables (from DB) + campaign constants (manual values) + template assets
+            render_context = {
+                # System variables (auto-resolved)
+                "company_name": context.company_name,
+                "website_url": context.website_url,
+                "subscriber_email": email,
+                "subscriber_username": subscriber_names.get(email) or email.split("@")[0],
+                "template_asset": context.template_asset_urls,
+                # Campaign constants (manual values provided at creation)
+                **context.constants_values
+            }
+            
+            logger.debug(f"🔍 Render context: {render_context}")
+            pending_contexts.append((email, render_context))
         
-        logger.debug(f"📦 Found {len(template_assets)} template assets")
+        # ======================== PREPARE SEND CALLS ========================
+        # "single": one SendEmail call per recipient with a locally rendered body
+        # "bulk": SES renders a registered template for up to 50 recipients per call
         
-        # ======================== PREPARE EMAIL DETAILS ========================
+        company_id = str(context.company_id)
+        send_calls = []
         
-        from_email = constants.AWS_SES_SENDER_EMAIL or constants.MAIL_FROM
-        campaign_subject = campaign.subject or template.subject
-        template_html = template.html_content
-        template_text = template.text_content
+        send_mode = constants.SES_SEND_MODE
+        if send_mode == "bulk" and not mail_transport.supports_bulk:
+            logger.warning(
+                f"⚠️ {mail_transport.name} transport has no bulk sending, falling back to single mode"
+            )
+            send_mode = "single"
         
-        if not from_email:
-            logger.error("❌ AWS_SES_SENDER_EMAIL not configured")
-            return {"status": "error", "reason": "sender_email_not_configured"}
+        if send_mode == "bulk" and pending_contexts:
+            template_name = _ses_template_name(campaign_id_obj)
+            mail_transport.register_template(
+                template_name,
+                context.subject,
+                context.html_content,
+                context.text_content,
+            )
+            
+            default_data, all_destinations = _bulk_template_data(compiled_template, pending_contexts)
+            
+            chunk_size = constants.SES_BULK_DESTINATIONS
+            for i in range(0, len(all_destinations), chunk_size):
+                destinations = all_destinations[i : i + chunk_size]
+                send_calls.append((
+                    [email for email, _ in destinations],
+                    (_send_bulk_email, company_id, from_email, template_name, default_data, destinations),
+                ))
+        else:
+            for email, render_context in pending_contexts:
+                rendered_subject, rendered_html, _ = compiled_template.render(render_context)
+                send_calls.append((
+                    [email],
+                    (_send_email, company_id, from_email, email, rendered_subject, rendered_html),
+                ))
+        
+        logger.info(
+            f"✅ Prepared {len(send_calls)} SES calls for {len(pending_contexts)} emails "
+            f"(mode: {send_mode}, transport: {mail_transport.name}, campaign: {campaign_id})"
+        )
         
         # ======================== SEND EMAILS IN BATCH ========================
+        # SES calls run on a bounded thread pool paced by the send-rate limiter.
+        # Results are recorded on this thread because the DB session is not thread-safe.
         
-        sent_count = 0
-        failed_count = 0
+        if send_controller:
+            # Start at the rate the cluster last learned, not the configured maximum
+            send_controller.load()
+            send_rate_limiter.set_rate(send_controller.rate)
         
-        for email in subscriber_emails:
-            try:
-                logger.debug(f"📤 Sending to {email}")
-                
-                # Check if already sent (idempotency)
-                existing_log = db.execute(
-                    select(CampaignSendLog).where(
-                        (CampaignSendLog.campaign_id == campaign_id_obj)
-                        & (CampaignSendLog.subscriber_email == email)
-                    )
-                ).scalar_one_or_none()
-                
-                if existing_log and existing_log.status == "sent":
-                    logger.debug(f"⏭️  Email already sent to {email}, skipping")
-                    sent_count += 1
+        throttled = False
+        send_log_rows = []
+        retry_emails = []
+        unattempted = []
+        recipient_states = {"sent": [], "pending": [], "failed": []}
+        
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(constants.SES_SEND_CONCURRENCY, len(send_calls)))
+        ) as executor:
+            futures = {executor.submit(_dispatch, *call): emails for emails, call in send_calls}
+            
+            for future in as_completed(futures):
+                if future.cancelled():
+                    # Not attempted because SES throttled us; doesn't count as an attempt
+                    retry_emails.extend(futures[future])
+                    unattempted.extend(futures[future])
                     continue
                 
-                # ======================== FETCH SUBSCRIBER DATA ========================
-                
-                from app.modules.subscribers.model import Subscriber
-                
-                subscriber = db.execute(
-                    select(Subscriber).where(
-                        (Subscriber.company_id == campaign.company_id)
-                        & (Subscriber.subscriber_email == email)
+                for result in future.result():
+                    attempt = attempts.get(result.email, 0) + 1
+                    
+                    if result.message_id:
+                        logger.debug(f"✅ Email sent to {result.email} (SES ID: {result.message_id})")
+                        send_log_rows.append(
+                            _send_log_row(
+                                campaign_id_obj,
+                                context.send_started_at,
+                                result,
+                                len(subscriber_emails),
+                                attempt,
+                            )
+                        )
+                        recipient_states["sent"].append(result.email)
+                        sent_count += 1
+                        continue
+                    
+                    logger.error(
+                        f"❌ SES error for {result.email}: {result.error_code} - {result.error_message}"
                     )
-                ).scalar_one_or_none()
-                
-                # ======================== BUILD RENDER CONTEXT ========================
-                # Merge system variables (from DB) + campaign constants (manual values) + template assets
-                
-                render_context = {
-                    # System variables (auto-resolved)
-                    "company_name": company.company_name,
-                    "website_url": company.website_url or "",
-                    "subscriber_email": email,
-                    "subscriber_username": subscriber.subscriber_name if subscriber else email.split("@")[0],
-                    "template_asset": template_asset_urls,
-                    # Campaign constants (manual values provided at creation)
-                    **(campaign.constants_values or {})
-                }
-                
-                logger.debug(f"🔍 Render context: {render_context}")
-                
-                # ======================== RENDER TEMPLATE ========================
-                
-                rendered_subject = campaign_subject
-                rendered_html = template_html
-                rendered_text = template_text if template_text else ""
-                
-                # Replace all {{variable_name}} placeholders
-                for key, value in render_context.items():
-                    placeholder = f"{{{{{key}}}}}"
-                    rendered_subject = rendered_subject.replace(placeholder, str(value))
-                    rendered_html = rendered_html.replace(placeholder, str(value))
-                    rendered_text = rendered_text.replace(placeholder, str(value))
-                
-                # Check for unresolved variables
-                import re
-                unresolved = re.findall(r"\{\{(\w+)\}\}", rendered_html)
-                if unresolved:
-                    logger.warning(f"⚠️ Unresolved variables in template: {unresolved}")
-                
-                logger.info(f"✅ Template rendered for {email}")
-                
-                # Create or update send log
-                send_log_id = existing_log.id if existing_log else uuid.uuid4()
-                
-                # Send via SES
-                response = ses_client.send_email(
-                    Source=from_email,
-                    Destination={"ToAddresses": [email]},
-                    Message={
-                        "Subject": {"Data": rendered_subject, "Charset": "UTF-8"},
-                        "Body": {
-                            "Html": {"Data": rendered_html, "Charset": "UTF-8"},
-                        },
-                    },
-                )
-                
-                ses_message_id = response["MessageId"]
-                
-                logger.debug(f"✅ Email sent to {email} (SES ID: {ses_message_id})")
-                
-                # Create or update send log
-                if existing_log:
-                    # Update existing log
-                    existing_log.status = "sent"
-                    existing_log.ses_message_id = ses_message_id
-                    existing_log.sent_at = datetime.now(timezone.utc)
-                    existing_log.error_message = None
-                    db.merge(existing_log)
-                else:
-                    # Create new log
-                    send_log = CampaignSendLog(
-                        id=send_log_id,
-                        campaign_id=campaign_id_obj,
-                        subscriber_email=email,
-                        ses_message_id=ses_message_id,
-                        status="sent",
-                        sent_at=datetime.now(timezone.utc),
-                        metadata={"batch_size": len(subscriber_emails)},
+                    
+                    retrying = (
+                        _is_transient(result)
+                        and attempt < constants.CAMPAIGN_RECIPIENT_MAX_ATTEMPTS
                     )
-                    db.add(send_log)
-                
-                sent_count += 1
-            
-            except ClientError as ses_error:
-                error_code = ses_error.response["Error"]["Code"]
-                error_msg = ses_error.response["Error"]["Message"]
-                
-                logger.error(f"❌ SES error for {email}: {error_code} - {error_msg}")
-                
-                # Update or create send log with error
-                if existing_log:
-                    existing_log.status = "failed"
-                    existing_log.error_message = f"{error_code}: {error_msg}"
-                    db.merge(existing_log)
-                else:
-                    send_log = CampaignSendLog(
-                        id=uuid.uuid4(),
-                        campaign_id=campaign_id_obj,
-                        subscriber_email=email,
-                        status="failed",
-                        error_message=f"{error_code}: {error_msg}",
-                        metadata={
-                            "error_code": error_code,
-                            "batch_size": len(subscriber_emails),
-                        },
+                    send_log_rows.append(
+                        _send_log_row(
+                            campaign_id_obj,
+                            context.send_started_at,
+                            result,
+                            len(subscriber_emails),
+                            attempt,
+                            retrying,
+                        )
                     )
-                    db.add(send_log)
-                
-                failed_count += 1
-                
-                # Handle specific SES errors
-                if error_code == "MessageRejected":
-                    logger.warning(f"⚠️ Message rejected for {email}, skipping")
-                elif error_code == "Throttling":
-                    logger.warning(f"⏱️ SES throttled, retrying batch in 30 seconds")
-                    db.commit()
-                    raise self.retry(countdown=30)
-            
-            except Exception as exc:
-                logger.error(f"❌ Unexpected error sending to {email}: {str(exc)}")
-                
-                # Create send log for failed email
-                send_log = CampaignSendLog(
-                    id=uuid.uuid4(),
-                    campaign_id=campaign_id_obj,
-                    subscriber_email=email,
-                    status="failed",
-                    error_message=str(exc),
-                    metadata={"batch_size": len(subscriber_emails)},
-                )
-                db.add(send_log)
-                failed_count += 1
+                    
+                    if retrying:
+                        attempts[result.email] = attempt
+                        retry_emails.append(result.email)
+                        recipient_states["pending"].append(result.email)
+                    else:
+                        recipient_states["failed"].append(result.email)
+                        failed_count += 1
+                    
+                    # Handle specific SES errors
+                    if result.error_code == "MessageRejected":
+                        logger.warning(f"⚠️ Message rejected for {result.email}, skipping")
+                    elif result.error_code == "Throttling" and not throttled:
+                        throttled = True
+                        # With the adaptive controller the batch keeps going at a lower rate;
+                        # without it, stop dispatching (in-flight sends still complete)
+                        if send_controller is None:
+                            for pending in futures:
+                                pending.cancel()
+        
+        if send_controller:
+            send_controller.save()
         
         # ======================== COMMIT SEND LOGS ========================
         
+        retry_in = (
+            _retry_delay(max(1, *(attempts.get(email, 0) for email in retry_emails)))
+            if retry_emails
+            else 0
+        )
+        _upsert_send_logs(db, send_log_rows)
+        finished = _update_recipient_states(db, campaign_id_obj, recipient_states, retry_in)
+        _release_recipient_claims(db, campaign_id_obj, unattempted, retry_in)
+        outcome = None
+        if finished["sent"] or finished["failed"]:
+            outcome = _add_campaign_stats(db, campaign_id_obj, finished["sent"], finished["failed"])
         db.commit()
+        claimed = []
+        
+        # ======================== COMPLETION TRACKING ========================
+        
+        if finished["sent"] or finished["failed"]:
+            _publish_progress(campaign_id_obj, finished["sent"], finished["failed"])
+        
+        if outcome is not None:
+            remaining, total_failed = outcome
+            if remaining == 0:
+                _complete_campaign(db, campaign_id_obj, total_failed)
+        
+        # ======================== FOLLOW-UP FOR FAILED RECIPIENTS ========================
+        # Snapshot recipients are already back in 'pending' with retry_at set:
+        # batch_dispatcher sends them again, through the fair-share slots.
+        # Only campaigns without a snapshot get a follow-up task of their own.
+        
+        if retry_emails and snapshot:
+            logger.warning(
+                f"⏱️ {len(retry_emails)} recipients of campaign {campaign_id} due for retry "
+                f"in {retry_in}s (throttled: {throttled})"
+            )
+        elif retry_emails:
+            send_campaign_batch.apply_async(
+                args=[campaign_id, retry_emails],
+                kwargs={"attempts": {email: attempts.get(email, 0) for email in retry_emails}},
+                queue="email_batches",
+                priority=9,
+                countdown=retry_in,
+            )
+            logger.warning(
+                f"⏱️ Re-enqueued {len(retry_emails)} recipients for campaign {campaign_id} "
+                f"in {retry_in}s (throttled: {throttled})"
+            )
         
         logger.info(
-            f"✅ Batch complete: {sent_count} sent, {failed_count} failed "
-            f"(Campaign: {campaign_id})"
+            f"✅ Batch complete: {sent_count} sent, {failed_count} failed, "
+            f"{len(retry_emails)} retrying (Campaign: {campaign_id})"
         )
         
+        if isinstance(send_rate_limiter, DistributedRateLimiter):
+            logger.info(f"📈 SES send rate utilization: {send_rate_limiter.utilization()}")
+        
         return {
-            "status": "success" if failed_count == 0 else "partial",
+            "status": "success" if failed_count == 0 and not retry_emails else "partial",
             "campaign_id": campaign_id,
             "sent_count": sent_count,
             "failed_count": failed_count,
+            "retry_count": len(retry_emails),
             "total": len(subscriber_emails),
         }
     
     except Exception as exc:
         logger.error(f"❌ Batch send failed: {str(exc)}", exc_info=True)
-        raise self.retry(exc=exc, countdown=60)
+        db.rollback()
+        if claimed:
+            # The claimed recipients go back to the dispatcher (or fail, after
+            # their last attempt) rather than waiting for the lease to run out.
+            # Nothing is left for a task retry to do, so there is none.
+            try:
+                requeue_recipients(
+                    db,
+                    campaign_id_obj,
+                    CampaignRecipient.subscriber_email.in_(claimed)
+                    & (CampaignRecipient.state == "sending"),
+                    retry_in=60,
+                )
+                db.commit()
+                logger.warning(f"⏱️ {len(claimed)} recipients of campaign {campaign_id} requeued")
+                return {"status": "error", "reason": str(exc), "requeued": len(claimed)}
+            except Exception as e:
+                db.rollback()
+                # Left 'sending': the stranded recipient sweep takes them back after the lease
+                logger.warning(f"⚠️ Recipient claims not released for {campaign_id}: {str(e)}")
+        # The slot is released below; the retry must not run on it
+        retry_kwargs = {key: value for key, value in self.request.kwargs.items() if key != "fair_slot"}
+        raise self.retry(exc=exc, countdown=60, kwargs=retry_kwargs)
     
     finally:
         db.close()
+        if fair_slot:
+            _release_fair_slot(*fair_slot)
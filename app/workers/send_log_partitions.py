@@ -0,0 +1,279 @@
+"""Monthly partitions of campaign_send_logs: creation ahead of time, archival of expired months."""
+
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+
+import boto3
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from app.celery_app import app
+from app.database.database import SessionLocal
+from app.utils import constants
+
+
+PARENT_TABLE = "campaign_send_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+# campaign_send_logs_y2026m10 holds campaigns that started sending in October 2026 (UTC)
+PARTITION_NAME = re.compile(r"^campaign_send_logs_y(\d{4})m(\d{2})$")
+
+# Only one maintenance run at a time across the cluster
+MAINTENANCE_LOCK_KEY = "campaign_send_logs_partition_maintenance"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def _partition_tables(db: Session) -> dict[str, bool]:
+    """{monthly partition table: attached}, including detached ones not yet archived."""
+    rows = db.execute(text(
+        """
+        SELECT c.relname, i.inhrelid IS NOT NULL
+        FROM pg_class c
+        LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+        WHERE c.relkind IN ('r', 'p')
+          AND c.relname LIKE 'campaign\\_send\\_logs\\_y%'
+          AND pg_table_is_visible(c.oid)
+        """
+    )).all()
+    return {name: attached for name, attached in rows if PARTITION_NAME.match(name)}
+
+
+def _create_partition(db: Session, month: date) -> str:
+    name = partition_name(month)
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+    ))
+    return name
+
+
+def ensure_partitions(db: Session, months_ahead: int) -> list[str]:
+    """
+    Create the missing partitions from the current month to ``months_ahead`` months on.
+
+    Rows outside every monthly partition land in the default partition; creating
+    a month fails if the default already holds rows for it, so partitions are
+    made well before they're needed. Past months are never back-filled here:
+    rows keyed on a month without a partition (e.g. campaigns that started
+    sending before the migration's first month) stay in the default partition
+    until drain_default_partition moves them.
+
+    Returns:
+        Names of the partitions created
+    """
+    existing = _partition_tables(db)
+    current = _current_month()
+    created = []
+
+    for offset in range(months_ahead + 1):
+        start = _add_months(current, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        _create_partition(db, start)
+        db.commit()
+        created.append(name)
+        logger.info(f"🧱 Created send log partition {name}")
+
+    return created
+
+
+def drain_default_partition(db: Session) -> int:
+    """
+    Move rows of the default partition into monthly partitions.
+
+    The default partition should stay empty: rows there are never archived and
+    block creating their month. When it holds rows, this logs an error and, in
+    one transaction, detaches it, creates the missing months, re-inserts the
+    rows through the parent and attaches it again. Writers to campaign_send_logs
+    wait on the parent lock meanwhile, so taking it is bounded by
+    SEND_LOG_DETACH_LOCK_TIMEOUT_MS. Rows of a month whose partition is
+    detached for archival stay where they are.
+
+    Returns:
+        Number of rows moved
+    """
+    months = db.execute(text(
+        f"""
+        SELECT date_trunc('month', campaign_send_started_at AT TIME ZONE 'UTC'), count(*)
+        FROM {DEFAULT_PARTITION}
+        GROUP BY 1
+        """
+    )).all()
+    db.commit()
+    if not months:
+        return 0
+
+    logger.error(
+        f"🚨 {sum(count for _, count in months)} send logs in {DEFAULT_PARTITION} "
+        f"(months: {', '.join(month.strftime('%Y-%m') for month, _ in months)}), "
+        f"moving them to monthly partitions"
+    )
+
+    db.execute(text(f"SET LOCAL lock_timeout = {constants.SEND_LOG_DETACH_LOCK_TIMEOUT_MS}"))
+    db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+
+    existing = _partition_tables(db)
+    movable = []
+    for month, _ in months:
+        name = partition_name(month.date())
+        if name not in existing:
+            _create_partition(db, month.date())
+            logger.info(f"🧱 Created send log partition {name}")
+        elif not existing[name]:
+            logger.error(f"🚨 {name} is detached for archival, its rows stay in {DEFAULT_PARTITION}")
+            continue
+        movable.append(month)
+
+    in_movable = "date_trunc('month', campaign_send_started_at AT TIME ZONE 'UTC') = ANY(:months)"
+    moved = db.execute(
+        text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_movable}"),
+        {"months": movable},
+    ).rowcount
+    db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_movable}"), {"months": movable})
+    db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    db.commit()
+
+    logger.info(f"📥 Moved {moved} send logs out of {DEFAULT_PARTITION}")
+    return moved
+
+
+def _export_partition(db: Session, name: str, archive_dir: str) -> str:
+    """COPY a (detached) partition into a gzipped CSV file and return its path."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    tmp_path = f"{path}.tmp"
+
+    # A month of logs can take longer than the worker statement timeout
+    db.execute(text("SET LOCAL statement_timeout = 0"))
+    cursor = db.connection().connection.cursor()
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", f)
+    finally:
+        cursor.close()
+    db.commit()
+
+    # Only complete exports carry the final name
+    os.replace(tmp_path, path)
+    return path
+
+
+def _upload_archive(path: str) -> str:
+    """Move an export to AWS_S3_BUCKET under SEND_LOG_ARCHIVE_S3_PREFIX."""
+    key = f"{constants.SEND_LOG_ARCHIVE_S3_PREFIX.rstrip('/')}/{os.path.basename(path)}"
+    s3_client = boto3.client(
+        "s3",
+        aws_access_key_id=constants.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=constants.AWS_SECRET_ACCESS_KEY,
+        region_name=constants.AWS_S3_REGION,
+    )
+    s3_client.upload_file(path, constants.AWS_S3_BUCKET, key)
+    os.remove(path)
+    return f"s3://{constants.AWS_S3_BUCKET}/{key}"
+
+
+def archive_expired_partitions(db: Session, retention_months: int, archive_dir: str) -> list[str]:
+    """
+    Detach, export and drop partitions older than ``retention_months`` full months.
+
+    Whole partitions leave the table at once: no DELETE, no dead tuples, no
+    vacuum debt. Each step is idempotent, so a partition left detached by a
+    failed run is picked up again by the next one.
+
+    Returns:
+        Archive locations (file paths or s3:// URLs)
+    """
+    cutoff = _add_months(_current_month(), -retention_months)
+    archived = []
+
+    for name, attached in sorted(_partition_tables(db).items()):
+        year, month = PARTITION_NAME.match(name).groups()
+        if date(int(year), int(month), 1) >= cutoff:
+            continue
+
+        if attached:
+            # DETACH locks the parent; fail fast rather than stall sends behind it
+            db.execute(text(f"SET LOCAL lock_timeout = {constants.SEND_LOG_DETACH_LOCK_TIMEOUT_MS}"))
+            db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            db.commit()
+            logger.info(f"✂️ Detached send log partition {name}")
+
+        location = _export_partition(db, name, archive_dir)
+        if constants.SEND_LOG_ARCHIVE_S3_PREFIX:
+            location = _upload_archive(location)
+
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        archived.append(location)
+        logger.info(f"📦 Archived send log partition {name} to {location}")
+
+    return archived
+
+
+@app.task(
+    name="app.workers.send_log_partitions.maintain_send_log_partitions",
+    bind=True,
+    queue="scheduled",
+    max_retries=3,
+)
+def maintain_send_log_partitions(self):
+    """
+    Daily partition maintenance for campaign_send_logs.
+
+    Empties the default partition, creates SEND_LOG_PARTITIONS_AHEAD months of
+    partitions ahead and, when SEND_LOG_RETENTION_MONTHS is set, archives the
+    months past retention (by the month each campaign started sending).
+    """
+    db = SessionLocal()
+    # The lock belongs to a transaction left open on a connection of its own
+    # for the whole run, so the work below can commit freely. It is released
+    # when that transaction ends or its connection drops, and the open
+    # transaction pins one server connection behind PgBouncer too.
+    lock_conn = db.get_bind().connect()
+    try:
+        locked = lock_conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": MAINTENANCE_LOCK_KEY}
+        ).scalar()
+        if not locked:
+            logger.info("⏭️ Send log partition maintenance already running, skipping")
+            return {"status": "skipped"}
+
+        # First: a month can't be created while the default holds rows for it
+        rehomed = drain_default_partition(db)
+        created = ensure_partitions(db, constants.SEND_LOG_PARTITIONS_AHEAD)
+        archived = (
+            archive_expired_partitions(
+                db, constants.SEND_LOG_RETENTION_MONTHS, constants.SEND_LOG_ARCHIVE_DIR
+            )
+            if constants.SEND_LOG_RETENTION_MONTHS > 0
+            else []
+        )
+
+        return {"status": "success", "rehomed": rehomed, "created": created, "archived": archived}
+
+    except Exception as exc:
+        db.rollback()
+        logger.error(f"❌ Send log partition maintenance failed: {str(exc)}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
+
+    finally:
+        db.close()
+        # Rolls the lock transaction back, releasing the lock
+        lock_conn.close()
@@ -0,0 +1,61 @@
+"""Transactional email worker (OTP, verification, password reset, welcome, unsubscribe)."""
+
+import asyncio
+from loguru import logger
+
+from app.celery_app import app
+from app.redis.rate_limiter import DistributedRateLimiter
+from app.utils import constants
+from app.utils.mail.email_service import EmailService, TRANSACTIONAL_EMAILS
+from app.utils.rate_limiter import TokenBucket
+
+
+# Own rate budget, separate from the campaign limiter, so a large campaign send
+# never delays an OTP. Keep SES_SEND_RATE_LIMIT + TRANSACTIONAL_SEND_RATE_LIMIT
+# within the account quota.
+if constants.SES_RATE_LIMITER_BACKEND == "redis":
+    transactional_rate_limiter = DistributedRateLimiter(
+        redis_url=constants.REDIS_URL,
+        global_rate=constants.TRANSACTIONAL_SEND_RATE_LIMIT,
+        key_prefix="skymail:transactional_rate",
+    )
+else:
+    transactional_rate_limiter = TokenBucket(rate=constants.TRANSACTIONAL_SEND_RATE_LIMIT)
+
+
+@app.task(
+    name="app.workers.transactional_email.send_transactional_email",
+    bind=True,
+    queue="transactional",
+    max_retries=constants.TRANSACTIONAL_MAX_RETRIES,
+    acks_late=True,
+)
+def send_transactional_email(self, kind: str, email: str, **params):
+    """
+    Send one transactional email through EmailService.
+
+    Args:
+        kind: Key of TRANSACTIONAL_EMAILS ("otp", "verification", ...)
+        email: Recipient
+        **params: Arguments of the EmailService method (otp, company_name, website_url)
+    """
+    send = getattr(EmailService, TRANSACTIONAL_EMAILS[kind])
+
+    transactional_rate_limiter.acquire()
+
+    # EmailService logs and swallows SMTP errors, returning False
+    if asyncio.run(send(email, **params)):
+        return {"status": "sent", "kind": kind}
+
+    # Exponential backoff: 2s, 4s, 8s, ... capped
+    countdown = min(2 ** (self.request.retries + 1), constants.TRANSACTIONAL_RETRY_BACKOFF_MAX)
+    logger.warning(
+        f"⚠️ {kind} email to {email} failed, retry {self.request.retries + 1}/"
+        f"{self.max_retries} in {countdown}s"
+    )
+
+    try:
+        raise self.retry(countdown=countdown)
+    except self.MaxRetriesExceededError:
+        logger.error(f"❌ {kind} email to {email} failed after {self.max_retries} retries")
+        return {"status": "failed", "kind": kind}
@@ -0,0 +1,372 @@
+"""
+Query plan benchmark for the hot dashboard, scheduler and auth queries.
+
+Seeds one large company (subscribers, campaigns, send logs, refresh tokens) plus
+a crowd of small ones into the configured (local!) Postgres, refreshes planner
+statistics and runs EXPLAIN (ANALYZE, BUFFERS) on each query shape, reporting:
+
+- the plan's node types and the indexes it uses
+- execution time (best of --repeat runs)
+- shared buffers touched
+
+Run it once per schema revision and diff the two reports to see what an index
+migration changes:
+
+    alembic downgrade 9c4e1a7d3b58
+    python -m benchmarks.query_plans --subscribers 200000 --output before.json
+    alembic upgrade head
+    python -m benchmarks.query_plans --subscribers 200000 --output after.json
+    python -m benchmarks.query_plans --compare before.json after.json
+
+Seeded rows are removed afterwards unless --keep is given.
+
+⚠️ Some seeded campaigns are due; don't run it while Celery beat watches the same
+database.
+"""
+
+import argparse
+import json
+import platform
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, text
+from loguru import logger
+
+from app.database.database import SessionLocal
+# Import all models with proper initialization order
+from app.database.models import Campaign, CampaignSendLog, Company, RefreshToken, Subscriber
+
+
+# Rows per INSERT when seeding
+SEED_CHUNK_SIZE = 10_000
+
+# Small companies sharing the tables with the measured one
+OTHER_COMPANIES = 200
+
+# Query shapes as the app issues them (see the services named in each entry)
+QUERIES = {
+    # subscribers.routes.get_subscriber_stats, CampaignService.schedule_campaign
+    "subscriber_active_count": """
+        SELECT count(id) FROM subscribers
+        WHERE company_id = :company_id AND status = 'subscribed'
+    """,
+    # subscribers.routes.list_subscribers
+    "subscriber_list_page": """
+        SELECT * FROM subscribers
+        WHERE company_id = :company_id
+        ORDER BY created_at DESC
+        LIMIT 20 OFFSET 0
+    """,
+    # CampaignService.list_campaigns
+    "campaign_list_page": """
+        SELECT * FROM campaigns c
+        LEFT JOIN campaign_stats s ON s.campaign_id = c.id
+        WHERE c.company_id = :company_id
+        ORDER BY c.created_at DESC
+        LIMIT 20 OFFSET 0
+    """,
+    # campaign_scheduler.enqueue_due_campaigns
+    "due_campaigns": """
+        SELECT * FROM campaigns
+        WHERE status = 'scheduled' AND scheduled_for <= now()
+    """,
+    # Per-campaign status counts (campaign_stats backfill, ad-hoc reports)
+    "send_log_status_counts": """
+        SELECT
+            count(id) FILTER (WHERE status = 'sent'),
+            count(id) FILTER (WHERE status = 'failed'),
+            count(id)
+        FROM campaign_send_logs
+        WHERE campaign_id = :campaign_id AND campaign_send_started_at = :campaign_send_started_at
+    """,
+    # LoginService.refresh_access_token
+    "refresh_token_lookup": """
+        SELECT * FROM refresh_tokens
+        WHERE company_id = :company_id AND token_hash = :token_hash AND revoked_at IS NULL
+        LIMIT 1
+    """,
+}
+
+
+# ======================== SEEDING ========================
+
+def _company(db, suffix: str, subscribers: int) -> Company:
+    company = Company(
+        username=f"plans-{suffix}",
+        email=f"plans-{suffix}@example.com",
+        password_hash="!",
+        company_name="Plans Co",
+        is_verified=True,
+        subscriber_count=subscribers,
+        max_subscribers=subscribers,
+    )
+    db.add(company)
+    db.flush()
+    return company
+
+
+def _insert_chunked(db, model, rows) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= SEED_CHUNK_SIZE:
+            db.execute(insert(model), chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(model), chunk)
+
+
+def seed(subscribers: int, campaigns: int, tokens: int) -> dict:
+    """
+    Create the measured company and OTHER_COMPANIES small ones.
+
+    Returns:
+        Query parameters and the ids of every seeded company
+    """
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        company = _company(db, uuid.uuid4().hex[:12], subscribers)
+        company_ids = [company.id]
+
+        # 90% subscribed, spread over the last year
+        _insert_chunked(db, Subscriber, (
+            {
+                "id": uuid.uuid4(),
+                "company_id": company.id,
+                "subscriber_email": f"user{i}@plans.example.com",
+                "status": "subscribed" if rng.random() < 0.9 else "unsubscribed",
+                "created_at": now - timedelta(minutes=rng.randrange(525_600)),
+            }
+            for i in range(subscribers)
+        ))
+
+        # Mostly finished campaigns; a handful still scheduled
+        campaign_rows = [
+            {
+                "id": uuid.uuid4(),
+                "company_id": company.id,
+                "name": f"Campaign {i}",
+                "subject": "Plans",
+                "status": "scheduled" if i % 50 == 0 else "sent",
+                "scheduled_for": now + timedelta(hours=rng.randrange(-8760, 72)),
+                "created_at": now - timedelta(hours=rng.randrange(8760)),
+            }
+            for i in range(campaigns)
+        ]
+        for row in campaign_rows:
+            row["send_started_at"] = row["created_at"]
+        _insert_chunked(db, Campaign, campaign_rows)
+        campaign_id = campaign_rows[0]["id"]
+
+        # Half the send logs belong to the measured campaign, the rest to the others
+        log_campaigns = (
+            campaign_rows[0 if i % 2 == 0 else i % len(campaign_rows)] for i in range(subscribers)
+        )
+        _insert_chunked(db, CampaignSendLog, (
+            {
+                "id": uuid.uuid4(),
+                "campaign_id": campaign["id"],
+                "campaign_send_started_at": campaign["send_started_at"],
+                "subscriber_email": f"user{i}@plans.example.com",
+                "status": "sent" if rng.random() < 0.97 else "failed",
+            }
+            for i, campaign in enumerate(log_campaigns)
+        ))
+
+        # Every login leaves a token; almost all are revoked by now
+        token_rows = []
+        for i in range(tokens):
+            token_rows.append({
+                "id": uuid.uuid4(),
+                "company_id": company.id,
+                "token_hash": uuid.uuid4().hex * 4,
+                "expires_at": now + timedelta(days=7),
+                "revoked_at": None if i == tokens - 1 else now - timedelta(days=1),
+            })
+        token_hash = token_rows[-1]["token_hash"]
+        _insert_chunked(db, RefreshToken, token_rows)
+
+        for n in range(OTHER_COMPANIES):
+            other = _company(db, uuid.uuid4().hex[:12], 50)
+            company_ids.append(other.id)
+            _insert_chunked(db, Subscriber, (
+                {
+                    "id": uuid.uuid4(),
+                    "company_id": other.id,
+                    "subscriber_email": f"user{i}@other{n}.example.com",
+                    "status": "subscribed",
+                }
+                for i in range(50)
+            ))
+
+        db.commit()
+
+        # Fresh planner statistics, as autovacuum would eventually provide
+        for table in ("subscribers", "campaigns", "campaign_send_logs", "refresh_tokens"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+
+        return {
+            "params": {
+                "company_id": company.id,
+                "campaign_id": campaign_id,
+                "campaign_send_started_at": campaign_rows[0]["send_started_at"],
+                "token_hash": token_hash,
+            },
+            "company_ids": company_ids,
+        }
+    finally:
+        db.close()
+
+
+def cleanup(company_ids: list[uuid.UUID]) -> None:
+    """Remove everything seeded; campaigns and subscribers cascade from the companies."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(RefreshToken).where(RefreshToken.company_id.in_(company_ids)))
+        db.execute(delete(Company).where(Company.id.in_(company_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ======================== MEASUREMENT ========================
+
+def _walk(node: dict, node_types: list[str], indexes: list[str]) -> None:
+    node_types.append(node["Node Type"])
+    if "Index Name" in node:
+        indexes.append(node["Index Name"])
+    for child in node.get("Plans", []):
+        _walk(child, node_types, indexes)
+
+
+def explain(db, sql: str, params: dict, repeat: int) -> dict:
+    """Best-of-``repeat`` EXPLAIN ANALYZE of one query."""
+    best = None
+    for _ in range(repeat):
+        result = db.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"),
+            params,
+        ).scalar_one()
+        plan = (json.loads(result) if isinstance(result, str) else result)[0]
+        if best is None or plan["Execution Time"] < best["Execution Time"]:
+            best = plan
+
+    node_types, indexes = [], []
+    _walk(best["Plan"], node_types, indexes)
+    root = best["Plan"]
+    return {
+        "nodes": node_types,
+        "indexes": indexes,
+        "execution_ms": round(best["Execution Time"], 3),
+        "shared_buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "estimated_cost": root["Total Cost"],
+    }
+
+
+def index_inventory(db) -> dict:
+    """Indexes (and their size) on the measured tables."""
+    rows = db.execute(text(
+        """
+        SELECT tablename, indexname, pg_relation_size(quote_ident(indexname)::regclass)
+        FROM pg_indexes
+        WHERE tablename IN ('subscribers', 'campaigns', 'campaign_send_logs', 'refresh_tokens')
+        ORDER BY tablename, indexname
+        """
+    )).all()
+    inventory = {}
+    for table, index, size in rows:
+        inventory.setdefault(table, {})[index] = size
+    return inventory
+
+
+# ======================== REPORTS ========================
+
+def compare(before_path: str, after_path: str) -> dict:
+    """Per-query execution time, buffers and plan change between two reports."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    diff = {}
+    for name, old in before["queries"].items():
+        new = after["queries"].get(name)
+        if new is None:
+            continue
+        diff[name] = {
+            "plan": [" > ".join(old["nodes"]), " > ".join(new["nodes"])],
+            "indexes": [old["indexes"], new["indexes"]],
+            "execution_ms": [old["execution_ms"], new["execution_ms"]],
+            "speedup": (
+                round(old["execution_ms"] / new["execution_ms"], 1) if new["execution_ms"] else None
+            ),
+            "shared_buffers": [old["shared_buffers"], new["shared_buffers"]],
+        }
+
+    index_bytes = {
+        label: sum(size for table in report["indexes"].values() for size in table.values())
+        for label, report in (("before", before), ("after", after))
+    }
+    return {"queries": diff, "index_bytes": index_bytes}
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot queries on seeded data.")
+    parser.add_argument("--subscribers", type=int, default=200_000, help="subscribers (and send logs) of the measured company")
+    parser.add_argument("--campaigns", type=int, default=2_000)
+    parser.add_argument("--tokens", type=int, default=5_000, help="refresh tokens of the measured company")
+    parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per query (best is kept)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two reports instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        report = compare(*args.compare)
+    else:
+        logger.info(f"🌱 Seeding {args.subscribers} subscribers, {args.campaigns} campaigns, {args.tokens} tokens")
+        seeded = seed(args.subscribers, args.campaigns, args.tokens)
+        try:
+            db = SessionLocal()
+            try:
+                revision = db.execute(text("SELECT version_num FROM alembic_version")).scalar()
+                report = {
+                    "benchmark": "query_plans",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "postgres": db.execute(text("SHOW server_version")).scalar(),
+                    "alembic_revision": revision,
+                    "config": {
+                        "subscribers": args.subscribers,
+                        "campaigns": args.campaigns,
+                        "tokens": args.tokens,
+                        "other_companies": OTHER_COMPANIES,
+                    },
+                    "indexes": index_inventory(db),
+                    "queries": {
+                        name: explain(db, sql, seeded["params"], args.repeat)
+                        for name, sql in QUERIES.items()
+                    },
+                }
+            finally:
+                db.close()
+        finally:
+            if not args.keep:
+                cleanup(seeded["company_ids"])
+
+    output = json.dumps(report, indent=2, default=str)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
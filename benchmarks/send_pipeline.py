@@ -0,0 +1,386 @@
+"""
+End-to-end benchmark of the campaign send pipeline.
+
+Seeds a company, a realistic template, a scheduled campaign and N subscribers into
+the configured (local!) Postgres, then runs
+enqueue_due_campaigns → send_campaign → send_campaign_batch against the fake mail
+transport and reports, per scale point:
+
+- emails/sec over the whole chain
+- p50/p99 per-email delivery latency (chain start → send log written)
+- DB queries per email (eager mode only)
+- peak RSS of the worker (this process in eager mode, the Celery worker otherwise)
+
+Results are printed (and optionally written) as JSON so runs can be diffed between
+releases.
+
+Usage:
+    # Tasks run in-process (no broker needed)
+    python -m benchmarks.send_pipeline --recipients 1000 10000 100000
+
+    # Tasks run on a local Celery worker started by the benchmark (needs Redis)
+    python -m benchmarks.send_pipeline --mode workers --concurrency 4 --recipients 1000000
+
+⚠️ Any other campaign that is due in the target database is sent too. Run against a
+dedicated database.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Benchmark defaults; must be set before app modules read constants.
+# Real environment variables still take precedence.
+os.environ.setdefault("MAIL_TRANSPORT", "fake")
+os.environ.setdefault("SES_RATE_LIMITER_BACKEND", "local")
+os.environ.setdefault("SES_SEND_RATE_LIMIT", "0")  # 0 = unlimited, measure the pipeline itself
+os.environ.setdefault("SES_ADAPTIVE_RATE", "false")
+os.environ.setdefault("CAMPAIGN_FAIR_SCHEDULING", "false")  # eager mode would dispatch recursively
+os.environ.setdefault("MAIL_FROM", "bench@example.com")
+
+from sqlalchemy import delete, event, func, insert, select, text  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from app.celery_app import app  # noqa: E402
+from app.database.database import SessionLocal, engine  # noqa: E402
+# Import all models with proper initialization order
+from app.database.models import Campaign, CampaignSendLog, Company, NewsletterTemplate, Subscriber  # noqa: E402
+from app.utils import constants  # noqa: E402
+from app.workers.campaign_scheduler import enqueue_due_campaigns  # noqa: E402
+
+
+# Rows per INSERT when seeding subscribers
+SEED_CHUNK_SIZE = 10_000
+
+DEFAULT_SCALE_POINTS = [1_000, 10_000, 100_000, 1_000_000]
+
+
+# ======================== SEEDING ========================
+
+def _template_html() -> str:
+    """A ~15 KB newsletter with the usual mix of system and custom variables."""
+    article = """
+    <tr>
+      <td style="padding: 24px; font-family: Arial, sans-serif; color: #333333;">
+        <h2 style="margin: 0 0 12px; font-size: 20px;">What's new at {{company_name}}</h2>
+        <p style="margin: 0 0 12px; line-height: 1.5;">
+          Hi {{subscriber_username}}, here is a round-up of what happened this month.
+          Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor
+          incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis
+          nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.
+        </p>
+        <a href="{{website_url}}?ref=newsletter&code={{promo_code}}"
+           style="display: inline-block; padding: 10px 18px; background: #2563eb; color: #ffffff;
+                  text-decoration: none; border-radius: 4px;">Read more</a>
+      </td>
+    </tr>"""
+    return f"""<!DOCTYPE html>
+<html>
+  <body style="margin: 0; padding: 0; background: #f4f4f5;">
+    <table role="presentation" width="100%" cellpadding="0" cellspacing="0">
+      <tr>
+        <td align="center" style="padding: 32px 0;">
+          <img src="{{{{template_asset}}}}" alt="{{{{company_name}}}}" width="160" />
+        </td>
+      </tr>
+      {article * 20}
+      <tr>
+        <td style="padding: 24px; font-size: 12px; color: #71717a;">
+          You are receiving this email at {{{{subscriber_email}}}} because you subscribed to
+          {{{{company_name}}}}. <a href="{{{{website_url}}}}/unsubscribe">Unsubscribe</a>
+        </td>
+      </tr>
+    </table>
+  </body>
+</html>"""
+
+
+def seed(recipients: int) -> tuple[uuid.UUID, uuid.UUID]:
+    """
+    Create a company with ``recipients`` subscribers and a due campaign.
+
+    Returns:
+        (company_id, campaign_id)
+    """
+    suffix = uuid.uuid4().hex[:12]
+    db = SessionLocal()
+    try:
+        company = Company(
+            username=f"bench-{suffix}",
+            email=f"bench-{suffix}@example.com",
+            password_hash="!",
+            company_name="Bench Co",
+            website_url="https://bench.example.com",
+            is_verified=True,
+            subscriber_count=recipients,
+            max_subscribers=recipients,
+        )
+        db.add(company)
+        db.flush()
+
+        template = NewsletterTemplate(
+            company_id=company.id,
+            name="Benchmark newsletter",
+            subject="{{company_name}} monthly update for {{subscriber_username}}",
+            html_content=_template_html(),
+            text_content="Hi {{subscriber_username}}, read the full update at {{website_url}}",
+            constants=["promo_code"],
+        )
+        db.add(template)
+        db.flush()
+
+        for start in range(0, recipients, SEED_CHUNK_SIZE):
+            db.execute(
+                insert(Subscriber),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "company_id": company.id,
+                        "subscriber_email": f"user{i}@bench.example.com",
+                        "subscriber_name": f"User {i}",
+                        "status": "subscribed",
+                    }
+                    for i in range(start, min(start + SEED_CHUNK_SIZE, recipients))
+                ],
+            )
+
+        campaign = Campaign(
+            company_id=company.id,
+            template_id=template.id,
+            name=f"Benchmark {recipients}",
+            subject=template.subject,
+            scheduled_for=datetime.now(timezone.utc) - timedelta(minutes=1),
+            status="scheduled",
+            constants_values={"promo_code": "BENCH10"},
+        )
+        db.add(campaign)
+        db.commit()
+
+        return company.id, campaign.id
+    finally:
+        db.close()
+
+
+def cleanup(company_id: uuid.UUID, campaign_id: uuid.UUID) -> None:
+    """Remove everything seeded for one scale point."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(CampaignSendLog).where(CampaignSendLog.campaign_id == campaign_id))
+        # Subscribers, templates and campaigns cascade from the company
+        db.execute(delete(Company).where(Company.id == company_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ======================== MEASUREMENT ========================
+
+class QueryCounter:
+    """Counts SQL statements executed through the app engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def _finished_count(campaign_id: uuid.UUID) -> int:
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(func.count(CampaignSendLog.id)).where(
+                (CampaignSendLog.campaign_id == campaign_id)
+                & (CampaignSendLog.status.in_(("sent", "failed")))
+            )
+        ).scalar_one()
+    finally:
+        db.close()
+
+
+def _latency_percentiles(campaign_id: uuid.UUID, started_at: datetime) -> dict:
+    """p50/p99 of (sent_at - chain start) over delivered emails, in milliseconds."""
+    db = SessionLocal()
+    try:
+        p50, p99, sent = db.execute(
+            text(
+                """
+                SELECT
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY latency),
+                    percentile_cont(0.99) WITHIN GROUP (ORDER BY latency),
+                    count(*)
+                FROM (
+                    SELECT EXTRACT(EPOCH FROM sent_at - :started_at) * 1000 AS latency
+                    FROM campaign_send_logs
+                    WHERE campaign_id = :campaign_id AND status = 'sent'
+                ) AS latencies
+                """
+            ),
+            {"campaign_id": campaign_id, "started_at": started_at},
+        ).one()
+    finally:
+        db.close()
+
+    return {
+        "sent": sent,
+        "latency_p50_ms": round(p50, 2) if p50 is not None else None,
+        "latency_p99_ms": round(p99, 2) if p99 is not None else None,
+    }
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(who).ru_maxrss / divisor, 1)
+
+
+# ======================== RUNNERS ========================
+
+def run_eager(campaign_id: uuid.UUID) -> dict:
+    """Run the whole chain in this process with Celery in eager mode."""
+    app.conf.task_always_eager = True
+    app.conf.task_eager_propagates = True
+
+    with QueryCounter() as queries:
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        enqueue_due_campaigns.apply()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "started_at": started_at,
+        "elapsed_seconds": elapsed,
+        "queries": queries.count,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+    }
+
+
+def run_workers(campaign_id: uuid.UUID, recipients: int, concurrency: int, timeout: float) -> dict:
+    """Run the chain on a local Celery worker and wait until every recipient is logged."""
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "celery", "-A", "app.celery_app", "worker",
+            "-Q", "scheduled,campaigns,email_batches",
+            "--concurrency", str(concurrency),
+            "--loglevel", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    try:
+        # Give the worker time to connect before the chain starts
+        time.sleep(5)
+
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        enqueue_due_campaigns.apply_async(queue="scheduled", priority=10)
+
+        deadline = start + timeout
+        while _finished_count(campaign_id) < recipients:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Campaign {campaign_id} not finished after {timeout}s")
+            time.sleep(0.5)
+        elapsed = time.perf_counter() - start
+    finally:
+        worker.terminate()
+        worker.wait()
+
+    return {
+        "started_at": started_at,
+        "elapsed_seconds": elapsed,
+        "queries": None,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_scale_point(recipients: int, args: argparse.Namespace) -> dict:
+    logger.info(f"🌱 Seeding {recipients} subscribers")
+    seed_start = time.perf_counter()
+    company_id, campaign_id = seed(recipients)
+    seed_seconds = time.perf_counter() - seed_start
+
+    try:
+        logger.info(f"🏁 Running send pipeline for {recipients} recipients ({args.mode})")
+        if args.mode == "eager":
+            run = run_eager(campaign_id)
+        else:
+            run = run_workers(campaign_id, recipients, args.concurrency, args.timeout)
+
+        latencies = _latency_percentiles(campaign_id, run["started_at"])
+        elapsed = run["elapsed_seconds"]
+
+        return {
+            "recipients": recipients,
+            "sent": latencies["sent"],
+            "seed_seconds": round(seed_seconds, 2),
+            "elapsed_seconds": round(elapsed, 3),
+            "emails_per_second": round(recipients / elapsed, 1) if elapsed else None,
+            "latency_p50_ms": latencies["latency_p50_ms"],
+            "latency_p99_ms": latencies["latency_p99_ms"],
+            "queries": run["queries"],
+            "queries_per_email": (
+                round(run["queries"] / recipients, 4) if run["queries"] is not None else None
+            ),
+            "peak_rss_mb": run["peak_rss_mb"],
+        }
+    finally:
+        if not args.keep:
+            cleanup(company_id, campaign_id)
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark the campaign send pipeline.")
+    parser.add_argument(
+        "--recipients", type=int, nargs="+", default=DEFAULT_SCALE_POINTS,
+        help="scale points (number of subscribers)",
+    )
+    parser.add_argument("--mode", choices=("eager", "workers"), default="eager")
+    parser.add_argument("--concurrency", type=int, default=4, help="Celery worker processes (workers mode)")
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds per scale point (workers mode)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows after each run")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "send_pipeline",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "mode": args.mode,
+        "config": {
+            "mail_transport": constants.MAIL_TRANSPORT,
+            "send_mode": constants.SES_SEND_MODE,
+            "batch_size": constants.CAMPAIGN_BATCH_SIZE,
+            "send_concurrency": constants.SES_SEND_CONCURRENCY,
+            "send_rate_limit": constants.SES_SEND_RATE_LIMIT,
+            "fake_latency_ms": constants.FAKE_MAIL_LATENCY_MS,
+            "fake_throttle_rate": constants.FAKE_MAIL_THROTTLE_RATE,
+            "fake_reject_rate": constants.FAKE_MAIL_REJECT_RATE,
+            "worker_concurrency": args.concurrency if args.mode == "workers" else None,
+        },
+        "results": [run_scale_point(recipients, args) for recipients in args.recipients],
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
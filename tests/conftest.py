@@ -0,0 +1,27 @@
+"""Shared test setup: app settings come from .env.example unless already set."""
+
+import os
+from pathlib import Path
+
+import pytest
+import redis
+from dotenv import dotenv_values
+
+
+# app.utils.constants reads the environment at import time
+for key, value in dotenv_values(Path(__file__).resolve().parent.parent / ".env.example").items():
+    if value is not None:
+        os.environ.setdefault(key, value)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point every Redis client created during the test at one in-memory fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def from_url(url, **kwargs):
+        return fakeredis.FakeRedis(server=server, decode_responses=kwargs.get("decode_responses", False))
+
+    monkeypatch.setattr(redis.Redis, "from_url", from_url)
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
@@ -0,0 +1,30 @@
+"""Retried batches never run on a fair-share slot they already gave back."""
+
+import uuid
+
+from app.workers import email_batch
+
+
+def test_retries_run_without_the_released_fair_slot(monkeypatch):
+    released = []
+    seen_kwargs = []
+
+    def broken_context(db, campaign_id):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(email_batch, "get_campaign_send_context", broken_context)
+    monkeypatch.setattr(email_batch, "_release_fair_slot", lambda *slot: released.append(slot))
+    monkeypatch.setattr(
+        email_batch.send_campaign_batch,
+        "retry",
+        lambda exc=None, countdown=None, kwargs=None: seen_kwargs.append(kwargs) or exc,
+    )
+
+    result = email_batch.send_campaign_batch.apply(
+        args=[str(uuid.uuid4())],
+        kwargs={"key_range": [0, 100], "fair_slot": ["company", "token"]},
+    )
+
+    assert isinstance(result.result, RuntimeError)
+    assert released == [("company", "token")]
+    assert seen_kwargs == [{"key_range": [0, 100]}]
@@ -0,0 +1,81 @@
+"""Bulk templated sending: same output as single mode, one SES template per campaign."""
+
+import uuid
+
+import pytest
+from botocore.stub import Stubber
+
+from app.utils.mail.transports import FakeTransport, SESTransport
+from app.utils.rate_limiter import TokenBucket
+from app.utils.template_renderer import CompiledCampaignTemplate
+from app.workers import email_batch
+
+
+SUBJECT = "News from {{company_name}}"
+HTML = "<p>Hi {{subscriber_username}}, {{company_name}} says {{greeting}} {{missing}}</p>"
+
+CONTEXTS = [
+    ("ann@example.com", {"subscriber_username": "Ann", "company_name": "Tom & Jerry <Co>", "greeting": "<b>hi</b>"}),
+    ("bob@example.com", {"subscriber_username": "Bob", "company_name": "Tom & Jerry <Co>", "greeting": 42}),
+]
+
+
+@pytest.fixture
+def fake_transport(monkeypatch):
+    transport = FakeTransport(latency_ms=0, jitter_ms=0, keep_outbox=True)
+    monkeypatch.setattr(email_batch, "mail_transport", transport)
+    monkeypatch.setattr(email_batch, "send_rate_limiter", TokenBucket(rate=1000))
+    return transport
+
+
+def test_bulk_mode_renders_like_single_mode(fake_transport):
+    compiled = CompiledCampaignTemplate(SUBJECT, HTML, None, known_variables=())
+    template_name = email_batch._ses_template_name(uuid.uuid4())
+    fake_transport.register_template(template_name, SUBJECT, HTML, None)
+
+    default_data, destinations = email_batch._bulk_template_data(compiled, CONTEXTS)
+    results = email_batch._send_bulk_email("company", "from@example.com", template_name, default_data, destinations)
+
+    assert all(result.message_id for result in results)
+    expected = [(email, *compiled.render(context)[:2]) for email, context in CONTEXTS]
+    assert sorted(fake_transport.outbox) == sorted(expected)
+    # Values go in unescaped, unknown variables keep their placeholder
+    assert "Tom & Jerry <Co>" in fake_transport.outbox[0][2]
+    assert "{{missing}}" in fake_transport.outbox[0][2]
+
+
+def test_deleted_template_can_no_longer_be_sent(fake_transport):
+    template_name = email_batch._ses_template_name(uuid.uuid4())
+    fake_transport.register_template(template_name, SUBJECT, HTML, None)
+    fake_transport.delete_template(template_name)
+
+    results = fake_transport.send_bulk("from@example.com", template_name, "{}", [("ann@example.com", {})])
+
+    assert results[0].error_code == "TemplateDoesNotExist"
+
+
+def test_ses_template_is_uploaded_unescaped_and_updated_in_place():
+    transport = SESTransport()
+    name = "skymail-test"
+    uploaded = {
+        "TemplateName": name,
+        "SubjectPart": "News from {{{company_name}}}",
+        "HtmlPart": "<p>{{{greeting}}}</p>",
+    }
+
+    with Stubber(transport.client) as stubber:
+        stubber.add_response("create_template", {}, {"Template": uploaded})
+        transport.register_template(name, SUBJECT, "<p>{{greeting}}</p>", None)
+        # Same content again: no API call
+        transport.register_template(name, SUBJECT, "<p>{{greeting}}</p>", None)
+
+        # New template version, already created by another worker: updated in place
+        updated = {**uploaded, "HtmlPart": "<p>{{{greeting}}}!</p>"}
+        stubber.add_client_error("create_template", service_error_code="AlreadyExists", expected_params={"Template": updated})
+        stubber.add_response("update_template", {}, {"Template": updated})
+        transport.register_template(name, SUBJECT, "<p>{{greeting}}!</p>", None)
+
+        stubber.add_response("delete_template", {}, {"TemplateName": name})
+        transport.delete_template(name)
+
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,90 @@
+"""Campaign completion fires once, however many final batches finish together."""
+
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.redis.campaign_progress import CampaignProgress
+from app.workers import email_batch
+
+
+CONCURRENT_BATCHES = 8
+
+
+@pytest.fixture
+def progress(fake_redis, monkeypatch):
+    progress = CampaignProgress("redis://fake")
+    monkeypatch.setattr(email_batch, "campaign_progress", progress)
+    return progress
+
+
+@pytest.fixture
+def campaign_db(tmp_path):
+    """
+    Stand-in for the campaigns table with just the columns _complete_campaign
+    touches; SQLite serializes the writers the way Postgres row locks do.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'campaigns.db'}", connect_args={"timeout": 30, "check_same_thread": False}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE campaigns (id CHAR(32) PRIMARY KEY, status VARCHAR(20), sent_at TIMESTAMP, updated_at TIMESTAMP)"
+        ))
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _status_events(pubsub) -> list[dict]:
+    events = []
+    while (message := pubsub.get_message(timeout=0.1)) is not None:
+        if message["type"] == "message":
+            events.append(json.loads(message["data"]))
+    return [event for event in events if event["event"] == "status"]
+
+
+def test_concurrent_final_batches_complete_campaign_once(progress, campaign_db, fake_redis, monkeypatch):
+    campaign_id = uuid.uuid4()
+    with campaign_db() as db:
+        db.execute(text("INSERT INTO campaigns (id, status) VALUES (:id, 'sending')"), {"id": campaign_id.hex})
+        db.commit()
+
+    deleted_templates = []
+    monkeypatch.setattr(email_batch, "delete_campaign_template", deleted_templates.append)
+
+    pubsub = fake_redis.pubsub()
+    pubsub.subscribe(progress.channel(str(campaign_id)))
+
+    barrier = threading.Barrier(CONCURRENT_BATCHES)
+
+    def final_batch(_):
+        with campaign_db() as db:
+            barrier.wait()
+            email_batch._complete_campaign(db, campaign_id, failed=1)
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_BATCHES) as executor:
+        list(executor.map(final_batch, range(CONCURRENT_BATCHES)))
+
+    with campaign_db() as db:
+        status = db.execute(text("SELECT status FROM campaigns")).scalar_one()
+    assert status == "partially_failed"
+    assert deleted_templates == [campaign_id]
+    assert _status_events(pubsub) == [{"event": "status", "status": "partially_failed"}]
+
+
+def test_progress_counters_reach_zero_remaining_once(progress):
+    campaign_id = str(uuid.uuid4())
+    progress.start(campaign_id, total=CONCURRENT_BATCHES * 10)
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_BATCHES) as executor:
+        counters = list(executor.map(
+            lambda _: progress.record(campaign_id, sent=9, failed=1), range(CONCURRENT_BATCHES)
+        ))
+
+    assert [c["remaining"] for c in counters].count(0) == 1
+    assert progress.get(campaign_id)["remaining"] == 0
@@ -0,0 +1,66 @@
+"""Per-worker send context cache: keyed on content, not on campaign bookkeeping."""
+
+import datetime
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.utils.ttl_cache import TTLCache
+from app.workers import campaign_context
+
+
+TEMPLATE_ID = uuid.uuid4()
+STARTED_AT = datetime.datetime(2026, 10, 1, tzinfo=datetime.timezone.utc)
+TEMPLATE_UPDATED_AT = datetime.datetime(2026, 9, 30, tzinfo=datetime.timezone.utc)
+
+
+def version(subject="Hello", constants_values=None, template_updated_at=TEMPLATE_UPDATED_AT):
+    return (TEMPLATE_ID, subject, constants_values or {"a": 1, "b": 2}, STARTED_AT, template_updated_at)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+
+    def load(db, campaign_id):
+        loads.append(campaign_id)
+        return object(), None
+
+    monkeypatch.setattr(campaign_context, "_load_campaign_send_context", load)
+    monkeypatch.setattr(campaign_context, "_context_cache", TTLCache(maxsize=16, ttl_seconds=60))
+    return loads
+
+
+def get(campaign_id, row):
+    db = MagicMock()
+    db.execute.return_value.one_or_none.return_value = row
+    return campaign_context.get_campaign_send_context(db, campaign_id)
+
+
+def test_dispatch_bookkeeping_does_not_invalidate_the_context(loads):
+    campaign_id = uuid.uuid4()
+
+    first, _ = get(campaign_id, version())
+    # Same content, e.g. after enqueued_seq checkpoints bumped campaigns.updated_at
+    second, _ = get(campaign_id, version(constants_values={"b": 2, "a": 1}))
+
+    assert first is second
+    assert loads == [campaign_id]
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        version(subject="Hello again"),
+        version(constants_values={"a": 1, "b": 3}),
+        version(template_updated_at=TEMPLATE_UPDATED_AT + datetime.timedelta(minutes=1)),
+    ],
+)
+def test_content_edits_reload_the_context(loads, changed):
+    campaign_id = uuid.uuid4()
+
+    get(campaign_id, version())
+    get(campaign_id, changed)
+
+    assert loads == [campaign_id, campaign_id]
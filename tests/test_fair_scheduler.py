@@ -0,0 +1,77 @@
+"""Fair-share batch slots: round-robin across companies, per-company and global caps."""
+
+import time
+from collections import Counter
+
+import pytest
+
+from app.redis.fair_scheduler import FairBatchScheduler
+
+
+def make_scheduler(company_cap=2, global_cap=100, slot_timeout=60):
+    return FairBatchScheduler(
+        "redis://fake", company_cap=company_cap, global_cap=global_cap, slot_timeout=slot_timeout
+    )
+
+
+@pytest.fixture(autouse=True)
+def redis_server(fake_redis):
+    return fake_redis
+
+
+def test_slots_go_round_robin_up_to_the_company_cap():
+    scheduler = make_scheduler(company_cap=2)
+    assert scheduler.activate(["acme", "globex", "initech"]) == 3
+
+    slots = scheduler.take(10)
+    companies = [company for company, _ in slots]
+
+    # One slot per company per round, never more than company_cap each
+    assert set(companies[:3]) == set(companies[3:]) == {"acme", "globex", "initech"}
+    assert Counter(companies) == {"acme": 2, "globex": 2, "initech": 2}
+    assert scheduler.take(10) == []
+
+
+def test_released_slot_goes_back_to_its_company():
+    scheduler = make_scheduler(company_cap=1)
+    scheduler.activate(["acme", "globex"])
+    slots = dict(scheduler.take(10))
+
+    scheduler.release("acme", slots["acme"])
+
+    assert [company for company, _ in scheduler.take(10)] == ["acme"]
+
+
+def test_global_cap_bounds_in_flight_batches():
+    scheduler = make_scheduler(company_cap=5, global_cap=3)
+    scheduler.activate(["acme", "globex"])
+
+    slots = scheduler.take(10)
+    assert len(slots) == 3
+    assert scheduler.take(10) == []
+
+    scheduler.release(*slots[0])
+    assert len(scheduler.take(10)) == 1
+
+
+def test_slots_of_crashed_workers_expire():
+    scheduler = make_scheduler(company_cap=1, slot_timeout=0.1)
+    scheduler.activate(["acme"])
+    assert len(scheduler.take(10)) == 1
+    assert scheduler.take(10) == []
+
+    time.sleep(0.15)
+
+    assert len(scheduler.take(10)) == 1
+
+
+def test_ring_membership(redis_server):
+    scheduler = make_scheduler()
+    assert scheduler.activate(["acme", "acme"]) == 1
+    assert scheduler.activate(["acme", "globex"]) == 1
+
+    scheduler.deactivate("acme")
+    assert [company for company, _ in scheduler.take(10)] == ["globex", "globex"]
+
+    # Every key shares one hash tag, so the scripts stay valid on Redis Cluster
+    assert all(key.startswith("skymail:{fair}:") for key in redis_server.keys("*"))
@@ -0,0 +1,56 @@
+"""Cluster-wide send rate limiter: global and per-company token buckets in Redis."""
+
+import time
+
+import pytest
+
+from app.redis.rate_limiter import DistributedRateLimiter
+
+
+@pytest.fixture
+def limiter(fake_redis):
+    return DistributedRateLimiter("redis://fake", global_rate=100, company_rate=5)
+
+
+def test_company_limit_leaves_other_companies_alone(limiter):
+    assert limiter.try_acquire("acme", 5) == 0
+
+    wait = limiter.try_acquire("acme", 1)
+    assert 0 < wait <= 0.2 + 0.01
+
+    # Global bucket still has room for another tenant
+    assert limiter.try_acquire("globex", 5) == 0
+
+
+def test_global_limit_is_shared_by_every_company(fake_redis):
+    limiter = DistributedRateLimiter("redis://fake", global_rate=4)
+
+    assert limiter.try_acquire("acme", 4) == 0
+    assert limiter.try_acquire("globex", 1) > 0
+
+
+def test_bucket_refills_at_company_rate(limiter):
+    assert limiter.try_acquire("acme", 5) == 0
+    wait = limiter.try_acquire("acme", 2)
+    assert wait > 0
+
+    time.sleep(wait + 0.02)
+
+    assert limiter.try_acquire("acme", 2) == 0
+
+
+def test_requests_above_capacity_are_chunked(limiter):
+    assert limiter.max_permits("acme") == 5
+    assert limiter.max_permits() == 100
+    with pytest.raises(ValueError):
+        limiter.try_acquire("acme", 6)
+
+    # 5 right away, 3 more once the company bucket refills (~0.6s)
+    started = time.monotonic()
+    assert limiter.acquire("acme", 8, timeout=5)
+    assert time.monotonic() - started >= 0.5
+
+
+def test_acquire_gives_up_at_timeout(limiter):
+    assert limiter.acquire("acme", 5)
+    assert not limiter.acquire("acme", 5, timeout=0.05)
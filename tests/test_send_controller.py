@@ -0,0 +1,71 @@
+"""Adaptive (AIMD) send rate shared by every worker through Redis."""
+
+import pytest
+
+from app.redis.rate_limiter import DistributedRateLimiter
+from app.redis.send_controller import AdaptiveSendController
+
+
+def make_controller():
+    return AdaptiveSendController(
+        "redis://fake",
+        max_rate=20,
+        max_concurrency=4,
+        increase_step=1,
+        increase_after=10,
+        decrease_factor=0.5,
+        decrease_cooldown=60,
+    )
+
+
+@pytest.fixture
+def workers(fake_redis):
+    return make_controller(), make_controller()
+
+
+def test_one_throttle_burst_lowers_the_shared_rate_once(workers):
+    first, second = workers
+
+    assert first.on_throttle()
+    # Another worker hit by the same burst doesn't halve it again
+    assert not second.on_throttle()
+
+    assert first.rate == second.rate == 10
+
+
+def test_increases_from_every_worker_add_up(workers):
+    first, second = workers
+    first.on_throttle()
+
+    first.on_success(10)
+    second.on_success(10)
+    second.load()
+
+    assert second.rate == 12
+
+
+def test_saving_concurrency_never_overwrites_the_shared_rate(workers):
+    first, second = workers
+    second.load()
+    first.on_throttle()
+
+    # The second worker still believes in the old rate
+    second.save()
+    second.load()
+
+    assert second.rate == 10
+
+
+def test_redis_bucket_refills_at_the_learned_rate(fake_redis, workers):
+    controller, _ = workers
+    limiter = DistributedRateLimiter("redis://fake", global_rate=20, adaptive_rate_key=controller.state_key)
+
+    assert limiter.try_acquire(permits=20) == 0
+    # Refill at the configured 20/s: 5 permits take 0.25s
+    assert limiter.try_acquire(permits=5) == pytest.approx(0.25, abs=0.06)
+
+    controller.on_throttle()
+
+    # Every worker now refills at the shared 10/s
+    assert limiter.try_acquire(permits=5) == pytest.approx(0.5, abs=0.06)
+    assert limiter.utilization()["rate"] == 10
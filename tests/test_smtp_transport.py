@@ -0,0 +1,89 @@
+"""SMTP transport: pooled connections shared across send threads."""
+
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.mail import transports
+from app.utils.mail.transports import MailTransport, SMTPTransport
+
+
+class FakeSMTP:
+    opened = []
+
+    def __init__(self, host, port, timeout=None, context=None):
+        self.implicit_tls = context is not None
+        self.started_tls = False
+        self.closed = False
+        self.disconnect_next = False
+        self.sent = 0
+        FakeSMTP.opened.append(self)
+
+    def starttls(self, context=None):
+        self.started_tls = True
+
+    def login(self, username, password):
+        pass
+
+    def send_message(self, message):
+        if self.disconnect_next:
+            raise smtplib.SMTPServerDisconnected("idle timeout")
+        self.sent += 1
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.opened = []
+    monkeypatch.setattr(transports.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(transports.smtplib, "SMTP_SSL", FakeSMTP)
+    return FakeSMTP
+
+
+def test_mail_transport_requires_send():
+    with pytest.raises(TypeError):
+        MailTransport()
+
+
+def test_connections_are_pooled_across_batches():
+    transport = SMTPTransport(host="relay", port=587, security="starttls", pool_size=2)
+
+    for _ in range(3):
+        # A new executor per batch, like send_campaign_batch
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda i: transport.send("a@x.io", f"{i}@x.io", "s", "<p>h</p>"), range(20)))
+        assert all(result.message_id for result in results)
+
+    assert 1 <= len(FakeSMTP.opened) <= 2
+    assert all(connection.started_tls for connection in FakeSMTP.opened)
+
+    transport.close()
+    assert all(connection.closed for connection in FakeSMTP.opened)
+
+
+@pytest.mark.parametrize("security, implicit_tls, started_tls", [("ssl", True, False), ("none", False, False)])
+def test_security_modes(security, implicit_tls, started_tls):
+    transport = SMTPTransport(host="relay", port=465, security=security, pool_size=1)
+    assert transport.send("a@x.io", "b@x.io", "s", "<p>h</p>").message_id
+
+    connection = FakeSMTP.opened[0]
+    assert connection.implicit_tls is implicit_tls
+    assert connection.started_tls is started_tls
+
+
+def test_idle_connection_dropped_by_relay_is_replaced():
+    transport = SMTPTransport(host="relay", port=587, security="none", pool_size=1)
+    transport.send("a@x.io", "b@x.io", "s", "<p>h</p>")
+    FakeSMTP.opened[0].disconnect_next = True
+
+    result = transport.send("a@x.io", "c@x.io", "s", "<p>h</p>")
+
+    assert result.message_id
+    assert len(FakeSMTP.opened) == 2
+    assert FakeSMTP.opened[0].closed and FakeSMTP.opened[1].sent == 1